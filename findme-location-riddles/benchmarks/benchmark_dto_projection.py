@@ -0,0 +1,106 @@
+"""
+Compares the cost of converting a location riddle into its DTO with the validating
+constructors against the projection used by LocationRiddle.to_dto.
+
+The validating path is the former to_dto: the DTO constructor rebuilds a LocationRiddle
+from dict() and validates every nested guess, comment and rating twice. Both paths are
+checked to produce the same response before they are timed.
+
+Usage (from the findme-location-riddles directory):
+    python -m benchmarks.benchmark_dto_projection [--guesses 0 100 1000]
+"""
+
+import argparse
+import time
+from decimal import Decimal
+
+from src.entities.Comment import Comment
+from src.entities.Coordinate import Coordinate
+from src.entities.Guess import Guess
+from src.entities.LocationRiddle import (
+    LocationRiddle,
+    LocationRiddleDTO,
+    SolvedLocationRiddleDTO,
+)
+from src.entities.Rating import Rating
+
+REPETITIONS = 5
+
+
+def create_location_riddle(guesses: int) -> LocationRiddle:
+    return LocationRiddle(
+        location_riddle_id="benchmark_location_riddle",
+        username="owner",
+        location=Coordinate(coordinate=[Decimal("950773.5"), Decimal("6003947.7")]),
+        guesses=[
+            Guess(
+                username=f"user_{i}",
+                guess=Coordinate(
+                    coordinate=[Decimal(950000 + i), Decimal(6003000 + i)]
+                ),
+            )
+            for i in range(guesses)
+        ],
+        comments=[
+            Comment(username=f"user_{i}", comment="nice spot")
+            for i in range(guesses // 10)
+        ],
+        ratings=[
+            Rating(username=f"user_{i}", rating=i % 5 + 1) for i in range(guesses // 2)
+        ],
+    )
+
+
+def to_dto_validating(location_riddle: LocationRiddle, username: str):
+    data = location_riddle.dict()
+    data["is_rated_by_user"] = any(
+        rating.username == username for rating in location_riddle.ratings
+    )
+    if username == location_riddle.username or any(
+        guess.username == username for guess in location_riddle.guesses
+    ):
+        return SolvedLocationRiddleDTO(**data)
+    return LocationRiddleDTO(**data)
+
+
+def measure(function, iterations: int) -> float:
+    elapsed = []
+    for _ in range(REPETITIONS):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            function()
+        elapsed.append((time.perf_counter() - start) / iterations)
+    return min(elapsed)
+
+
+def run(guesses: int):
+    location_riddle = create_location_riddle(guesses)
+    iterations = max(10, 10000 // (guesses + 1))
+    # the owner receives the solved DTO with all guesses, everybody else the regular DTO
+    for username in ["owner", "stranger"]:
+        assert (
+            to_dto_validating(location_riddle, username).model_dump()
+            == location_riddle.to_dto(username).model_dump()
+        ), "responses differ"
+        validating = measure(
+            lambda: to_dto_validating(location_riddle, username), iterations
+        )
+        projection = measure(lambda: location_riddle.to_dto(username), iterations)
+        print(
+            f"{guesses:>6} guesses  {username:<8}  "
+            f"validating {validating * 1e6:10.1f} us/riddle  "
+            f"projection {projection * 1e6:8.1f} us/riddle  "
+            f"{validating / projection:6.1f}x"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--guesses", type=int, nargs="+", default=[0, 100, 1000])
+    args = parser.parse_args()
+    for guesses in args.guesses:
+        run(guesses)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Compares the peak memory of the previous upload path (decode the whole base64 string,
+then put_object) with the streaming ImageBucketRepository.post_image_to_s3 for 1, 5 and
+10 MB images.
+
+The images are PNGs of random pixels, which barely compress, so the file has about the
+requested size. The streaming path is called with the derivative keys of
+LocationRiddlesService.post_location_riddle and includes creating the thumbnail and
+medium derivatives like in production.
+
+S3 is replaced by botocore before-send hooks which consume the request body and answer
+locally, so only the memory used by our code and boto3 is measured. Every case runs in a
+fresh process.
+
+Usage (from the findme-location-riddles directory):
+    PYTHONPATH=../findme-shared/python python -m benchmarks.benchmark_image_upload
+"""
+
+import base64
+import io
+import math
+import multiprocessing
+import os
+import time
+import tracemalloc
+
+from botocore.awsrequest import AWSResponse
+
+IMAGE_SIZES_MB = [1, 5, 10]
+BUCKET_NAME = "ase-findme-image-upload-bucket"
+LOCATION_RIDDLE_ID = "benchmark"
+
+S3_RESPONSES = {
+    "PutObject": b"",
+    "CreateMultipartUpload": (
+        b"<InitiateMultipartUploadResult><Bucket>bucket</Bucket><Key>key</Key>"
+        b"<UploadId>upload-id</UploadId></InitiateMultipartUploadResult>"
+    ),
+    "UploadPart": b"",
+    "CompleteMultipartUpload": (
+        b'<CompleteMultipartUploadResult><ETag>"etag"</ETag>'
+        b"</CompleteMultipartUploadResult>"
+    ),
+}
+
+
+class _RawResponse:
+    def __init__(self, body: bytes):
+        self.body = body
+
+    def stream(self, **kwargs):
+        yield self.body
+
+
+def _answer_locally(request, event_name, **kwargs):
+    body = request.body
+    if hasattr(body, "read"):
+        while body.read(1024 * 1024):
+            pass
+    operation = event_name.rsplit(".", 1)[-1]
+    return AWSResponse(
+        request.url, 200, {"ETag": '"etag"'}, _RawResponse(S3_RESPONSES[operation])
+    )
+
+
+def _create_image_repository():
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "benchmark")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "benchmark")
+    from src.ImageBucketRepository import ImageBucketRepository
+
+    image_bucket_repository = ImageBucketRepository()
+    image_bucket_repository.s3.meta.events.register("before-send.s3", _answer_locally)
+    return image_bucket_repository
+
+
+def _get_rss_kb(field: str) -> int:
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith(field):
+                return int(line.split()[1])
+    return 0
+
+
+def _reset_peak_rss() -> bool:
+    try:
+        with open("/proc/self/clear_refs", "w") as clear_refs:
+            clear_refs.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _create_png(size_mb: int) -> bytes:
+    from PIL import Image
+
+    # three bytes per pixel, random pixels keep the PNG at about the raw size
+    side = int(math.sqrt(size_mb * 1024 * 1024 / 3))
+    image = Image.frombytes("RGB", (side, side), os.urandom(side * side * 3))
+    output = io.BytesIO()
+    image.save(output, format="PNG", compress_level=1)
+    return output.getvalue()
+
+
+def _upload_legacy(image_bucket_repository, image_base64: str):
+    from src.LocationRiddlesService import LocationRiddlesService
+
+    image_data = base64.b64decode(image_base64)
+    image_bucket_repository.s3.put_object(
+        Bucket=BUCKET_NAME,
+        Key=LocationRiddlesService.get_image_key(LOCATION_RIDDLE_ID),
+        Body=image_data,
+        ContentType="image/png",
+    )
+
+
+def _upload_streaming(image_bucket_repository, image_base64: str):
+    from src.LocationRiddlesService import LocationRiddlesService
+    from src.entities.ImageSize import ImageSize
+
+    response = image_bucket_repository.post_image_to_s3(
+        image_base64,
+        LocationRiddlesService.get_image_key(LOCATION_RIDDLE_ID),
+        {
+            image_size: LocationRiddlesService.get_image_key(
+                LOCATION_RIDDLE_ID, image_size
+            )
+            for image_size in ImageSize
+            if image_size != ImageSize.FULL
+        },
+    )
+    assert len(response["image_sizes"]) == len(ImageSize), "derivatives are missing"
+
+
+def _run_case(mode: str, size_mb: int, results):
+    image_bucket_repository = _create_image_repository()
+    image_base64 = base64.b64encode(_create_png(size_mb)).decode("utf-8")
+    upload = _upload_legacy if mode == "legacy" else _upload_streaming
+    # the modules are imported before the measurement starts
+    import src.LocationRiddlesService  # noqa: F401
+
+    rss_available = _reset_peak_rss()
+    rss_before = _get_rss_kb("VmRSS:")
+    tracemalloc.start()
+    start = time.perf_counter()
+    upload(image_bucket_repository, image_base64)
+    duration = time.perf_counter() - start
+    _, python_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    results.put(
+        {
+            "mode": mode,
+            "size_mb": size_mb,
+            "peak_rss_increase_mb": (_get_rss_kb("VmHWM:") - rss_before) / 1024
+            if rss_available
+            else None,
+            "python_peak_mb": python_peak / 1024 / 1024,
+            "duration_ms": duration * 1000,
+        }
+    )
+
+
+def main():
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    print(f"{'mode':<10}{'size':>6}{'peak rss +':>14}{'python peak':>14}{'time':>12}")
+    for size_mb in IMAGE_SIZES_MB:
+        for mode in ["legacy", "streaming"]:
+            process = context.Process(target=_run_case, args=(mode, size_mb, results))
+            process.start()
+            result = results.get()
+            process.join()
+            peak_rss = (
+                f"{result['peak_rss_increase_mb']:.1f} MB"
+                if result["peak_rss_increase_mb"] is not None
+                else "n/a"
+            )
+            print(
+                f"{mode:<10}{size_mb:>4}MB{peak_rss:>14}"
+                f"{result['python_peak_mb']:>11.1f} MB"
+                f"{result['duration_ms']:>9.0f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
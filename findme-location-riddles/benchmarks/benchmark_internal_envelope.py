@@ -0,0 +1,151 @@
+"""
+Compares the payload of an invoke of the users service built from the forwarded API
+Gateway event with the InternalRequest envelope used by LambdaUserTransport.
+
+The measured call reads the followers of the author while POST /location-riddles is
+handled. The forwarded event is the former payload: a copy of the complete incoming
+event (headers, multiValueHeaders, requestContext and the uploaded image as body) with
+the path of the users endpoint. Payload bytes, the encoding time on the location riddles
+side and the decoding time on the users side are measured per call. The invoke latency
+itself is logged in production by UserMicroserviceClient (user_transport statistics).
+
+Usage (from the findme-location-riddles directory):
+    PYTHONPATH=../findme-shared/python \
+        python -m benchmarks.benchmark_internal_envelope [--body-bytes 0 100000 5000000]
+"""
+
+import argparse
+import json
+import time
+
+from findme_shared.InternalRequest import InternalRequest
+
+REPETITIONS = 5
+TOKEN = "Bearer " + "x" * 900
+
+
+def create_event(body_bytes: int) -> dict:
+    headers = {
+        "Accept": "application/json, text/plain, */*",
+        "Accept-Encoding": "gzip, deflate, br",
+        "Accept-Language": "de-CH,de;q=0.9,en-US;q=0.8,en;q=0.7",
+        "Authorization": TOKEN,
+        "CloudFront-Forwarded-Proto": "https",
+        "CloudFront-Is-Desktop-Viewer": "true",
+        "CloudFront-Is-Mobile-Viewer": "false",
+        "CloudFront-Viewer-Country": "CH",
+        "Content-Type": "application/json",
+        "Host": "api.find-me.life",
+        "Origin": "https://find-me.life",
+        "Referer": "https://find-me.life/",
+        "User-Agent": (
+            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+            "AppleWebKit/537.36 Chrome/124.0 Safari/537.36"
+        ),
+        "Via": "2.0 0123456789abcdef0123456789abcdef.cloudfront.net (CloudFront)",
+        "X-Amz-Cf-Id": "a" * 56,
+        "X-Amzn-Trace-Id": "Root=1-66000000-0123456789abcdef01234567",
+        "X-Forwarded-For": "203.0.113.10, 198.51.100.20",
+        "X-Forwarded-Port": "443",
+        "X-Forwarded-Proto": "https",
+    }
+    return {
+        "resource": "/location-riddles",
+        "path": "/location-riddles",
+        "httpMethod": "POST",
+        "headers": headers,
+        "multiValueHeaders": {name: [value] for name, value in headers.items()},
+        "queryStringParameters": None,
+        "multiValueQueryStringParameters": None,
+        "pathParameters": None,
+        "stageVariables": None,
+        "requestContext": {
+            "resourceId": "abc123",
+            "resourcePath": "/location-riddles",
+            "httpMethod": "POST",
+            "extendedRequestId": "b" * 16,
+            "requestTime": "18/Oct/2026:12:00:00 +0000",
+            "path": "/location-riddles",
+            "accountId": "123456789012",
+            "protocol": "HTTP/1.1",
+            "stage": "prod",
+            "domainPrefix": "api",
+            "requestTimeEpoch": 1792324800000,
+            "requestId": "c" * 36,
+            "identity": {
+                "sourceIp": "203.0.113.10",
+                "userAgent": headers["User-Agent"],
+            },
+            "domainName": "api.find-me.life",
+            "apiId": "abcdef1234",
+        },
+        "body": "x" * body_bytes,
+        "isBase64Encoded": False,
+    }
+
+
+def forwarded_event_payload(event: dict) -> str:
+    event_dict = dict(event)
+    event_dict["path"] = "/users/mock_username/follow"
+    return json.dumps(event_dict)
+
+
+def envelope_payload(event: dict) -> str:
+    return json.dumps(
+        InternalRequest.create(
+            "GET",
+            "/users/mock_username/follow",
+            InternalRequest.get_authorization(event),
+        )
+    )
+
+
+def decode_envelope(payload: str) -> dict:
+    return InternalRequest.to_api_gateway_event(json.loads(payload))
+
+
+def measure(function, argument, iterations: int) -> float:
+    elapsed = []
+    for _ in range(REPETITIONS):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            function(argument)
+        elapsed.append((time.perf_counter() - start) / iterations)
+    return min(elapsed)
+
+
+def run(body_bytes: int):
+    event = create_event(body_bytes)
+    iterations = max(10, 2000000 // (body_bytes + 1000))
+    forwarded = forwarded_event_payload(event)
+    envelope = envelope_payload(event)
+    assert (
+        decode_envelope(envelope)["headers"]["Authorization"] == TOKEN
+    ), "token is not forwarded"
+
+    forwarded_encode = measure(forwarded_event_payload, event, iterations)
+    envelope_encode = measure(envelope_payload, event, iterations)
+    forwarded_decode = measure(json.loads, forwarded, iterations)
+    envelope_decode = measure(decode_envelope, envelope, iterations)
+    print(
+        f"{body_bytes:>9} body bytes  "
+        f"forwarded event {len(forwarded):>9} bytes "
+        f"{forwarded_encode * 1e6:9.1f} us encode "
+        f"{forwarded_decode * 1e6:9.1f} us decode  "
+        f"envelope {len(envelope):>5} bytes {envelope_encode * 1e6:6.1f} us encode "
+        f"{envelope_decode * 1e6:6.1f} us decode"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--body-bytes", type=int, nargs="+", default=[0, 100000, 5000000]
+    )
+    args = parser.parse_args()
+    for body_bytes in args.body_bytes:
+        run(body_bytes)
+
+
+if __name__ == "__main__":
+    main()
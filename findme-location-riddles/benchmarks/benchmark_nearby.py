@@ -0,0 +1,122 @@
+"""
+Compares the nearby lookup over the geohash index with a brute-force scan of all
+location riddles.
+
+The geo index is simulated in memory with the same layout as geoIndexTable: one
+partition per GEO_INDEX_PARTITION_PRECISION cell, entries sorted by
+geohash#location_riddle_id and read with a begins_with range per covering cell. Every
+query checks that both strategies return the same ids.
+
+Usage (from the findme-location-riddles directory):
+    PYTHONPATH=../findme-shared/python python -m benchmarks.benchmark_nearby \
+        [--riddles 10000 100000 1000000] [--radius 2000]
+"""
+
+import argparse
+import bisect
+import random
+import time
+
+from src.Geohash import Geohash, GEO_INDEX_PARTITION_PRECISION, GEO_INDEX_PRECISION
+from src.LocationRiddlesService import MAX_NEARBY_CELLS
+
+QUERIES = 50
+# riddles are spread over Europe, queries are centered on cities where riddles cluster
+BOUNDING_BOX = (36.0, -10.0, 60.0, 30.0)
+CITIES = [(47.3769, 8.5417), (48.8566, 2.3522), (52.5200, 13.4050), (41.9028, 12.4964)]
+
+
+def create_riddles(count: int) -> list[tuple[str, float, float]]:
+    random.seed(count)
+    riddles = []
+    for i in range(count):
+        if i % 2:
+            lat = random.uniform(BOUNDING_BOX[0], BOUNDING_BOX[2])
+            lon = random.uniform(BOUNDING_BOX[1], BOUNDING_BOX[3])
+        else:
+            city_lat, city_lon = random.choice(CITIES)
+            lat, lon = random.gauss(city_lat, 0.2), random.gauss(city_lon, 0.3)
+        riddles.append((str(i), lat, lon))
+    return riddles
+
+
+def create_index(riddles) -> dict[str, list[tuple[str, str, float, float]]]:
+    index = {}
+    for location_riddle_id, lat, lon in riddles:
+        geohash = Geohash.encode(lat, lon, GEO_INDEX_PRECISION)
+        index.setdefault(geohash[:GEO_INDEX_PARTITION_PRECISION], []).append(
+            (f"{geohash}#{location_riddle_id}", location_riddle_id, lat, lon)
+        )
+    for partition in index.values():
+        partition.sort()
+    return index
+
+
+def query_brute_force(riddles, lat, lon, radius):
+    examined = len(riddles)
+    return {
+        location_riddle_id
+        for location_riddle_id, riddle_lat, riddle_lon in riddles
+        if Geohash.haversine_distance(lat, lon, riddle_lat, riddle_lon) <= radius
+    }, examined
+
+
+def query_index(index, lat, lon, radius):
+    examined = 0
+    result = set()
+    for cell in Geohash.covering_cells(
+        lat, lon, radius, GEO_INDEX_PARTITION_PRECISION, MAX_NEARBY_CELLS
+    ):
+        partition = index.get(cell[:GEO_INDEX_PARTITION_PRECISION], [])
+        start = bisect.bisect_left(partition, (cell,))
+        for sort_key, location_riddle_id, riddle_lat, riddle_lon in partition[start:]:
+            if not sort_key.startswith(cell):
+                break
+            examined += 1
+            if Geohash.haversine_distance(lat, lon, riddle_lat, riddle_lon) <= radius:
+                result.add(location_riddle_id)
+    return result, examined
+
+
+def run(count: int, radius: float):
+    riddles = create_riddles(count)
+    index = create_index(riddles)
+    queries = [
+        (random.gauss(city_lat, 0.1), random.gauss(city_lon, 0.1))
+        for city_lat, city_lon in random.choices(CITIES, k=QUERIES)
+    ]
+
+    results = {}
+    for name, query in [
+        ("brute force", lambda lat, lon: query_brute_force(riddles, lat, lon, radius)),
+        ("geohash index", lambda lat, lon: query_index(index, lat, lon, radius)),
+    ]:
+        examined = 0
+        start = time.perf_counter()
+        results[name] = []
+        for lat, lon in queries:
+            result, query_examined = query(lat, lon)
+            results[name].append(result)
+            examined += query_examined
+        elapsed = (time.perf_counter() - start) / QUERIES
+        print(
+            f"{count:>9} riddles  {name:<14} {elapsed * 1000:9.2f} ms/query  "
+            f"{examined // QUERIES:>9} riddles examined/query  "
+            f"{sum(map(len, results[name])) // QUERIES:>6} found/query"
+        )
+    assert results["brute force"] == results["geohash index"], "results differ"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--riddles", type=int, nargs="+", default=[10000, 100000, 1000000]
+    )
+    parser.add_argument("--radius", type=float, default=2000, help="radius in meters")
+    args = parser.parse_args()
+    for count in args.riddles:
+        run(count, args.radius)
+
+
+if __name__ == "__main__":
+    main()
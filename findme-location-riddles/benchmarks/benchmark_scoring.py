@@ -0,0 +1,93 @@
+"""
+Compares scoring guesses one by one with the scalar formula against ScoringEngine's
+vectorized pass.
+
+Guesses are random Web Mercator coordinates around Switzerland. The scalar loop mirrors
+the formula calculate_score_and_distance used before the vectorized engine, it is
+skipped above --max-scalar guesses.
+
+Usage (from the findme-location-riddles directory):
+    python -m benchmarks.benchmark_scoring [--guesses 1000 100000 1000000]
+"""
+
+import argparse
+import math
+import time
+
+import numpy as np
+
+from src.ScoringEngine import ScoringEngine
+from src.entities.ScoringMode import ScoringMode
+
+REPETITIONS = 5
+
+
+def score_scalar(actual_coords, guessed_coords, max_score=10000, distance_penalty=3):
+    results = []
+    for actual_coord, guessed_coord in zip(actual_coords, guessed_coords):
+        distance = (
+            math.sqrt(
+                (actual_coord[0] - guessed_coord[0]) ** 2
+                + (actual_coord[1] - guessed_coord[1]) ** 2
+            )
+            / 1000
+        )
+        results.append((max(0, max_score - distance * distance_penalty), distance))
+    return results
+
+
+def measure(function) -> float:
+    elapsed = []
+    for _ in range(REPETITIONS):
+        start = time.perf_counter()
+        function()
+        elapsed.append(time.perf_counter() - start)
+    return min(elapsed)
+
+
+def run(count: int, max_scalar: int):
+    rng = np.random.default_rng(count)
+    actual_coords = rng.uniform((660000, 5750000), (1170000, 6090000), size=(count, 2))
+    guessed_coords = rng.uniform((660000, 5750000), (1170000, 6090000), size=(count, 2))
+
+    cases = [
+        (
+            "numpy legacy",
+            lambda: ScoringEngine.calculate_scores_and_distances(
+                actual_coords, guessed_coords
+            ),
+        ),
+        (
+            "numpy haversine",
+            lambda: ScoringEngine.calculate_scores_and_distances(
+                actual_coords, guessed_coords, scoring_mode=ScoringMode.HAVERSINE
+            ),
+        ),
+    ]
+    if count <= max_scalar:
+        actual_list, guessed_list = actual_coords.tolist(), guessed_coords.tolist()
+        cases.insert(
+            0, ("scalar legacy", lambda: score_scalar(actual_list, guessed_list))
+        )
+
+    for name, function in cases:
+        elapsed = measure(function)
+        print(
+            f"{count:>9} guesses  {name:<16} {elapsed * 1000:10.3f} ms  "
+            f"{count / elapsed / 1e6:8.2f} M guesses/s"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--guesses", type=int, nargs="+", default=[1000, 100000, 1000000]
+    )
+    parser.add_argument("--max-scalar", type=int, default=1000000)
+    args = parser.parse_args()
+    for count in args.guesses:
+        run(count, args.max_scalar)
+
+
+if __name__ == "__main__":
+    main()
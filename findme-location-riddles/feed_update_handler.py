@@ -0,0 +1,60 @@
+import sys
+
+sys.path.insert(0, "/var/task/.venv/lib/python3.12/site-packages")
+import json
+
+from aws_lambda_powertools import Logger, Tracer
+from aws_lambda_powertools.utilities.batch import (
+    SqsFifoPartialProcessor,
+    process_partial_response,
+)
+from aws_lambda_powertools.utilities.data_classes.sqs_event import SQSRecord
+from aws_lambda_powertools.utilities.typing import LambdaContext
+
+from src.FeedRepository import FeedRepository
+from src.LocationRiddlesRepository import LocationRiddlesRepository
+from src.LocationRiddlesService import LocationRiddlesService
+
+tracer = Tracer()
+logger = Logger()
+
+# the events of a follower are applied in order, the rest of a batch is retried after a
+# failure
+processor = SqsFifoPartialProcessor()
+# images and the users service are not used to update the feeds
+location_riddles_service = LocationRiddlesService(
+    LocationRiddlesRepository(), None, None, feed_repository=FeedRepository()
+)
+
+
+@tracer.capture_method
+def record_handler(record: SQSRecord):
+    """
+    Body: {
+        "action": <follow | unfollow>,
+        "follower": <username>,
+        "followee": <username>
+    }
+    Description: Keeps the materialized feed of the follower in line with the follow
+        graph of findme-users. follow adds the existing location riddles of the
+        followee, unfollow removes them. Both are idempotent.
+    """
+    follow_event = json.loads(record.body)
+    if follow_event["action"] == "follow":
+        location_riddles_service.add_followee_to_feed(
+            follow_event["follower"], follow_event["followee"]
+        )
+    elif follow_event["action"] == "unfollow":
+        location_riddles_service.remove_followee_from_feed(
+            follow_event["follower"], follow_event["followee"]
+        )
+    else:
+        logger.error(f"Unknown follow event action: {follow_event['action']}")
+
+
+@logger.inject_lambda_context
+@tracer.capture_lambda_handler
+def lambda_handler(event: dict, context: LambdaContext) -> dict:
+    return process_partial_response(
+        event=event, record_handler=record_handler, processor=processor, context=context
+    )
@@ -4,7 +4,12 @@ sys.path.insert(0, "/var/task/.venv/lib/python3.12/site-packages")
 import os
 
 from aws_lambda_powertools import Logger, Tracer
-from aws_lambda_powertools.event_handler import APIGatewayRestResolver, CORSConfig
+from aws_lambda_powertools.event_handler import (
+    APIGatewayRestResolver,
+    CORSConfig,
+    Response,
+    content_types,
+)
 from aws_lambda_powertools.logging import correlation_paths
 from aws_lambda_powertools.shared.types import Annotated
 from aws_lambda_powertools.event_handler.openapi.params import Path
@@ -12,17 +17,33 @@ from aws_lambda_powertools.utilities.typing import LambdaContext
 from aws_lambda_powertools.event_handler.exceptions import BadRequestError
 
 from findme.authorization import Authorizer
+from findme_shared.NotModifiedError import NotModifiedError
+from findme_shared.ResponseCompressor import ResponseCompressor, DEFAULT_MIN_BYTES
 from enum import Enum
 
-from src.LocationRiddlesService import LocationRiddlesService
+from src.LocationRiddlesService import LocationRiddlesService, DEFAULT_PAGE_SIZE
+from src.DynamoDBUserTransport import DynamoDBUserTransport
+from src.FeedRepository import FeedRepository
 from src.ImageBucketRepository import ImageBucketRepository
+from src.ImageCache import ImageCache
+from src.LambdaUserTransport import LambdaUserTransport
 from src.LocationRiddlesRepository import LocationRiddlesRepository
+from src.ScoreWriteQueue import ScoreWriteQueue
+from src.TTLCache import TTLCache
 from src.UserMicroserviceClient import UserMicroserviceClient
+from src.entities.ImageDelivery import ImageDelivery
+from src.entities.ImageOptions import ImageOptions
+from src.entities.ImageSize import ImageSize
+from src.entities.ScoringMode import ScoringMode
 
 tracer = Tracer()
 logger = Logger()
 
-cors_config = CORSConfig(allow_origin=os.environ.get("FRONTEND_ORIGIN"))
+cors_config = CORSConfig(
+    allow_origin=os.environ.get("FRONTEND_ORIGIN"),
+    allow_headers=["If-None-Match"],
+    expose_headers=["ETag"],
+)
 app = APIGatewayRestResolver(cors=cors_config, enable_validation=True)
 app.enable_swagger(path="/location-riddles/swagger")
 
@@ -31,12 +52,51 @@ authorizer = Authorizer(
     auth0_audience=os.environ.get("AUTH0_AUDIENCE"),
 )
 
-image_bucket_repository = ImageBucketRepository()
+image_bucket_repository = ImageBucketRepository(
+    image_cache=ImageCache(
+        max_bytes=int(os.environ.get("IMAGE_CACHE_MAX_BYTES", 64 * 1024 * 1024)),
+        spill_directory="/tmp/image-cache",
+        max_spill_bytes=int(os.environ.get("IMAGE_CACHE_MAX_SPILL_BYTES", 0)),
+    )
+)
 location_riddle_repository = LocationRiddlesRepository()
-user_microservice_client = UserMicroserviceClient()
+user_cache_ttl_seconds = float(os.environ.get("USER_CACHE_TTL_SECONDS", 0))
+user_microservice_client = UserMicroserviceClient(
+    # dynamodb reads the users tables directly, score writes still invoke the users
+    # Lambda
+    transport=(
+        DynamoDBUserTransport(write_transport=LambdaUserTransport())
+        if os.environ.get("USER_TRANSPORT") == "dynamodb"
+        else LambdaUserTransport()
+    ),
+    cache=(
+        TTLCache(
+            max_entries=int(os.environ.get("USER_CACHE_MAX_ENTRIES", 1024)),
+            ttl_seconds=user_cache_ttl_seconds,
+        )
+        if user_cache_ttl_seconds > 0
+        else None
+    ),
+)
 location_riddles_service = LocationRiddlesService(
-    location_riddle_repository, image_bucket_repository, user_microservice_client
+    location_riddle_repository,
+    image_bucket_repository,
+    user_microservice_client,
+    max_workers=int(os.environ.get("MAX_WORKERS", 8)),
+    feed_repository=(
+        FeedRepository() if os.environ.get("FEED_MODE") == "materialized" else None
+    ),
+    scoring_mode=ScoringMode(os.environ.get("SCORING_MODE", ScoringMode.LEGACY.value)),
+    score_write_queue=(
+        ScoreWriteQueue() if os.environ.get("SCORE_WRITE_MODE") == "queue" else None
+    ),
 )
+response_compressor = ResponseCompressor(
+    min_bytes=int(os.environ.get("RESPONSE_COMPRESSION_MIN_BYTES", DEFAULT_MIN_BYTES))
+)
+
+MAX_PAGE_SIZE = 100
+MAX_NEARBY_RADIUS_METERS = 50000
 
 
 class RequestBodyAttribute(Enum):
@@ -47,6 +107,18 @@ class RequestBodyAttribute(Enum):
     COMMENT = "comment"
     RATING = "rating"
     ARENAS = "arenas"
+    LIMIT = "limit"
+    CURSOR = "cursor"
+    IMAGE_DELIVERY = "image_delivery"
+    IMAGE_SIZE = "image_size"
+    LAT = "lat"
+    LON = "lon"
+    RADIUS = "radius"
+
+
+@app.exception_handler(NotModifiedError)
+def handle_not_modified(e: NotModifiedError):
+    return Response(status_code=304, headers={"ETag": e.etag}, body="")
 
 
 @app.post("/location-riddles")
@@ -64,6 +136,7 @@ def post_location_riddles():
     Returns: A message indicating the successful upload of the location riddle.
     """
     return location_riddles_service.post_location_riddle(
+        app.current_event,
         __get_attribute_from_request_body(RequestBodyAttribute.IMAGE.value, app),
         __get_attribute_from_request_body(RequestBodyAttribute.LOCATION.value, app),
         __get_attribute_from_request_body(RequestBodyAttribute.ARENAS.value, app),
@@ -93,6 +166,7 @@ def post_guess_to_location_riddle(location_riddle_id: Annotated[str, Path()]):
         location_riddle_id,
         __get_username(),
         __get_attribute_from_request_body(RequestBodyAttribute.GUESS.value, app),
+        __get_image_options(),
     )
 
 
@@ -112,6 +186,7 @@ def post_comment_to_location_riddle(location_riddle_id: Annotated[str, Path()]):
         location_riddle_id,
         __get_username(),
         __get_attribute_from_request_body(RequestBodyAttribute.COMMENT.value, app),
+        __get_image_options(),
     )
 
 
@@ -120,13 +195,37 @@ def post_comment_to_location_riddle(location_riddle_id: Annotated[str, Path()]):
 @authorizer.requires_auth(app=app)
 def get_location_riddles():
     """
-    Endpoint: GET /location-riddles
+    Endpoint: GET /location-riddles?limit=<limit>&cursor=<cursor>
     Body: None
-    Description: Retrieves all location riddles of all users I follow.
-    Returns: A list of location riddles.
+    Description: Retrieves the location riddles of all users I follow, newest first.
+    Returns: A list of location riddles. If limit or cursor is provided a page in the
+        format:
+        {
+        "location_riddles": [<location_riddle>],
+        "cursor": <cursor of the next page or null>
+        }
+        The ETag header can be sent back in If-None-Match, an unchanged feed is answered
+        with 304.
     """
-    return location_riddles_service.get_location_riddles_feed(
-        app.current_event, __get_username()
+    if not __is_paginated_request():
+        return __get_response_with_etag(
+            *location_riddles_service.get_location_riddles_feed_with_etag(
+                app.current_event,
+                __get_username(),
+                __get_image_options(),
+                __get_if_none_match(),
+            )
+        )
+    limit, cursor = __get_pagination_parameters()
+    return __get_response_with_etag(
+        *location_riddles_service.get_location_riddles_feed_page_with_etag(
+            app.current_event,
+            __get_username(),
+            limit,
+            cursor,
+            __get_image_options(),
+            __get_if_none_match(),
+        )
     )
 
 
@@ -135,13 +234,47 @@ def get_location_riddles():
 @authorizer.requires_auth(app=app)
 def get_location_riddles_arena(arena_name: Annotated[str, Path()]):
     """
-    Endpoint: GET /location-riddles/arena/<arena>
+    Endpoint: GET /location-riddles/arena/<arena>?limit=<limit>&cursor=<cursor>
     Body: None
-    Description: Retrieves all location riddles that contain the requested arena.
-    Returns: A list of location riddles.
+    Description: Retrieves the location riddles that contain the requested arena, newest
+        first.
+    Returns: A list of location riddles. If limit or cursor is provided a page in the
+        format:
+        {
+        "location_riddles": [<location_riddle>],
+        "cursor": <cursor of the next page or null>
+        }
     """
-    return location_riddles_service.get_location_riddles_arena(
-        arena_name, __get_username()
+    if not __is_paginated_request():
+        return location_riddles_service.get_location_riddles_arena(
+            arena_name, __get_username(), __get_image_options()
+        )
+    limit, cursor = __get_pagination_parameters()
+    return location_riddles_service.get_location_riddles_arena_page(
+        arena_name, __get_username(), limit, cursor, __get_image_options()
+    )
+
+
+@app.get("/location-riddles/nearby")
+@tracer.capture_method
+@authorizer.requires_auth(app=app)
+def get_nearby_location_riddles():
+    """
+    Endpoint: GET /location-riddles/nearby
+    Query parameters: lat=<lat>, lon=<lon>, radius=<radius>, limit=<limit>
+    Body: None
+    Description: Retrieves the location riddles of other users within radius meters (max
+        50000) of the WGS84 position lat/lon, nearest first.
+    Returns: A list of at most limit location riddles.
+    """
+    lat = __get_float_query_parameter(RequestBodyAttribute.LAT.value, -90, 90)
+    lon = __get_float_query_parameter(RequestBodyAttribute.LON.value, -180, 180)
+    radius = __get_float_query_parameter(
+        RequestBodyAttribute.RADIUS.value, 0, MAX_NEARBY_RADIUS_METERS
+    )
+    limit, _ = __get_pagination_parameters()
+    return location_riddles_service.get_nearby_location_riddles(
+        __get_username(), lat, lon, radius, limit, __get_image_options()
     )
 
 
@@ -150,13 +283,29 @@ def get_location_riddles_arena(arena_name: Annotated[str, Path()]):
 @authorizer.requires_auth(app=app)
 def get_location_riddles_by_user(username: Annotated[str, Path()]):
     """
-    Endpoint: GET /location-riddles/user/<username>
+    Endpoint: GET /location-riddles/user/<username>?limit=<limit>&cursor=<cursor>
     Body: None
     Description: Retrieves all location riddles for a specific user.
-    Returns: A list of location riddles.
+    Returns: A list of location riddles. If limit or cursor is provided a page in the
+        format:
+        {
+        "location_riddles": [<location_riddle>],
+        "cursor": <cursor of the next page or null>
+        }
     """
-    return location_riddles_service.get_location_riddles_for_user(
-        username=username, requester_username=__get_username()
+    if not __is_paginated_request():
+        return location_riddles_service.get_location_riddles_for_user(
+            username=username,
+            requester_username=__get_username(),
+            image_options=__get_image_options(),
+        )
+    limit, cursor = __get_pagination_parameters()
+    return location_riddles_service.get_location_riddles_for_user_page(
+        username=username,
+        requester_username=__get_username(),
+        limit=limit,
+        cursor=cursor,
+        image_options=__get_image_options(),
     )
 
 
@@ -165,13 +314,29 @@ def get_location_riddles_by_user(username: Annotated[str, Path()]):
 @authorizer.requires_auth(app=app)
 def get_location_riddles_by_user():
     """
-    Endpoint: GET /location-riddles/user
+    Endpoint: GET /location-riddles/user?limit=<limit>&cursor=<cursor>
     Body: None
     Description: Retrieves all location riddles for the current user.
-    Returns: A list of location riddles.
+    Returns: A list of location riddles. If limit or cursor is provided a page in the
+        format:
+        {
+        "location_riddles": [<location_riddle>],
+        "cursor": <cursor of the next page or null>
+        }
     """
-    return location_riddles_service.get_location_riddles_for_user(
-        username=__get_username(), requester_username=__get_username()
+    if not __is_paginated_request():
+        return location_riddles_service.get_location_riddles_for_user(
+            username=__get_username(),
+            requester_username=__get_username(),
+            image_options=__get_image_options(),
+        )
+    limit, cursor = __get_pagination_parameters()
+    return location_riddles_service.get_location_riddles_for_user_page(
+        username=__get_username(),
+        requester_username=__get_username(),
+        limit=limit,
+        cursor=cursor,
+        image_options=__get_image_options(),
     )
 
 
@@ -180,13 +345,31 @@ def get_location_riddles_by_user():
 @authorizer.requires_auth(app=app)
 def get_solved_location_riddles_by_user(username: Annotated[str, Path()]):
     """
-    Endpoint: GET /location-riddles/user/<username>/solved
+    Endpoint: GET /location-riddles/user/<username>/solved?limit=<limit>&cursor=<cursor>
     Body: None
     Description: Retrieves all solved location riddles for a specific user.
-    Returns: A list of location riddles.
+    Returns: A list of location riddles. If limit or cursor is provided a page in the
+        format:
+        {
+        "location_riddles": [<location_riddle>],
+        "cursor": <cursor of the next page or null>
+        }
     """
-    return location_riddles_service.get_solved_location_riddles_for_user(
-        app.current_event, username=username, requester_username=__get_username()
+    if not __is_paginated_request():
+        return location_riddles_service.get_solved_location_riddles_for_user(
+            app.current_event,
+            username=username,
+            requester_username=__get_username(),
+            image_options=__get_image_options(),
+        )
+    limit, cursor = __get_pagination_parameters()
+    return location_riddles_service.get_solved_location_riddles_for_user_page(
+        app.current_event,
+        username=username,
+        requester_username=__get_username(),
+        limit=limit,
+        cursor=cursor,
+        image_options=__get_image_options(),
     )
 
 
@@ -195,15 +378,31 @@ def get_solved_location_riddles_by_user(username: Annotated[str, Path()]):
 @authorizer.requires_auth(app=app)
 def get_solved_location_riddles_by_user():
     """
-    Endpoint: GET /location-riddles/user
+    Endpoint: GET /location-riddles/user/solved?limit=<limit>&cursor=<cursor>
     Body: None
     Description: Retrieves all solved location riddles for the current user.
-    Returns: A list of location riddles.
+    Returns: A list of location riddles. If limit or cursor is provided a page in the
+        format:
+        {
+        "location_riddles": [<location_riddle>],
+        "cursor": <cursor of the next page or null>
+        }
     """
-    return location_riddles_service.get_solved_location_riddles_for_user(
+    if not __is_paginated_request():
+        return location_riddles_service.get_solved_location_riddles_for_user(
+            app.current_event,
+            username=__get_username(),
+            requester_username=__get_username(),
+            image_options=__get_image_options(),
+        )
+    limit, cursor = __get_pagination_parameters()
+    return location_riddles_service.get_solved_location_riddles_for_user_page(
         app.current_event,
         username=__get_username(),
         requester_username=__get_username(),
+        limit=limit,
+        cursor=cursor,
+        image_options=__get_image_options(),
     )
 
 
@@ -211,16 +410,62 @@ def get_solved_location_riddles_by_user():
 @tracer.capture_method
 @authorizer.requires_auth(app=app)
 def get_location_riddles_by_location_riddle_id(
-        location_riddle_id: Annotated[str, Path()],
+    location_riddle_id: Annotated[str, Path()],
 ):
     """
     Endpoint: GET /location-riddles/<location_riddle_id>
     Body: None
     Description: Retrieves a specific location riddle by its ID.
-    Returns: The requested location riddle.
+    Returns: The requested location riddle. The ETag header can be sent back in
+        If-None-Match, an unchanged location riddle is answered with 304.
     """
-    return location_riddles_service.get_location_riddle(
-        location_riddle_id, __get_username()
+    return __get_response_with_etag(
+        *location_riddles_service.get_location_riddle_with_etag(
+            location_riddle_id,
+            __get_username(),
+            __get_image_options(),
+            __get_if_none_match(),
+        )
+    )
+
+
+@app.get("/location-riddles/<location_riddle_id>/comments")
+@tracer.capture_method
+@authorizer.requires_auth(app=app)
+def get_location_riddle_comments(location_riddle_id: Annotated[str, Path()]):
+    """
+    Endpoint: GET /location-riddles/<location_riddle_id>/comments
+    Query parameters: limit=<limit>, cursor=<cursor>
+    Body: None
+    Description: Retrieves the comments of a specific location riddle, newest first.
+    Returns: A page in the format:
+        {
+        "comments": [<comment>],
+        "cursor": <cursor of the next page or null>
+        }
+    """
+    limit, cursor = __get_pagination_parameters()
+    return location_riddles_service.get_comments_page(location_riddle_id, limit, cursor)
+
+
+@app.get("/location-riddles/<location_riddle_id>/guesses")
+@tracer.capture_method
+@authorizer.requires_auth(app=app)
+def get_location_riddle_guesses(location_riddle_id: Annotated[str, Path()]):
+    """
+    Endpoint: GET /location-riddles/<location_riddle_id>/guesses
+    Query parameters: limit=<limit>, cursor=<cursor>
+    Body: None
+    Description: Retrieves the guesses of a location riddle the current user has solved.
+    Returns: A page in the format:
+        {
+        "guesses": [<guess>],
+        "cursor": <cursor of the next page or null>
+        }
+    """
+    limit, cursor = __get_pagination_parameters()
+    return location_riddles_service.get_guesses_page(
+        location_riddle_id, __get_username(), limit, cursor
     )
 
 
@@ -240,6 +485,7 @@ def rate_location_riddle(location_riddle_id: Annotated[str, Path()]):
         location_riddle_id,
         __get_username(),
         __get_attribute_from_request_body(RequestBodyAttribute.RATING.value, app),
+        __get_image_options(),
     )
 
 
@@ -247,7 +493,7 @@ def rate_location_riddle(location_riddle_id: Annotated[str, Path()]):
 @tracer.capture_method
 @authorizer.requires_auth(app=app)
 def delete_location_riddles_by_location_riddle_id(
-        location_riddle_id: Annotated[str, Path()],
+    location_riddle_id: Annotated[str, Path()],
 ):
     """
     Endpoint: DELETE /location-riddles/<location_riddle_id>
@@ -264,6 +510,86 @@ def __get_username():
     return app.context.get("claims").get(RequestBodyAttribute.FINDME_USERNAME.value)
 
 
+def __get_if_none_match():
+    return app.current_event.get_header_value("If-None-Match", case_sensitive=False)
+
+
+def __get_response_with_etag(body, etag):
+    return Response(
+        status_code=200,
+        content_type=content_types.APPLICATION_JSON,
+        body=body,
+        headers={"ETag": etag},
+    )
+
+
+def __is_paginated_request():
+    query_string_parameters = app.current_event.query_string_parameters or {}
+    return (
+        RequestBodyAttribute.LIMIT.value in query_string_parameters
+        or RequestBodyAttribute.CURSOR.value in query_string_parameters
+    )
+
+
+def __get_pagination_parameters():
+    limit = app.current_event.get_query_string_value(
+        RequestBodyAttribute.LIMIT.value, str(DEFAULT_PAGE_SIZE)
+    )
+    if not limit.isdigit() or not 0 < int(limit) <= MAX_PAGE_SIZE:
+        raise BadRequestError(
+            f"limit has to be an integer between 1 and {MAX_PAGE_SIZE}"
+        )
+    return int(limit), app.current_event.get_query_string_value(
+        RequestBodyAttribute.CURSOR.value
+    )
+
+
+def __get_float_query_parameter(name, min_value, max_value):
+    value = app.current_event.get_query_string_value(name)
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        raise BadRequestError(
+            f"{name} has to be a number between {min_value} and {max_value}"
+        )
+    if not min_value <= value <= max_value:
+        raise BadRequestError(
+            f"{name} has to be a number between {min_value} and {max_value}"
+        )
+    return value
+
+
+def __get_image_options():
+    """
+    Query parameters: image_delivery=<base64 | url>,
+        image_size=<thumbnail | medium | full>
+    base64 (default) inlines the image into image_base64, url returns a short-lived link
+    in image_url. full (default) is the uploaded image, thumbnail and medium are
+    downscaled WebP derivatives.
+    """
+    image_delivery = app.current_event.get_query_string_value(
+        RequestBodyAttribute.IMAGE_DELIVERY.value, ImageDelivery.BASE64.value
+    )
+    image_size = app.current_event.get_query_string_value(
+        RequestBodyAttribute.IMAGE_SIZE.value, ImageSize.FULL.value
+    )
+    try:
+        delivery = ImageDelivery(image_delivery)
+    except ValueError:
+        raise BadRequestError(
+            f"image_delivery {image_delivery} does not exist, "
+            "please provide a valid value (base64/url)"
+        )
+    try:
+        size = ImageSize(image_size)
+    except ValueError:
+        raise BadRequestError(
+            f"image_size {image_size} does not exist, "
+            "please provide a valid value (thumbnail/medium/full)"
+        )
+    return ImageOptions(delivery=delivery, size=size)
+
+
 def __get_attribute_from_request_body(attribute, app):
     try:
         return app.current_event.json_body[attribute]
@@ -274,4 +600,9 @@ def __get_attribute_from_request_body(attribute, app):
 @logger.inject_lambda_context(correlation_id_path=correlation_paths.API_GATEWAY_REST)
 @tracer.capture_lambda_handler
 def lambda_handler(event: dict, context: LambdaContext) -> dict:
-    return app.resolve(event, context)
+    response = response_compressor.compress(event, app.resolve(event, context))
+    logger.debug({"image_cache": image_bucket_repository.image_cache.get_statistics()})
+    if user_microservice_client.cache is not None:
+        logger.debug({"user_cache": user_microservice_client.cache.get_statistics()})
+    logger.debug({"user_transport": user_microservice_client.get_latency_statistics()})
+    return response
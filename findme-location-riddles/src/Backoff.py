@@ -0,0 +1,20 @@
+import random
+import time
+
+# UnprocessedKeys of BatchGetItem signal throttling, they are retried at most
+# MAX_RETRIES times
+MAX_RETRIES = 5
+BASE_BACKOFF_SECONDS = 0.05
+
+
+class Backoff:
+    """
+    Capped exponential backoff with jitter between the retries of a partially processed
+    batch request.
+    """
+
+    @staticmethod
+    def sleep(attempt: int, base_seconds: float = BASE_BACKOFF_SECONDS):
+        # attempt 0 is the first request and is not delayed
+        if attempt > 0:
+            time.sleep(base_seconds * 2 ** (attempt - 1) * random.uniform(0.5, 1))
@@ -0,0 +1,74 @@
+import base64
+import json
+from decimal import Decimal
+from typing import Iterable, Optional
+
+from aws_lambda_powertools.event_handler.exceptions import BadRequestError
+
+# position of cursors paging through a list held in memory
+OFFSET_KEY = "offset"
+
+
+class Cursor:
+    """
+    Opaque pagination cursor handed out to clients. Wraps a DynamoDB LastEvaluatedKey
+    (or any other json serializable position, e.g. an offset) in url-safe base64.
+    """
+
+    @staticmethod
+    def encode(position) -> Optional[str]:
+        if not position:
+            return None
+        return base64.urlsafe_b64encode(
+            json.dumps(position, default=Cursor.__encode_decimal).encode("utf-8")
+        ).decode("utf-8")
+
+    @staticmethod
+    def decode(cursor: Optional[str], keys: Iterable[str] = None) -> Optional[dict]:
+        """
+        keys: the attributes the position has to consist of, e.g. the key attributes of
+            the queried table or index
+        Returns: the position, raises BadRequestError if the cursor is not a position
+            with string or integer values (and exactly keys if given)
+        """
+        if not cursor:
+            return None
+        try:
+            position = json.loads(base64.urlsafe_b64decode(cursor.encode("utf-8")))
+        except (ValueError, TypeError):
+            raise BadRequestError(f"Invalid cursor: {cursor}")
+        # anything else would reach ExclusiveStartKey and fail the request with a 500
+        if (
+            not isinstance(position, dict)
+            or (keys is not None and set(position) != set(keys))
+            or not all(
+                isinstance(value, (str, int)) and not isinstance(value, bool)
+                for value in position.values()
+            )
+        ):
+            raise BadRequestError(f"Invalid cursor: {cursor}")
+        return position
+
+    @staticmethod
+    def encode_offset(offset: int) -> str:
+        return Cursor.encode({OFFSET_KEY: offset})
+
+    @staticmethod
+    def decode_offset(cursor: Optional[str]) -> int:
+        """
+        Returns: the offset into a list, 0 without cursor
+        """
+        position = Cursor.decode(cursor, [OFFSET_KEY])
+        if position is None:
+            return 0
+        if not isinstance(position[OFFSET_KEY], int) or position[OFFSET_KEY] < 0:
+            raise BadRequestError(f"Invalid cursor: {cursor}")
+        return position[OFFSET_KEY]
+
+    @staticmethod
+    def __encode_decimal(value):
+        if isinstance(value, Decimal):
+            return int(value) if value == value.to_integral_value() else float(value)
+        raise TypeError(
+            f"Object of type {type(value).__name__} is not JSON serializable"
+        )
@@ -0,0 +1,131 @@
+import boto3
+from aws_lambda_powertools.event_handler.exceptions import (
+    BadRequestError,
+    NotFoundError,
+)
+from aws_lambda_powertools.logging import Logger
+from boto3.dynamodb.conditions import Key
+
+from .Backoff import Backoff, MAX_RETRIES
+from .base.AbstractUserTransport import AbstractUserTransport
+
+logger = Logger()
+
+USERS_TABLE_NAME = "usersTable"
+FOLLOWER_TABLE_NAME = "FollowerTable"
+USER_PARTITION_KEY = "USER"
+FOLLOWING_PARTITION_KEY = "FOLLOWING"
+FOLLOWERS_PARTITION_KEY = "FOLLOWERS"
+# maximum number of keys of a single BatchGetItem request
+BATCH_GET_SIZE = 100
+
+
+class DynamoDBUserTransport(AbstractUserTransport):
+    """
+    Reads the users and follower tables of findme-users directly, without invoking the
+    users service. Read-only: score writes are passed to write_transport, the users
+    service owns the write logic.
+    """
+
+    def __init__(self, write_transport: AbstractUserTransport):
+        self.dynamodb = boto3.resource("dynamodb", region_name="eu-central-2")
+        self.users_table = self.dynamodb.Table(USERS_TABLE_NAME)
+        self.follower_table = self.dynamodb.Table(FOLLOWER_TABLE_NAME)
+        self.write_transport = write_transport
+
+    def get_user_connections(self, event, username: str) -> dict:
+        return {
+            "followers": self.__get_users(
+                self.__get_connection_usernames(FOLLOWERS_PARTITION_KEY, username)
+            ),
+            "following": self.__get_users(
+                self.__get_connection_usernames(FOLLOWING_PARTITION_KEY, username)
+            ),
+        }
+
+    def get_user_scores(self, event, username: str) -> list[dict]:
+        response = self.users_table.get_item(
+            Key={"partition_key": USER_PARTITION_KEY, "username": username},
+            ProjectionExpression="scores",
+        )
+        if "Item" not in response:
+            raise NotFoundError(f"No User with username: {username} found")
+        return [
+            {
+                "location_riddle_id": score["location_riddle_id"],
+                "score": int(score["score"]),
+            }
+            for score in response["Item"].get("scores", [])
+        ]
+
+    def write_score(self, event, username: str, location_riddle_id: str, score: int):
+        self.write_transport.write_score(event, username, location_riddle_id, score)
+
+    def __get_connection_usernames(
+        self, partition_key: str, username: str
+    ) -> list[str]:
+        # sort_key: <username>#<connected username>
+        query_parameters = {
+            "KeyConditionExpression": Key("partition_key").eq(partition_key)
+            & Key("sort_key").begins_with(f"{username}#"),
+            "ProjectionExpression": "sort_key",
+        }
+        usernames = []
+        while True:
+            response = self.follower_table.query(**query_parameters)
+            usernames.extend(
+                item["sort_key"].split("#", 1)[1] for item in response["Items"]
+            )
+            if "LastEvaluatedKey" not in response:
+                return usernames
+            query_parameters["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    def __get_users(self, usernames: list[str]) -> list[dict]:
+        # same fields as UserDTO, users that do not exist are skipped
+        items = {}
+        for start in range(0, len(usernames), BATCH_GET_SIZE):
+            request_items = {
+                USERS_TABLE_NAME: {
+                    "Keys": [
+                        {"partition_key": USER_PARTITION_KEY, "username": username}
+                        for username in usernames[start : start + BATCH_GET_SIZE]
+                    ],
+                    "ProjectionExpression": (
+                        "username, first_name, last_name, bio, scores"
+                    ),
+                }
+            }
+            for attempt in range(MAX_RETRIES + 1):
+                Backoff.sleep(attempt)
+                response = self.dynamodb.batch_get_item(RequestItems=request_items)
+                for item in response["Responses"].get(USERS_TABLE_NAME, []):
+                    items[item["username"]] = item
+                request_items = response.get("UnprocessedKeys")
+                if not request_items:
+                    break
+            else:
+                logger.error(
+                    "Unable to read all users from DynamoDB, "
+                    f"unprocessed: {request_items}"
+                )
+                raise BadRequestError("Unable to read all users from DynamoDB")
+        return [
+            DynamoDBUserTransport.__to_user_dto(items[username])
+            for username in usernames
+            if username in items
+        ]
+
+    @staticmethod
+    def __to_user_dto(item: dict) -> dict:
+        scores = item.get("scores", [])
+        return {
+            "username": item["username"],
+            "first_name": item["first_name"],
+            "last_name": item["last_name"],
+            "bio": item.get("bio"),
+            "average_score": (
+                float(sum(score["score"] for score in scores) / len(scores))
+                if scores
+                else None
+            ),
+        }
@@ -0,0 +1,143 @@
+import heapq
+from collections import deque
+from concurrent.futures import Executor
+from typing import Optional
+
+from aws_lambda_powertools.event_handler.exceptions import BadRequestError
+
+from .Cursor import Cursor
+from .base.AbstractLocationRiddlesRepository import AbstractLocationRiddlesRepository
+from .entities.LocationRiddle import LocationRiddle
+
+
+def feed_order(location_riddle: LocationRiddle) -> tuple[int, str]:
+    # newest first, location riddles created in the same second are ordered by their id
+    return -location_riddle.created_at, location_riddle.location_riddle_id
+
+
+class FeedStream:
+    """
+    Newest first stream of the location riddles of one user, read lazily page by page
+    from the repository. With a position only the location riddles after it in feed
+    order are returned. The index only orders by created_at, the location riddles of the
+    oldest second of a page are held back until the next page shows that second is
+    complete, ties split across pages are then still returned in feed order.
+    """
+
+    def __init__(
+        self,
+        location_riddle_repository: AbstractLocationRiddlesRepository,
+        username: str,
+        page_size: int,
+        position: Optional[tuple[int, str]] = None,
+    ):
+        self.location_riddle_repository = location_riddle_repository
+        self.username = username
+        self.page_size = page_size
+        self.position = position
+        self.buffer = deque()
+        self.pending = []
+        self.cursor = None
+        self.is_exhausted = False
+
+    def next(self) -> Optional[LocationRiddle]:
+        while not self.buffer and not self.is_exhausted:
+            self.__read_page()
+        return self.buffer.popleft() if self.buffer else None
+
+    def __read_page(self):
+        location_riddles, self.cursor = (
+            self.location_riddle_repository.get_location_riddles_by_username_page(
+                self.username,
+                self.page_size,
+                self.cursor,
+                before=-self.position[0] if self.position else None,
+            )
+        )
+        self.is_exhausted = self.cursor is None
+        location_riddles = self.pending + location_riddles
+        self.pending = []
+        if not self.is_exhausted and location_riddles:
+            oldest_created_at = min(
+                location_riddle.created_at for location_riddle in location_riddles
+            )
+            self.pending = [
+                location_riddle
+                for location_riddle in location_riddles
+                if location_riddle.created_at == oldest_created_at
+            ]
+            location_riddles = [
+                location_riddle
+                for location_riddle in location_riddles
+                if location_riddle.created_at != oldest_created_at
+            ]
+        location_riddles.sort(key=feed_order)
+        self.buffer.extend(
+            location_riddle
+            for location_riddle in location_riddles
+            if self.position is None or feed_order(location_riddle) > self.position
+        )
+
+
+class FeedMerger:
+    """
+    Builds feed pages by merging the newest first streams of all followees with a heap.
+    Every stream reads at most one page of page size up front, further pages are only
+    read for streams the page is actually taken from. The cursor is the feed position of
+    the last returned location riddle.
+    """
+
+    def __init__(
+        self,
+        location_riddle_repository: AbstractLocationRiddlesRepository,
+        executor: Executor,
+    ):
+        self.location_riddle_repository = location_riddle_repository
+        self.executor = executor
+
+    def get_page(
+        self, usernames: list[str], limit: int, cursor: str = None
+    ) -> tuple[list[LocationRiddle], Optional[str]]:
+        position = FeedMerger.__decode_position(cursor)
+        streams = [
+            FeedStream(self.location_riddle_repository, username, limit, position)
+            for username in dict.fromkeys(usernames)
+        ]
+
+        # the first page of every stream is read concurrently
+        heap = [
+            (feed_order(location_riddle), index, location_riddle)
+            for index, location_riddle in enumerate(
+                self.executor.map(lambda stream: stream.next(), streams)
+            )
+            if location_riddle is not None
+        ]
+        heapq.heapify(heap)
+
+        location_riddles = []
+        while heap and len(location_riddles) < limit:
+            _, index, location_riddle = heapq.heappop(heap)
+            location_riddles.append(location_riddle)
+            next_location_riddle = streams[index].next()
+            if next_location_riddle is not None:
+                heapq.heappush(
+                    heap,
+                    (feed_order(next_location_riddle), index, next_location_riddle),
+                )
+
+        if not heap:
+            return location_riddles, None
+        created_at, location_riddle_id = feed_order(location_riddles[-1])
+        return location_riddles, Cursor.encode(
+            {"created_at": -created_at, "location_riddle_id": location_riddle_id}
+        )
+
+    @staticmethod
+    def __decode_position(cursor: str) -> Optional[tuple[int, str]]:
+        position = Cursor.decode(cursor, ["created_at", "location_riddle_id"])
+        if position is None:
+            return None
+        try:
+            return -int(position["created_at"]), str(position["location_riddle_id"])
+        except (KeyError, TypeError, ValueError):
+            raise BadRequestError(f"Invalid cursor: {cursor}")
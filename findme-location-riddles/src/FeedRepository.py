@@ -0,0 +1,110 @@
+import boto3
+from aws_lambda_powertools.event_handler.exceptions import BadRequestError
+from aws_lambda_powertools.logging import Logger
+from boto3.dynamodb.conditions import Attr, Key
+from botocore.exceptions import ClientError
+
+from .Cursor import Cursor
+from .base.AbstractFeedRepository import AbstractFeedRepository
+from .entities.LocationRiddle import LocationRiddle
+
+logger = Logger()
+
+
+class FeedRepository(AbstractFeedRepository):
+    """
+    Materialized feed: every user owns a partition holding references to the
+    location riddles of the users they follow, sorted by creation time.
+    """
+
+    def __init__(self):
+        self.dynamodb = boto3.resource("dynamodb", region_name="eu-central-2")
+        self.table = self.dynamodb.Table("feedTable")
+
+    def push_location_riddle_to_feeds(
+        self, usernames: list[str], location_riddle: LocationRiddle
+    ):
+        self.__put_feed_entries((username, location_riddle) for username in usernames)
+
+    def push_location_riddles_to_feed(
+        self, username: str, location_riddles: list[LocationRiddle]
+    ):
+        # backfill of a new followee, puts are idempotent
+        self.__put_feed_entries(
+            (username, location_riddle) for location_riddle in location_riddles
+        )
+
+    def remove_author_from_feed(self, username: str, author: str):
+        query_parameters = {
+            "KeyConditionExpression": Key("username").eq(username),
+            "FilterExpression": Attr("author").eq(author),
+            "ProjectionExpression": "username, sort_key",
+        }
+        try:
+            with self.table.batch_writer(
+                overwrite_by_pkeys=["username", "sort_key"]
+            ) as batch:
+                while True:
+                    response = self.table.query(**query_parameters)
+                    for item in response["Items"]:
+                        batch.delete_item(
+                            Key={
+                                "username": item["username"],
+                                "sort_key": item["sort_key"],
+                            }
+                        )
+                    if "LastEvaluatedKey" not in response:
+                        return
+                    query_parameters["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+        except ClientError as e:
+            logger.error(f"Error removing feed entries from DynamoDB: {e}")
+            raise BadRequestError(f"Error removing feed entries from DynamoDB: {e}")
+
+    def get_feed_location_riddle_ids(
+        self, username: str, limit: int, cursor: str = None
+    ) -> tuple[list[str], str]:
+        query_parameters = {
+            "KeyConditionExpression": Key("username").eq(username),
+            "ScanIndexForward": False,
+            "Limit": limit,
+        }
+        if cursor:
+            query_parameters["ExclusiveStartKey"] = Cursor.decode(
+                cursor, ["username", "sort_key"]
+            )
+
+        try:
+            response = self.table.query(**query_parameters)
+        except ClientError as e:
+            logger.error(f"Error reading feed from DynamoDB: {e}")
+            raise BadRequestError(f"Error reading feed from DynamoDB: {e}")
+
+        return (
+            [item["location_riddle_id"] for item in response["Items"]],
+            Cursor.encode(response.get("LastEvaluatedKey")),
+        )
+
+    def __put_feed_entries(self, entries):
+        try:
+            with self.table.batch_writer(
+                overwrite_by_pkeys=["username", "sort_key"]
+            ) as batch:
+                for username, location_riddle in entries:
+                    batch.put_item(
+                        Item={
+                            "username": username,
+                            "sort_key": FeedRepository.get_sort_key(location_riddle),
+                            "location_riddle_id": location_riddle.location_riddle_id,
+                            "author": location_riddle.username,
+                            "created_at": location_riddle.created_at,
+                        }
+                    )
+        except ClientError as e:
+            logger.error(f"Error writing feed entries to DynamoDB: {e}")
+            raise BadRequestError(f"Error writing feed entries to DynamoDB: {e}")
+
+    @staticmethod
+    def get_sort_key(location_riddle: LocationRiddle) -> str:
+        # zero padded so the lexicographic order of the sort key is the chronological
+        # one
+        return f"{location_riddle.created_at:012d}#{location_riddle.location_riddle_id}"
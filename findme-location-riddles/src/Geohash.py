@@ -0,0 +1,131 @@
+import math
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+EARTH_RADIUS_METERS = 6371008.8
+# radius of the sphere used by EPSG:3857 (Web Mercator)
+WEB_MERCATOR_RADIUS_METERS = 6378137.0
+# the spatial index is partitioned by cells of ~39km x 20km, entries are sorted by their
+# ~5m cell
+GEO_INDEX_PARTITION_PRECISION = 4
+GEO_INDEX_PRECISION = 9
+
+
+class Geohash:
+    """
+    Geohash encoding of WGS84 coordinates and the distance helpers used by the spatial
+    index. Locations of location riddles are stored as Web Mercator (EPSG:3857) meters
+    and converted with to_lat_lon.
+    """
+
+    @staticmethod
+    def encode(lat: float, lon: float, precision: int) -> str:
+        lat_range = [-90.0, 90.0]
+        lon_range = [-180.0, 180.0]
+        geohash = []
+        bits = 0
+        bit_count = 0
+        is_lon_bit = True
+        while len(geohash) < precision:
+            value, value_range = (lon, lon_range) if is_lon_bit else (lat, lat_range)
+            middle = (value_range[0] + value_range[1]) / 2
+            bits <<= 1
+            if value >= middle:
+                bits |= 1
+                value_range[0] = middle
+            else:
+                value_range[1] = middle
+            is_lon_bit = not is_lon_bit
+            bit_count += 1
+            if bit_count == 5:
+                geohash.append(BASE32[bits])
+                bits = 0
+                bit_count = 0
+        return "".join(geohash)
+
+    @staticmethod
+    def cell_size(precision: int) -> tuple[float, float]:
+        # returns the (lat, lon) size of a cell in degrees, longitude takes the odd bit
+        lon_bits = math.ceil(precision * 5 / 2)
+        lat_bits = precision * 5 // 2
+        return 180.0 / 2**lat_bits, 360.0 / 2**lon_bits
+
+    @staticmethod
+    def covering_cells(
+        lat: float, lon: float, radius: float, min_precision: int, max_cells: int
+    ) -> list[str]:
+        """
+        Returns the geohash cells covering the bounding box of the circle around (lat,
+        lon). The most precise level with at most max_cells cells is used, but never one
+        below min_precision.
+        """
+        delta_lat = math.degrees(radius / EARTH_RADIUS_METERS)
+        min_lat, max_lat = max(lat - delta_lat, -90.0), min(lat + delta_lat, 90.0)
+        if max_lat >= 90.0 or min_lat <= -90.0:
+            min_lon, max_lon = -180.0, 180.0
+        else:
+            cos_lat = min(
+                math.cos(math.radians(min_lat)), math.cos(math.radians(max_lat))
+            )
+            delta_lon = math.degrees(radius / (EARTH_RADIUS_METERS * cos_lat))
+            min_lon, max_lon = max(lon - delta_lon, -180.0), min(lon + delta_lon, 180.0)
+
+        precision = min_precision
+        while (
+            precision < 9
+            and Geohash.__count_cells(min_lat, min_lon, max_lat, max_lon, precision + 1)
+            <= max_cells
+        ):
+            precision += 1
+        return Geohash.__cells_in_bounding_box(
+            min_lat, min_lon, max_lat, max_lon, precision
+        )
+
+    @staticmethod
+    def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+        # great circle distance in meters
+        phi1, phi2 = math.radians(lat1), math.radians(lat2)
+        delta_phi = phi2 - phi1
+        delta_lambda = math.radians(lon2 - lon1)
+        a = (
+            math.sin(delta_phi / 2) ** 2
+            + math.cos(phi1) * math.cos(phi2) * math.sin(delta_lambda / 2) ** 2
+        )
+        return 2 * EARTH_RADIUS_METERS * math.asin(min(1.0, math.sqrt(a)))
+
+    @staticmethod
+    def to_lat_lon(coordinate) -> tuple[float, float]:
+        # coordinate: [x, y] in Web Mercator meters
+        x, y = float(coordinate[0]), float(coordinate[1])
+        lon = math.degrees(x / WEB_MERCATOR_RADIUS_METERS)
+        lat = math.degrees(
+            2 * math.atan(math.exp(y / WEB_MERCATOR_RADIUS_METERS)) - math.pi / 2
+        )
+        return lat, lon
+
+    @staticmethod
+    def __grid_steps(min_value: float, max_value: float, size: float) -> int:
+        # number of grid cells of the given size touched by [min_value, max_value]
+        return int(max_value // size - min_value // size) + 1
+
+    @staticmethod
+    def __count_cells(
+        min_lat: float, min_lon: float, max_lat: float, max_lon: float, precision: int
+    ) -> int:
+        lat_size, lon_size = Geohash.cell_size(precision)
+        return Geohash.__grid_steps(min_lat, max_lat, lat_size) * Geohash.__grid_steps(
+            min_lon, max_lon, lon_size
+        )
+
+    @staticmethod
+    def __cells_in_bounding_box(
+        min_lat: float, min_lon: float, max_lat: float, max_lon: float, precision: int
+    ) -> list[str]:
+        lat_size, lon_size = Geohash.cell_size(precision)
+        cells = []
+        # visit the center of every grid cell touched by the box
+        for lat_step in range(Geohash.__grid_steps(min_lat, max_lat, lat_size)):
+            cell_lat = min((min_lat // lat_size + lat_step + 0.5) * lat_size, 90.0)
+            for lon_step in range(Geohash.__grid_steps(min_lon, max_lon, lon_size)):
+                cell_lon = min((min_lon // lon_size + lon_step + 0.5) * lon_size, 180.0)
+                cells.append(Geohash.encode(cell_lat, cell_lon, precision))
+        return list(dict.fromkeys(cells))
@@ -1,49 +1,211 @@
 import base64
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
 import boto3
+from boto3.exceptions import S3UploadFailedError
+from boto3.s3.transfer import TransferConfig
 from aws_lambda_powertools.event_handler.exceptions import (
     BadRequestError,
 )
+from aws_lambda_powertools.logging import Logger
+from botocore.config import Config
 from botocore.exceptions import ClientError
+from PIL.Image import DecompressionBombError
 
+from .ImageCache import ImageCache
+from .ImageProcessor import ImageProcessor
 from .base.AbstractImageBucketRepository import AbstractImageBucketRepository
+from .entities.ImageSize import ImageSize
+
+logger = Logger()
+
+PRESIGNED_URL_EXPIRATION_SECONDS = 900
+DEFAULT_MAX_WORKERS = 16
+# multiple of 4, so every chunk of a padded base64 string decodes on its own
+BASE64_CHUNK_SIZE = 256 * 1024
+# decoded uploads up to this size stay in memory, larger ones are spooled to /tmp
+SPOOL_MAX_SIZE = 1024 * 1024
+# single threaded multipart upload: only one part is buffered at a time
+UPLOAD_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=5 * 1024 * 1024,
+    use_threads=False,
+)
 
 
 class ImageBucketRepository(AbstractImageBucketRepository):
-    def __init__(self):
-        self.s3 = boto3.client("s3")
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        image_cache: ImageCache = None,
+        image_processor: ImageProcessor = None,
+    ):
+        # regional virtual-host urls, otherwise presigned urls get redirected and fail
+        # the signature check
+        # the connection pool is sized to the executor so concurrent downloads never
+        # wait for a connection
+        self.s3 = boto3.client(
+            "s3",
+            region_name="eu-central-2",
+            config=Config(
+                signature_version="s3v4",
+                s3={"addressing_style": "virtual"},
+                max_pool_connections=max_workers,
+            ),
+        )
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        # images are immutable once uploaded, warm containers can serve them from memory
+        self.image_cache = image_cache
+        self.image_processor = image_processor or ImageProcessor()
         self.bucket_name = "ase-findme-image-upload-bucket"
+        # if set, images are served from a stable CDN path instead of a presigned url
+        self.cdn_base_url = os.environ.get("IMAGE_CDN_BASE_URL")
 
-    def post_image_to_s3(self, image_base64: str, key: str) -> dict:
-        image_data = base64.b64decode(image_base64)
+    def post_image_to_s3(
+        self, image_base64: str, key: str, derivative_keys: dict[ImageSize, str] = None
+    ) -> dict:
+        """
+        Stores the image under key and its downscaled derivatives under derivative_keys.
+        Returns: the message and the image sizes that were stored.
+        """
+        derivatives = {}
+        # the decoded image exists exactly once, in memory or in /tmp, and is streamed
+        # from there
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as image_file:
+            ImageBucketRepository.__decode_base64_to_file(image_base64, image_file)
 
-        try:
-            self.s3.put_object(
-                Bucket=self.bucket_name,
-                Key=key,
-                Body=image_data,
-                ContentType="image/png",
+            if derivative_keys:
+                image_file.seek(0)
+                # an image that can not be decoded or is too large to decode is still
+                # stored, it is only served in full size
+                try:
+                    derivatives = self.image_processor.create_derivatives(image_file)
+                except (OSError, DecompressionBombError) as e:
+                    logger.error(f"Unable to create derivatives of image {key}: {e}")
+
+            # upload_fileobj leaves the file open, it is closed when the with block ends
+            image_file.seek(0)
+            try:
+                self.s3.upload_fileobj(
+                    image_file,
+                    self.bucket_name,
+                    key,
+                    ExtraArgs={"ContentType": "image/png"},
+                    Config=UPLOAD_TRANSFER_CONFIG,
+                )
+            except (ClientError, S3UploadFailedError) as e:
+                raise BadRequestError(f"Error saving image to bucket: {e}")
+            self.__invalidate_cached_image(key)
+
+        image_sizes = [ImageSize.FULL.value]
+        for image_size, derivative in derivatives.items():
+            self.__put_image_to_s3(
+                derivative_keys[image_size], derivative, ImageProcessor.CONTENT_TYPE
             )
-            return {"message": "Image uploaded successfully"}
-        except ClientError as e:
-            raise BadRequestError(f"Error saving image to bucket: {e}")
+            image_sizes.append(image_size.value)
+
+        return {"message": "Image uploaded successfully", "image_sizes": image_sizes}
 
     def get_image_from_s3(self, key: str) -> str:
+        if self.image_cache is not None:
+            cached_image = self.image_cache.get(key)
+            if cached_image is not None:
+                return cached_image
+
         image_data = self.__get_image_data_from_s3(key)
 
         if image_data:
             encoded_image = base64.b64encode(image_data).decode("utf-8")
 
+            if self.image_cache is not None:
+                self.image_cache.put(key, encoded_image)
             return encoded_image
         else:
             raise BadRequestError("Failed to retrieve image from S3")
 
+    def get_images_from_s3(self, keys: list[str]) -> list[Optional[str]]:
+        """
+        Downloads the images concurrently, the result keeps the order of keys. Images
+        that could not be retrieved are logged and returned as None instead of failing
+        the whole batch.
+        """
+        return list(self.executor.map(self.__get_image_from_s3_or_none, keys))
+
+    def get_image_url(self, key: str) -> str:
+        if self.cdn_base_url:
+            return f"{self.cdn_base_url.rstrip('/')}/{key}"
+
+        # signing happens locally, no request to S3 is made
+        try:
+            return self.s3.generate_presigned_url(
+                "get_object",
+                Params={"Bucket": self.bucket_name, "Key": key},
+                ExpiresIn=PRESIGNED_URL_EXPIRATION_SECONDS,
+            )
+        except ClientError as e:
+            raise BadRequestError(f"Error creating url for image: {e}")
+
+    def delete_images_from_s3(self, keys: list[str]) -> dict:
+        try:
+            self.s3.delete_objects(
+                Bucket=self.bucket_name,
+                Delete={"Objects": [{"Key": key} for key in keys], "Quiet": True},
+            )
+        except ClientError as e:
+            raise BadRequestError(f"Error deleting images from bucket: {e}")
+        for key in keys:
+            self.__invalidate_cached_image(key)
+        return {"message": "Images deleted successfully"}
+
     def delete_image_from_s3(self, key: str) -> dict:
         try:
             self.s3.delete_object(Bucket=self.bucket_name, Key=key)
+            self.__invalidate_cached_image(key)
             return {"message": "Image deleted successfully"}
         except ClientError as e:
             raise BadRequestError(f"Error deleting image from bucket: {e}")
 
+    @staticmethod
+    def __decode_base64_to_file(image_base64: str, image_file):
+        remainder = ""
+        for start in range(0, len(image_base64), BASE64_CHUNK_SIZE):
+            # whitespace (e.g. line breaks) would shift the 4 character groups
+            chunk = remainder + "".join(
+                image_base64[start : start + BASE64_CHUNK_SIZE].split()
+            )
+            decodable_length = len(chunk) - len(chunk) % 4
+            image_file.write(base64.b64decode(chunk[:decodable_length]))
+            remainder = chunk[decodable_length:]
+        if remainder:
+            # let b64decode report the incorrect padding
+            image_file.write(base64.b64decode(remainder))
+
+    def __put_image_to_s3(self, key: str, image_data: bytes, content_type: str):
+        try:
+            self.s3.put_object(
+                Bucket=self.bucket_name,
+                Key=key,
+                Body=image_data,
+                ContentType=content_type,
+            )
+        except ClientError as e:
+            raise BadRequestError(f"Error saving image to bucket: {e}")
+        self.__invalidate_cached_image(key)
+
+    def __invalidate_cached_image(self, key: str):
+        if self.image_cache is not None:
+            self.image_cache.invalidate(key)
+
+    def __get_image_from_s3_or_none(self, key: str) -> Optional[str]:
+        try:
+            return self.get_image_from_s3(key)
+        except BadRequestError as e:
+            logger.error(f"Unable to load image {key}: {e}")
+            return None
+
     def __get_image_data_from_s3(self, key: str):
         try:
             response = self.s3.get_object(Bucket=self.bucket_name, Key=key)
@@ -0,0 +1,127 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+
+class ImageCache:
+    """
+    Least recently used cache for base64 encoded images, bounded by the total size of
+    the cached images. Images evicted from memory are spilled to spill_directory (e.g.
+    /tmp) if configured, which is bounded the same way. Only suitable for immutable
+    objects, keys have to be invalidated when the image is deleted.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        spill_directory: Optional[str] = None,
+        max_spill_bytes: int = 0,
+    ):
+        self.max_bytes = max_bytes
+        self.spill_directory = spill_directory
+        self.max_spill_bytes = max_spill_bytes if spill_directory else 0
+        self.__entries = OrderedDict()
+        self.__size = 0
+        # key -> size of the spilled file
+        self.__spilled_entries = OrderedDict()
+        self.__spilled_size = 0
+        self.__lock = threading.Lock()
+        self.hits = 0
+        self.spill_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if self.max_spill_bytes:
+            os.makedirs(spill_directory, exist_ok=True)
+
+    def get(self, key: str) -> Optional[str]:
+        with self.__lock:
+            if key in self.__entries:
+                self.__entries.move_to_end(key)
+                self.hits += 1
+                return self.__entries[key]
+
+            if key in self.__spilled_entries:
+                value = self.__read_spilled_entry(key)
+                if value is not None:
+                    self.spill_hits += 1
+                    self.__put(key, value)
+                    return value
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, value: str):
+        with self.__lock:
+            self.__put(key, value)
+
+    def invalidate(self, key: str):
+        with self.__lock:
+            if key in self.__entries:
+                self.__size -= len(self.__entries.pop(key))
+            self.__remove_spilled_entry(key)
+
+    def get_statistics(self) -> dict:
+        with self.__lock:
+            return {
+                "hits": self.hits,
+                "spill_hits": self.spill_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self.__entries),
+                "bytes": self.__size,
+                "spilled_entries": len(self.__spilled_entries),
+                "spilled_bytes": self.__spilled_size,
+            }
+
+    def __put(self, key: str, value: str):
+        if key in self.__entries:
+            self.__size -= len(self.__entries.pop(key))
+        self.__remove_spilled_entry(key)
+        if len(value) > self.max_bytes:
+            return
+
+        self.__entries[key] = value
+        self.__size += len(value)
+        while self.__size > self.max_bytes:
+            evicted_key, evicted_value = self.__entries.popitem(last=False)
+            self.__size -= len(evicted_value)
+            self.evictions += 1
+            self.__spill(evicted_key, evicted_value)
+
+    def __spill(self, key: str, value: str):
+        if len(value) > self.max_spill_bytes:
+            return
+
+        while self.__spilled_size + len(value) > self.max_spill_bytes:
+            self.__remove_spilled_entry(next(iter(self.__spilled_entries)))
+        try:
+            with open(self.__get_spill_path(key), "w") as spill_file:
+                spill_file.write(value)
+        except OSError:
+            return
+        self.__spilled_entries[key] = len(value)
+        self.__spilled_size += len(value)
+
+    def __read_spilled_entry(self, key: str) -> Optional[str]:
+        try:
+            with open(self.__get_spill_path(key)) as spill_file:
+                return spill_file.read()
+        except OSError:
+            self.__remove_spilled_entry(key)
+            return None
+
+    def __remove_spilled_entry(self, key: str):
+        if key not in self.__spilled_entries:
+            return
+        self.__spilled_size -= self.__spilled_entries.pop(key)
+        try:
+            os.remove(self.__get_spill_path(key))
+        except OSError:
+            pass
+
+    def __get_spill_path(self, key: str) -> str:
+        return os.path.join(
+            self.spill_directory, hashlib.sha256(key.encode("utf-8")).hexdigest()
+        )
@@ -0,0 +1,64 @@
+import io
+import warnings
+
+from PIL import Image, ImageOps
+
+from .entities.ImageSize import ImageSize
+
+# larger uploads are stored but not decoded for derivatives, a 48 MP photo still fits
+MAX_IMAGE_PIXELS = 64_000_000
+# Pillow only warns between MAX_IMAGE_PIXELS and twice of it, the warning is raised
+# below
+Image.MAX_IMAGE_PIXELS = MAX_IMAGE_PIXELS
+
+
+class ImageProcessor:
+    """
+    Creates the downscaled derivatives of an uploaded image, re-encoded as WebP.
+    """
+
+    MAX_DIMENSIONS = {
+        ImageSize.THUMBNAIL: 320,
+        ImageSize.MEDIUM: 1280,
+    }
+    CONTENT_TYPE = "image/webp"
+
+    def __init__(self, quality: int = 75):
+        self.quality = quality
+
+    def create_derivatives(self, image_file) -> dict[ImageSize, bytes]:
+        """
+        image_file: path or binary file object of the original image
+        Returns: the encoded derivative per image size, raises OSError if the image can
+            not be decoded and Image.DecompressionBombError if it has more than
+            MAX_IMAGE_PIXELS pixels
+        """
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", Image.DecompressionBombWarning)
+            try:
+                image = Image.open(image_file)
+            except Image.DecompressionBombWarning as e:
+                raise Image.DecompressionBombError(str(e))
+        derivatives = {}
+        with image:
+            # let the decoder downscale JPEGs while reading, the full resolution is
+            # never needed
+            image.draft("RGB", (max(self.MAX_DIMENSIONS.values()),) * 2)
+            image = ImageOps.exif_transpose(image)
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert(
+                    "RGBA"
+                    if "A" in image.getbands() or "transparency" in image.info
+                    else "RGB"
+                )
+
+            # largest first, every smaller derivative is downscaled from the previous
+            # one
+            for image_size, max_dimension in sorted(
+                self.MAX_DIMENSIONS.items(), key=lambda item: item[1], reverse=True
+            ):
+                image.thumbnail((max_dimension, max_dimension))
+                output = io.BytesIO()
+                image.save(output, format="WEBP", quality=self.quality, method=4)
+                derivatives[image_size] = output.getvalue()
+        return derivatives
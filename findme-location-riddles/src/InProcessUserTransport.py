@@ -0,0 +1,38 @@
+from .base.AbstractUserTransport import AbstractUserTransport
+
+
+class InProcessUserTransport(AbstractUserTransport):
+    """
+    Calls UserService and FollowerService of findme-users directly, e.g. for local
+    benchmarks and tests where both services run in one process. The event and its token
+    are not used.
+    """
+
+    def __init__(self, user_service, follower_service):
+        self.user_service = user_service
+        self.follower_service = follower_service
+
+    def get_user_connections(self, event, username: str) -> dict:
+        # same response as GET /users/<username>/follow
+        connections = self.follower_service.get_user_connections(username)
+        return {
+            "followers": [
+                self.user_service.get_user(follower).model_dump(mode="json")
+                for follower in connections.followers
+            ],
+            "following": [
+                self.user_service.get_user(following).model_dump(mode="json")
+                for following in connections.following
+            ],
+        }
+
+    def get_user_scores(self, event, username: str) -> list[dict]:
+        return [
+            score.model_dump(mode="json")
+            for score in self.user_service.get_user_scores(username)
+        ]
+
+    def write_score(self, event, username: str, location_riddle_id: str, score: int):
+        self.user_service.write_guessing_score_to_user(
+            username, location_riddle_id, score
+        )
@@ -0,0 +1,62 @@
+import json
+import os
+from urllib.parse import urljoin
+
+import boto3
+from findme_shared.InternalRequest import InternalRequest
+from findme_shared.ResponseCompressor import ResponseCompressor
+
+from .base.AbstractUserTransport import AbstractUserTransport
+
+
+class LambdaUserTransport(AbstractUserTransport):
+    """
+    Invokes the users Lambda with an InternalRequest envelope carrying the Authorization
+    header of the current request, the users service authorizes the forwarded token
+    again.
+    """
+
+    def __init__(self):
+        self.client = boto3.client("lambda", region_name="eu-central-2")
+        self.base_url = "/users/"
+
+    def get_user_connections(self, event, username: str) -> dict:
+        return self.__invoke_request(event, "GET", f"{username}/follow")
+
+    def get_user_scores(self, event, username: str) -> list[dict]:
+        return self.__invoke_request(event, "GET", f"{username}/scores")
+
+    def write_score(self, event, username: str, location_riddle_id: str, score: int):
+        _ = self.__invoke_request(
+            event,
+            "POST",
+            "score",
+            json.dumps({"score": score, "location_riddle_id": location_riddle_id}),
+        )
+
+    def __invoke_request(self, event, method: str, path: str, body: str = None):
+        response = self.client.invoke(
+            FunctionName=os.environ["USER_FUNCTION_NAME"],
+            Payload=json.dumps(
+                InternalRequest.create(
+                    method,
+                    urljoin(self.base_url, path),
+                    InternalRequest.get_authorization(event),
+                    body,
+                )
+            ),
+        )
+
+        streaming_body = response["Payload"]
+        payload_bytes = streaming_body.read()
+        payload_str = payload_bytes.decode("utf-8")
+        payload_dict = json.loads(payload_str)
+        body = payload_dict["body"]
+        # responses are only compressed if the request accepted it, kept for users
+        # services without the envelope
+        content_encoding = (payload_dict.get("multiValueHeaders") or {}).get(
+            "Content-Encoding"
+        )
+        if payload_dict.get("isBase64Encoded") and content_encoding:
+            body = ResponseCompressor.decompress(body, content_encoding[0])
+        return json.loads(body)
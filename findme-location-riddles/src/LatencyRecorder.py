@@ -0,0 +1,44 @@
+import threading
+import time
+
+
+class LatencyRecorder:
+    """
+    Call count, total and maximum latency per operation, e.g. to compare the transports
+    of a client.
+    """
+
+    def __init__(self):
+        # operation -> [calls, total_seconds, max_seconds]
+        self.__latencies = {}
+        self.__lock = threading.Lock()
+
+    def measure(self, operation: str, function, *args):
+        start = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            self.record(operation, time.perf_counter() - start)
+
+    def record(self, operation: str, seconds: float):
+        with self.__lock:
+            latency = self.__latencies.setdefault(operation, [0, 0.0, 0.0])
+            latency[0] += 1
+            latency[1] += seconds
+            latency[2] = max(latency[2], seconds)
+
+    def get_statistics(self) -> dict:
+        with self.__lock:
+            return {
+                operation: {
+                    "calls": calls,
+                    "total_ms": round(total_seconds * 1000, 3),
+                    "average_ms": round(total_seconds * 1000 / calls, 3),
+                    "max_ms": round(max_seconds * 1000, 3),
+                }
+                for operation, (
+                    calls,
+                    total_seconds,
+                    max_seconds,
+                ) in self.__latencies.items()
+            }
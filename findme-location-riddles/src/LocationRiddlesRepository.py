@@ -1,13 +1,21 @@
+import threading
+import time
+import uuid
+from decimal import Decimal
+
 import boto3
 from aws_lambda_powertools.event_handler.exceptions import (
     BadRequestError,
     NotFoundError,
 )
 from aws_lambda_powertools.logging import Logger
-from boto3.dynamodb.conditions import Key
+from boto3.dynamodb.conditions import Attr, Key
 from botocore.exceptions import ClientError
 from pydantic import ValidationError
 
+from .Backoff import Backoff, MAX_RETRIES as BATCH_GET_ITEM_MAX_RETRIES
+from .Cursor import Cursor
+from .Geohash import Geohash, GEO_INDEX_PARTITION_PRECISION, GEO_INDEX_PRECISION
 from .base.AbstractLocationRiddlesRepository import AbstractLocationRiddlesRepository
 from .entities.Comment import Comment
 from .entities.Guess import Guess
@@ -16,40 +24,205 @@ from .entities.Rating import Rating
 
 logger = Logger()
 
+TABLE_NAME = "locationRiddleTable"
+ARENA_INDEX_TABLE_NAME = "arenaIndexTable"
+ARENA_QUERY_PAGE_SIZE = 100
+USER_INDEX_NAME = "UserCreatedAtIndex"
+USER_QUERY_PAGE_SIZE = 100
+GEO_INDEX_TABLE_NAME = "geoIndexTable"
+INTERACTION_TABLE_NAME = "locationRiddleInteractionTable"
+# sort key prefixes of the interaction items, a user can guess and rate a location
+# riddle once
+GUESS_PREFIX = "GUESS#"
+RATING_PREFIX = "RATING#"
+COMMENT_PREFIX = "COMMENT#"
+# attributes that are not stored on the location riddle item itself
+HEADER_EXCLUDED_ATTRIBUTES = {"guesses", "comments", "ratings", "is_guessed_by_user"}
+CONDITION_CHECK_FAILURE_MESSAGES = {
+    "guesses": (
+        "User cannot guess their own location riddle",
+        "User has already guessed this location riddle",
+    ),
+    "ratings": (
+        "User cannot rate their own location riddle",
+        "User has already rated this location riddle",
+    ),
+}
+BATCH_GET_ITEM_MAX_KEYS = 100
+
 
 class LocationRiddlesRepository(AbstractLocationRiddlesRepository):
     def __init__(self):
-        self.dynamodb = boto3.resource("dynamodb", region_name="eu-central-2")
-        self.table = self.dynamodb.Table("locationRiddleTable")
+        self.__local = threading.local()
+
+    @property
+    def dynamodb(self):
+        # boto3 resources are not thread-safe, every worker thread gets its own
+        if not hasattr(self.__local, "dynamodb"):
+            self.__local.dynamodb = boto3.session.Session().resource(
+                "dynamodb", region_name="eu-central-2"
+            )
+        return self.__local.dynamodb
+
+    @property
+    def table(self):
+        if not hasattr(self.__local, "table"):
+            self.__local.table = self.dynamodb.Table(TABLE_NAME)
+        return self.__local.table
+
+    @property
+    def arena_index_table(self):
+        # one item collection per arena, sorted by the creation time of the location
+        # riddles
+        if not hasattr(self.__local, "arena_index_table"):
+            self.__local.arena_index_table = self.dynamodb.Table(ARENA_INDEX_TABLE_NAME)
+        return self.__local.arena_index_table
+
+    @property
+    def geo_index_table(self):
+        if not hasattr(self.__local, "geo_index_table"):
+            self.__local.geo_index_table = self.dynamodb.Table(GEO_INDEX_TABLE_NAME)
+        return self.__local.geo_index_table
+
+    @property
+    def interaction_table(self):
+        # guesses, ratings and comments of a location riddle share its partition in this
+        # table
+        if not hasattr(self.__local, "interaction_table"):
+            self.__local.interaction_table = self.dynamodb.Table(INTERACTION_TABLE_NAME)
+        return self.__local.interaction_table
 
     def write_location_riddle_to_db(self, location_riddle: LocationRiddle):
         try:
-            self.table.put_item(Item=location_riddle.dict())
+            self.table.put_item(
+                Item=location_riddle.dict(exclude=HEADER_EXCLUDED_ATTRIBUTES)
+            )
+            self.write_arena_index_entries(location_riddle)
+            self.write_geo_index_entry(location_riddle)
         except Exception as e:
             logger.error(f"Error writing location_riddle to DynamoDB: {e}")
             raise BadRequestError(f"Error writing location_riddle to DynamoDB: {e}")
 
+    def write_arena_index_entries(self, location_riddle: LocationRiddle):
+        with self.arena_index_table.batch_writer(
+            overwrite_by_pkeys=["arena", "sort_key"]
+        ) as batch:
+            for arena in set(location_riddle.arenas):
+                batch.put_item(
+                    Item={
+                        "arena": arena,
+                        "sort_key": LocationRiddlesRepository.get_arena_sort_key(
+                            location_riddle.created_at,
+                            location_riddle.location_riddle_id,
+                        ),
+                        "location_riddle_id": location_riddle.location_riddle_id,
+                        "username": location_riddle.username,
+                    }
+                )
+
     def get_all_location_riddles_by_username(self, username: str):
-        response = self.table.query(
-            IndexName="UserIndex", KeyConditionExpression=Key("username").eq(username)
-        )
-        items = response["Items"]
+        location_riddles = []
+        cursor = None
+        while True:
+            page, cursor = self.get_location_riddles_by_username_page(
+                username, USER_QUERY_PAGE_SIZE, cursor
+            )
+            location_riddles.extend(page)
+            if cursor is None:
+                return location_riddles
 
-        while "LastEvaluatedKey" in response:
-            response = self.table.query(
-                IndexName="UserIndex",
-                ExclusiveStartKey=response["LastEvaluatedKey"],
-                KeyConditionExpression=Key("username").eq(username),
+    def get_location_riddles_by_username_page(
+        self,
+        username: str,
+        limit: int,
+        cursor: str = None,
+        since: int = None,
+        before: int = None,
+    ) -> tuple[list[LocationRiddle], str]:
+        """
+        Reads one page of the location riddles of username from USER_INDEX_NAME, newest
+        first.
+        since: only location riddles created after this timestamp are read, the query
+        stops at the bound.
+        before: only location riddles created at or before this timestamp are read.
+        Returns: the location riddles and the cursor of the next page (None on the last
+            page).
+        """
+        key_condition = Key("username").eq(username)
+        if since is not None and before is not None:
+            key_condition &= Key("created_at").between(since + 1, before)
+        elif since is not None:
+            key_condition &= Key("created_at").gt(since)
+        elif before is not None:
+            key_condition &= Key("created_at").lte(before)
+        query_parameters = {
+            "IndexName": USER_INDEX_NAME,
+            "KeyConditionExpression": key_condition,
+            "ScanIndexForward": False,
+            "Limit": limit,
+        }
+        if cursor:
+            # keys of an index query hold the index and the table key attributes
+            query_parameters["ExclusiveStartKey"] = Cursor.decode(
+                cursor, ["location_riddle_id", "username", "created_at"]
+            )
+        try:
+            response = self.table.query(**query_parameters)
+        except ClientError as e:
+            logger.error(
+                f"Error reading location_riddles of {username} from DynamoDB: {e}"
+            )
+            raise BadRequestError(
+                f"Error reading location_riddles of {username} from DynamoDB: {e}"
             )
-            items.extend(response["Items"])
 
         try:
-            location_riddles = [LocationRiddle(**item) for item in items]
+            location_riddles = [LocationRiddle(**item) for item in response["Items"]]
         except ValidationError as e:
             logger.info(f"Unable to read Data from DB {e}")
             raise BadRequestError(f"Unable to read Data from DB {e}")
 
-        return location_riddles
+        return location_riddles, Cursor.encode(response.get("LastEvaluatedKey"))
+
+    def write_geo_index_entry(self, location_riddle: LocationRiddle):
+        lat, lon = Geohash.to_lat_lon(location_riddle.location.coordinate)
+        self.geo_index_table.put_item(
+            Item={
+                **LocationRiddlesRepository.get_geo_index_key(
+                    location_riddle.location.coordinate,
+                    location_riddle.location_riddle_id,
+                ),
+                "location_riddle_id": location_riddle.location_riddle_id,
+                "username": location_riddle.username,
+                "lat": Decimal(str(lat)),
+                "lon": Decimal(str(lon)),
+            }
+        )
+
+    def get_geo_index_entries_in_cell(self, cell: str) -> list[dict]:
+        """
+        Reads the spatial index entries inside a geohash cell of at least
+        GEO_INDEX_PARTITION_PRECISION characters.
+        Returns: dicts with location_riddle_id, username, lat and lon.
+        """
+        key_condition = Key("cell").eq(cell[:GEO_INDEX_PARTITION_PRECISION])
+        if len(cell) > GEO_INDEX_PARTITION_PRECISION:
+            key_condition = key_condition & Key("sort_key").begins_with(cell)
+        query_parameters = {
+            "KeyConditionExpression": key_condition,
+            "ProjectionExpression": "location_riddle_id, username, lat, lon",
+        }
+        entries = []
+        try:
+            while True:
+                response = self.geo_index_table.query(**query_parameters)
+                entries.extend(response["Items"])
+                if "LastEvaluatedKey" not in response:
+                    return entries
+                query_parameters["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+        except ClientError as e:
+            logger.error(f"Error reading geo index from DynamoDB: {e}")
+            raise BadRequestError(f"Error reading geo index from DynamoDB: {e}")
 
     def get_location_riddle_by_location_riddle_id_from_db(
         self, location_riddle_id: str
@@ -68,69 +241,467 @@ class LocationRiddlesRepository(AbstractLocationRiddlesRepository):
 
         return location_riddle
 
-    def get_all_location_riddles_containing_arena(self, arena: str, username: str):
-        response = self.table.scan(
-            FilterExpression="contains (arenas, :arena) AND NOT username = :username",
-            ExpressionAttributeValues={
-                ":arena": arena,
-                ":username": username
-            }
-        )
-        items = response["Items"]
-
-        while "LastEvaluatedKey" in response:
-            response = self.table.scan(
-                FilterExpression="contains (arenas, :arena)",
-                ExpressionAttributeValues={
-                    ":arena": arena
-                },
-                ExclusiveStartKey=response["LastEvaluatedKey"]
+    def get_location_riddles_by_ids(self, location_riddle_ids: list[str]):
+        """
+        Reads the location riddles with BatchGetItem, 100 keys per request.
+        Returns: the location riddles in the order of location_riddle_ids, ids without a
+            location riddle are skipped.
+        """
+        items_by_id = {
+            item["location_riddle_id"]: item
+            for item in self.__batch_get_items(
+                TABLE_NAME,
+                [
+                    {"location_riddle_id": location_riddle_id}
+                    for location_riddle_id in dict.fromkeys(location_riddle_ids)
+                ],
             )
-            items.extend(response["Items"])
+        }
 
         try:
-            location_riddles = [LocationRiddle(**item) for item in items]
+            location_riddles = [
+                LocationRiddle(**items_by_id[location_riddle_id])
+                for location_riddle_id in location_riddle_ids
+                if location_riddle_id in items_by_id
+            ]
         except ValidationError as e:
             logger.info(f"Unable to read Data from DB {e}")
             raise BadRequestError(f"Unable to read Data from DB {e}")
 
         return location_riddles
 
+    def get_all_location_riddles_containing_arena(self, arena: str, username: str):
+        location_riddles = []
+        cursor = None
+        while True:
+            page, cursor = self.get_location_riddles_containing_arena_page(
+                arena, username, ARENA_QUERY_PAGE_SIZE, cursor
+            )
+            location_riddles.extend(page)
+            if cursor is None:
+                return location_riddles
+
+    def get_location_riddles_containing_arena_page(
+        self, arena: str, username: str, limit: int, cursor: str = None
+    ) -> tuple[list[LocationRiddle], str]:
+        """
+        Queries the arena index newest first, location riddles of username are left out.
+        Returns: up to limit location riddles and the cursor of the next page (None on
+            the last page).
+        """
+        query_parameters = {
+            "KeyConditionExpression": Key("arena").eq(arena),
+            "FilterExpression": Attr("username").ne(username),
+            "ScanIndexForward": False,
+        }
+        last_evaluated_key = Cursor.decode(cursor, ["arena", "sort_key"])
+        location_riddle_ids = []
+        try:
+            # Limit is applied before the filter, keep querying until the page is full
+            while True:
+                if last_evaluated_key:
+                    query_parameters["ExclusiveStartKey"] = last_evaluated_key
+                query_parameters["Limit"] = limit - len(location_riddle_ids)
+                response = self.arena_index_table.query(**query_parameters)
+                location_riddle_ids.extend(
+                    item["location_riddle_id"] for item in response["Items"]
+                )
+                last_evaluated_key = response.get("LastEvaluatedKey")
+                if not last_evaluated_key or len(location_riddle_ids) >= limit:
+                    break
+        except ClientError as e:
+            logger.error(f"Error reading arena index from DynamoDB: {e}")
+            raise BadRequestError(f"Error reading arena index from DynamoDB: {e}")
+
+        return (
+            self.get_location_riddles_by_ids(location_riddle_ids),
+            Cursor.encode(last_evaluated_key),
+        )
+
     def update_location_riddle_rating_in_db(
         self, location_riddle_id: str, rating: Rating
     ):
-        return self.__append_attribute(location_riddle_id, "ratings", rating)
+        return self.__write_interaction(
+            location_riddle_id,
+            "ratings",
+            f"{RATING_PREFIX}{rating.username}",
+            {"username": rating.username, "rating": rating.rating},
+            "rated_by",
+            {"rating_sum": rating.rating, "rating_count": 1},
+        )
 
     def update_location_riddle_comments_in_db(
         self, location_riddle_id: str, comment: Comment
     ):
-        return self.__append_attribute(location_riddle_id, "comments", comment)
+        # the sort key orders comments by their creation time in microseconds
+        created_at_micros = time.time_ns() // 1000
+        created_at = created_at_micros // 1_000_000
+        return self.__write_interaction(
+            location_riddle_id,
+            "comments",
+            f"{COMMENT_PREFIX}{created_at_micros:016d}#{uuid.uuid4()}",
+            {
+                "username": comment.username,
+                "comment": comment.comment,
+                "created_at": created_at,
+            },
+            counters={"comment_count": 1},
+        )
 
     def update_location_riddle_guesses_in_db(
         self, location_riddle_id: str, guess: Guess
     ):
-        return self.__append_attribute(location_riddle_id, "guesses", guess)
+        return self.__write_interaction(
+            location_riddle_id,
+            "guesses",
+            f"{GUESS_PREFIX}{guess.username}",
+            {"username": guess.username, "guess": guess.guess.dict()},
+            "guessed_by",
+            {"guess_count": 1},
+        )
+
+    def get_guessed_and_rated_location_riddle_ids(
+        self, location_riddle_ids: list[str], username: str
+    ) -> tuple[set[str], set[str]]:
+        """
+        Reads the guess and rating items of username for every location riddle with
+        strongly consistent BatchGetItem, a location riddle guessed right before is not
+        shown as unsolved.
+        Returns: the ids of the location riddles username has guessed and the ids
+            username has rated.
+        """
+        keys = [
+            key
+            for location_riddle_id in dict.fromkeys(location_riddle_ids)
+            for key in LocationRiddlesRepository.get_interaction_keys(
+                location_riddle_id, username
+            )
+        ]
+        return LocationRiddlesRepository.get_guessed_and_rated_ids(
+            self.__batch_get_items(INTERACTION_TABLE_NAME, keys, consistent_read=True)
+        )
+
+    def get_comments_page(
+        self, location_riddle_id: str, limit: int, cursor: str = None
+    ) -> tuple[list[Comment], str]:
+        # newest first
+        items, next_cursor = self.__query_interactions(
+            location_riddle_id, COMMENT_PREFIX, limit, cursor, scan_index_forward=False
+        )
+        return [
+            Comment(username=item["username"], comment=item["comment"])
+            for item in items
+        ], next_cursor
+
+    def get_guesses_page(
+        self, location_riddle_id: str, limit: int, cursor: str = None
+    ) -> tuple[list[Guess], str]:
+        # ordered by username, the sort key enforces one guess per user
+        items, next_cursor = self.__query_interactions(
+            location_riddle_id, GUESS_PREFIX, limit, cursor
+        )
+        return [
+            Guess(username=item["username"], guess=item["guess"]) for item in items
+        ], next_cursor
 
     def delete_location_riddle_from_db(self, location_riddle_id: str):
         try:
-            self.table.delete_item(Key={"location_riddle_id": location_riddle_id})
+            response = self.table.delete_item(
+                Key={"location_riddle_id": location_riddle_id}, ReturnValues="ALL_OLD"
+            )
+            deleted_item = response.get("Attributes")
+            if deleted_item:
+                self.geo_index_table.delete_item(
+                    Key=LocationRiddlesRepository.get_geo_index_key(
+                        deleted_item["location"]["coordinate"], location_riddle_id
+                    )
+                )
+                self.__delete_interactions(location_riddle_id)
+                with self.arena_index_table.batch_writer() as batch:
+                    for arena in set(deleted_item.get("arenas", [])):
+                        batch.delete_item(
+                            Key={
+                                "arena": arena,
+                                "sort_key": LocationRiddlesRepository.get_arena_sort_key(
+                                    deleted_item["created_at"], location_riddle_id
+                                ),
+                            }
+                        )
         except ClientError as e:
             logger.error(f"Error deleting location_riddle from DynamoDB: {e}")
             raise BadRequestError(f"Error deleting location_riddle from DynamoDB: {e}")
 
-    def __append_attribute(self, location_riddle_id, attribute, value):
+    @staticmethod
+    def get_arena_sort_key(created_at: int, location_riddle_id: str) -> str:
+        # zero padded so the lexicographic order of the sort key is the chronological
+        # one
+        return f"{int(created_at):012d}#{location_riddle_id}"
+
+    @staticmethod
+    def get_geo_index_key(coordinate, location_riddle_id: str) -> dict:
+        geohash = Geohash.encode(*Geohash.to_lat_lon(coordinate), GEO_INDEX_PRECISION)
+        return {
+            "cell": geohash[:GEO_INDEX_PARTITION_PRECISION],
+            "sort_key": f"{geohash}#{location_riddle_id}",
+        }
+
+    @staticmethod
+    def get_interaction_keys(location_riddle_id: str, username: str) -> list[dict]:
+        return [
+            {
+                "location_riddle_id": location_riddle_id,
+                "sort_key": f"{prefix}{username}",
+            }
+            for prefix in (GUESS_PREFIX, RATING_PREFIX)
+        ]
+
+    @staticmethod
+    def get_guessed_and_rated_ids(
+        interaction_items: list[dict],
+    ) -> tuple[set[str], set[str]]:
+        guessed_location_riddle_ids, rated_location_riddle_ids = set(), set()
+        for item in interaction_items:
+            if item["sort_key"].startswith(GUESS_PREFIX):
+                guessed_location_riddle_ids.add(item["location_riddle_id"])
+            else:
+                rated_location_riddle_ids.add(item["location_riddle_id"])
+        return guessed_location_riddle_ids, rated_location_riddle_ids
+
+    def __batch_get_items(
+        self, table_name: str, keys: list[dict], consistent_read: bool = False
+    ) -> list[dict]:
+        items = []
+        for start in range(0, len(keys), BATCH_GET_ITEM_MAX_KEYS):
+            items.extend(
+                self.__batch_get_chunk(
+                    {
+                        table_name: {
+                            "Keys": keys[start : start + BATCH_GET_ITEM_MAX_KEYS],
+                            "ConsistentRead": consistent_read,
+                        }
+                    }
+                ).get(table_name, [])
+            )
+        return items
+
+    def __batch_get_chunk(self, request_items: dict) -> dict[str, list[dict]]:
+        """
+        Reads at most BATCH_GET_ITEM_MAX_KEYS keys of one or more tables, unprocessed
+        keys are retried.
+        Returns: the items per table name.
+        """
+        items = {}
+        for attempt in range(BATCH_GET_ITEM_MAX_RETRIES + 1):
+            Backoff.sleep(attempt)
+            try:
+                response = self.dynamodb.batch_get_item(RequestItems=request_items)
+            except ClientError as e:
+                logger.error(f"Error reading location_riddles from DynamoDB: {e}")
+                raise BadRequestError(
+                    f"Error reading location_riddles from DynamoDB: {e}"
+                )
+
+            for table_name, table_items in response["Responses"].items():
+                items.setdefault(table_name, []).extend(table_items)
+            request_items = response.get("UnprocessedKeys")
+            if not request_items:
+                return items
+
+        logger.error(
+            "Unable to read all location_riddles from DynamoDB, "
+            f"unprocessed: {request_items}"
+        )
+        raise BadRequestError("Unable to read all location_riddles from DynamoDB")
+
+    def __write_interaction(
+        self,
+        location_riddle_id,
+        attribute,
+        sort_key,
+        interaction,
+        participants_attribute=None,
+        counters=None,
+    ):
+        """
+        Writes the interaction item and updates the counters on the location riddle in
+        one transaction. With participants_attribute the owner is rejected and the
+        interaction can exist once per user, the string set guards location riddles
+        whose interactions are still embedded.
+        Returns: the updated location riddle with is_guessed_by_user and
+            is_rated_by_user of the writing user.
+        """
+        update_expression = "ADD " + ", ".join(
+            f"{counter} :{counter}" for counter in counters
+        )
+        condition_expression = "attribute_exists(location_riddle_id)"
+        expression_attribute_values = {
+            f":{counter}": increment for counter, increment in counters.items()
+        }
+        interaction_put = {
+            "TableName": INTERACTION_TABLE_NAME,
+            "Item": {
+                "location_riddle_id": location_riddle_id,
+                "sort_key": sort_key,
+                **interaction,
+            },
+        }
+        if participants_attribute:
+            condition_expression += (
+                " AND username <> :username"
+                f" AND NOT contains({participants_attribute}, :username)"
+            )
+            expression_attribute_values[":username"] = interaction["username"]
+            interaction_put["ConditionExpression"] = "attribute_not_exists(sort_key)"
+
         try:
-            self.table.update_item(
-                Key={"location_riddle_id": location_riddle_id},
-                UpdateExpression=f"SET {attribute} = list_append({attribute}, :i)",
-                ExpressionAttributeValues={":i": [value.dict()]},
+            # the client of the resource serializes the attribute values like the table
+            # api
+            self.dynamodb.meta.client.transact_write_items(
+                TransactItems=[
+                    {
+                        "Update": {
+                            "TableName": TABLE_NAME,
+                            "Key": {"location_riddle_id": location_riddle_id},
+                            "UpdateExpression": update_expression,
+                            "ConditionExpression": condition_expression,
+                            "ExpressionAttributeValues": expression_attribute_values,
+                            "ReturnValuesOnConditionCheckFailure": "ALL_OLD",
+                        }
+                    },
+                    {"Put": interaction_put},
+                ]
             )
         except ClientError as e:
+            if e.response["Error"]["Code"] == "TransactionCanceledException":
+                header_reason, interaction_reason = e.response.get(
+                    "CancellationReasons", [{}, {}]
+                )
+                if header_reason.get("Code") == "ConditionalCheckFailed":
+                    self.__raise_condition_check_failure(
+                        location_riddle_id,
+                        header_reason.get("Item"),
+                        interaction["username"],
+                        attribute,
+                    )
+                if interaction_reason.get("Code") == "ConditionalCheckFailed":
+                    raise BadRequestError(
+                        CONDITION_CHECK_FAILURE_MESSAGES[attribute][1]
+                    )
             logger.error(f"Error updating location_riddle {attribute} in DynamoDB: {e}")
             raise BadRequestError(
                 f"Error updating location_riddle {attribute} in DynamoDB: {e}"
             )
 
-        return self.get_location_riddle_by_location_riddle_id_from_db(
-            location_riddle_id
+        return self.__get_location_riddle_for_user(
+            location_riddle_id, interaction["username"]
+        )
+
+    def __get_location_riddle_for_user(
+        self, location_riddle_id: str, username: str
+    ) -> LocationRiddle:
+        # a transaction does not return the written values, the location riddle and the
+        # interaction items of
+        # username are read back in one strongly consistent request so the response
+        # includes the write
+        items = self.__batch_get_chunk(
+            {
+                TABLE_NAME: {
+                    "Keys": [{"location_riddle_id": location_riddle_id}],
+                    "ConsistentRead": True,
+                },
+                INTERACTION_TABLE_NAME: {
+                    "Keys": LocationRiddlesRepository.get_interaction_keys(
+                        location_riddle_id, username
+                    ),
+                    "ConsistentRead": True,
+                },
+            }
+        )
+        if not items.get(TABLE_NAME):
+            raise NotFoundError(
+                f"No location riddle with location_riddle_id: {location_riddle_id} found"
+            )
+        guessed_location_riddle_ids, rated_location_riddle_ids = (
+            LocationRiddlesRepository.get_guessed_and_rated_ids(
+                items.get(INTERACTION_TABLE_NAME, [])
+            )
+        )
+        try:
+            return LocationRiddle(
+                **{
+                    **items[TABLE_NAME][0],
+                    "is_guessed_by_user": location_riddle_id
+                    in guessed_location_riddle_ids,
+                    "is_rated_by_user": location_riddle_id in rated_location_riddle_ids,
+                }
+            )
+        except ValidationError as e:
+            logger.info(f"Unable to read Data from DB {e}")
+            raise BadRequestError(f"Unable to read Data from DB {e}")
+
+    def __query_interactions(
+        self, location_riddle_id, prefix, limit, cursor, scan_index_forward=True
+    ) -> tuple[list[dict], str]:
+        query_parameters = {
+            "KeyConditionExpression": Key("location_riddle_id").eq(location_riddle_id)
+            & Key("sort_key").begins_with(prefix),
+            "ScanIndexForward": scan_index_forward,
+            "Limit": limit,
+        }
+        if cursor:
+            query_parameters["ExclusiveStartKey"] = Cursor.decode(
+                cursor, ["location_riddle_id", "sort_key"]
+            )
+        try:
+            response = self.interaction_table.query(**query_parameters)
+        except ClientError as e:
+            logger.error(
+                f"Error reading location_riddle interactions from DynamoDB: {e}"
+            )
+            raise BadRequestError(
+                f"Error reading location_riddle interactions from DynamoDB: {e}"
+            )
+        return response["Items"], Cursor.encode(response.get("LastEvaluatedKey"))
+
+    def __delete_interactions(self, location_riddle_id):
+        query_parameters = {
+            "KeyConditionExpression": Key("location_riddle_id").eq(location_riddle_id),
+            "ProjectionExpression": "location_riddle_id, sort_key",
+        }
+        with self.interaction_table.batch_writer() as batch:
+            while True:
+                response = self.interaction_table.query(**query_parameters)
+                for key in response["Items"]:
+                    batch.delete_item(Key=key)
+                if "LastEvaluatedKey" not in response:
+                    return
+                query_parameters["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    def __raise_condition_check_failure(
+        self, location_riddle_id, item, username, attribute
+    ):
+        # item is the unchanged location riddle in the low-level attribute value format,
+        # it is
+        # re-read if the cancellation reason does not contain it
+        if item:
+            owner = item["username"]["S"]
+        else:
+            owner = (
+                self.table.get_item(
+                    Key={"location_riddle_id": location_riddle_id},
+                    ProjectionExpression="username",
+                    ConsistentRead=True,
+                )
+                .get("Item", {})
+                .get("username")
+            )
+        if owner is None:
+            raise NotFoundError(
+                f"No location riddle with location_riddle_id: {location_riddle_id} found"
+            )
+        own_location_riddle_message, already_done_message = (
+            CONDITION_CHECK_FAILURE_MESSAGES[attribute]
         )
+        if owner == username:
+            raise BadRequestError(own_location_riddle_message)
+        raise BadRequestError(already_done_message)
@@ -1,5 +1,6 @@
-import math
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
 from typing import Union
 from aws_lambda_powertools.event_handler.exceptions import (
@@ -8,29 +9,75 @@ from aws_lambda_powertools.event_handler.exceptions import (
     InternalServerError,
 )
 from aws_lambda_powertools.logging import Logger
+from findme_shared.ETag import ETag
+from findme_shared.NotModifiedError import NotModifiedError
 from pydantic import ValidationError
 
+from .Cursor import Cursor
+from .FeedMerger import FeedMerger
+from .Geohash import Geohash, GEO_INDEX_PARTITION_PRECISION
+from .ScoringEngine import ScoringEngine, DEFAULT_MAX_SCORE, DEFAULT_DISTANCE_PENALTY
 from .entities.Comment import Comment
+from .entities.CommentPage import CommentPage
 from .entities.Coordinate import Coordinate
 from .entities.Guess import Guess
+from .entities.GuessPage import GuessPage
+from .entities.ImageDelivery import ImageDelivery
+from .entities.ImageOptions import ImageOptions
+from .entities.ImageSize import ImageSize
 from .entities.LocationRiddle import (
     LocationRiddle,
     LocationRiddleDTO,
     SolvedLocationRiddleDTO,
 )
+from .entities.LocationRiddlePage import LocationRiddlePage
 from .entities.Rating import Rating
+from .entities.ScoringMode import ScoringMode
 
 logger = Logger()
 
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_PAGE_SIZE = 20
+# page size used to read the complete materialized feed for the unpaginated feed
+FEED_READ_PAGE_SIZE = 100
+# upper bound of index cells read by one nearby query, a finer cell level is used as
+# long as it fits
+MAX_NEARBY_CELLS = 16
+# presigned image urls are valid for 900 seconds, an etag of a response with urls
+# changes every half of it
+ETAG_IMAGE_URL_WINDOW_SECONDS = 450
+# cursor position of the pages of embedded interactions following the interaction items
+EMBEDDED_OFFSET = "embedded_offset"
+
 
 class LocationRiddlesService:
-    def __init__(self, location_riddle_repository, image_bucket_repository, user_microservice_client):
+    def __init__(
+        self,
+        location_riddle_repository,
+        image_bucket_repository,
+        user_microservice_client,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        feed_repository=None,
+        scoring_mode: ScoringMode = ScoringMode.LEGACY,
+        score_write_queue=None,
+    ):
         self.image_bucket_repository = image_bucket_repository
         self.location_riddle_repository = location_riddle_repository
         self.user_microservice_client = user_microservice_client
+        # without a feed repository the feed is assembled from the followees on every
+        # read
+        self.feed_repository = feed_repository
+        self.scoring_mode = scoring_mode
+        # without a score write queue scores are written by invoking the users service
+        # synchronously
+        self.score_write_queue = score_write_queue
+        # the pool outlives a single request so warm containers reuse its threads
+        # max_workers=1 falls back to the sequential behaviour
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.feed_merger = FeedMerger(location_riddle_repository, self.executor)
 
     def post_location_riddle(
-        self, image_base64: str, location: list, arenas: list, username: str
+        self, event, image_base64: str, location: list, arenas: list, username: str
     ) -> dict:
         try:
             location_riddle = LocationRiddle(
@@ -49,9 +96,19 @@ class LocationRiddlesService:
                 f"unable to update location_riddle with provided parameters. {e}"
             )
 
-        image_path = f"location-riddles/{location_riddle.location_riddle_id}.png"
         response = self.image_bucket_repository.post_image_to_s3(
-            image_base64, image_path
+            image_base64,
+            LocationRiddlesService.get_image_key(location_riddle.location_riddle_id),
+            {
+                image_size: LocationRiddlesService.get_image_key(
+                    location_riddle.location_riddle_id, image_size
+                )
+                for image_size in ImageSize
+                if image_size != ImageSize.FULL
+            },
+        )
+        location_riddle.image_sizes = response.get(
+            "image_sizes", location_riddle.image_sizes
         )
 
         try:
@@ -59,21 +116,61 @@ class LocationRiddlesService:
         except Exception as e:
             logger.error(e)
             raise InternalServerError(f"{e}")
+
+        if self.feed_repository is not None:
+            # the riddle is stored at this point, a failed fan-out can be repaired with
+            # tools/backfill_feed.py
+            try:
+                followers = self.user_microservice_client.get_followers_users_list(
+                    event, username
+                )
+                self.feed_repository.push_location_riddle_to_feeds(
+                    [follower["username"] for follower in followers], location_riddle
+                )
+            except Exception as e:
+                logger.error(
+                    f"There was an error pushing the location riddle to the feeds: {e}"
+                )
         return response
 
     def get_location_riddle(
-        self, location_riddle_id: str, username: str
+        self,
+        location_riddle_id: str,
+        username: str,
+        image_options: ImageOptions = ImageOptions(),
     ) -> Union[LocationRiddleDTO, SolvedLocationRiddleDTO]:
+        return self.get_location_riddle_with_etag(
+            location_riddle_id, username, image_options
+        )[0]
+
+    def get_location_riddle_with_etag(
+        self,
+        location_riddle_id: str,
+        username: str,
+        image_options: ImageOptions = ImageOptions(),
+        if_none_match: str = None,
+    ) -> tuple[Union[LocationRiddleDTO, SolvedLocationRiddleDTO], str]:
+        """
+        Raises NotModifiedError if if_none_match contains the etag, after reading only
+        the location riddle. The counters on the location riddle change with every
+        guess, comment and rating.
+        """
         location_riddle = self.location_riddle_repository.get_location_riddle_by_location_riddle_id_from_db(
             location_riddle_id
         )
+        etag = self.__get_etag([location_riddle], username, image_options)
+        if ETag.matches(if_none_match, etag):
+            raise NotModifiedError(etag)
 
-        location_riddle_dto = location_riddle.to_dto(username=username)
-        self.__append_image_to_location_riddle(location_riddle_dto)
-        return location_riddle_dto
+        location_riddle_dto = self.__to_dto_with_interactions(location_riddle, username)
+        self.__append_image_to_location_riddle(location_riddle_dto, image_options)
+        return location_riddle_dto, etag
 
     def get_location_riddles_for_user(
-        self, username: str, requester_username: str
+        self,
+        username: str,
+        requester_username: str,
+        image_options: ImageOptions = ImageOptions(),
     ) -> list[Union[LocationRiddleDTO, SolvedLocationRiddleDTO]]:
         location_riddles = (
             self.location_riddle_repository.get_all_location_riddles_by_username(
@@ -85,91 +182,310 @@ class LocationRiddlesService:
                 f"No location riddles for user with username: {username} found"
             )
 
-        location_riddle_dtos = [
-            location_riddle.to_dto(requester_username)
-            for location_riddle in location_riddles
-        ]
-        for location_riddle_dto in location_riddle_dtos:
-            self.__append_image_to_location_riddle(location_riddle_dto)
+        location_riddle_dtos = self.__to_dtos(location_riddles, requester_username)
+        self.__append_images_to_location_riddles(location_riddle_dtos, image_options)
         return location_riddle_dtos
 
+    def get_location_riddles_for_user_page(
+        self,
+        username: str,
+        requester_username: str,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str = None,
+        image_options: ImageOptions = ImageOptions(),
+    ) -> LocationRiddlePage:
+        location_riddles, next_cursor = (
+            self.location_riddle_repository.get_location_riddles_by_username_page(
+                username, limit, cursor
+            )
+        )
+        if len(location_riddles) == 0 and cursor is None:
+            raise NotFoundError(
+                f"No location riddles for user with username: {username} found"
+            )
+
+        location_riddle_dtos = self.__to_dtos(location_riddles, requester_username)
+        self.__append_images_to_location_riddles(location_riddle_dtos, image_options)
+        return LocationRiddlePage(
+            location_riddles=location_riddle_dtos, cursor=next_cursor
+        )
+
     def get_solved_location_riddles_for_user(
-        self, event, username: str, requester_username: str
+        self,
+        event,
+        username: str,
+        requester_username: str,
+        image_options: ImageOptions = ImageOptions(),
     ) -> list[Union[LocationRiddleDTO, SolvedLocationRiddleDTO]]:
-        location_riddle_ids = [location_riddle["location_riddle_id"]
-                               for location_riddle
-                               in self.user_microservice_client.get_user_scores(event, username)]
+        location_riddle_ids = [
+            location_riddle["location_riddle_id"]
+            for location_riddle in self.user_microservice_client.get_user_scores(
+                event, username
+            )
+        ]
 
         if len(location_riddle_ids) == 0:
             raise NotFoundError(
                 f"No location riddles for user with username: {username} found"
             )
 
-        location_riddles = []
-        for location_riddle_id in location_riddle_ids:
-            try:
-                location_riddle = self.location_riddle_repository.get_location_riddle_by_location_riddle_id_from_db(
-                    location_riddle_id)
-                location_riddles.append(location_riddle)
-            except Exception as e:
-                logger.error(f"Error occurred while fetching location riddle with id {location_riddle_id}: {e}")
-                continue
+        # deleted location riddles are skipped by the bulk read
+        location_riddles = self.location_riddle_repository.get_location_riddles_by_ids(
+            location_riddle_ids
+        )
 
-        location_riddle_dtos = [
-            location_riddle.to_dto(requester_username)
-            for location_riddle in location_riddles
-        ]
-        for location_riddle_dto in location_riddle_dtos:
-            self.__append_image_to_location_riddle(location_riddle_dto)
+        location_riddle_dtos = self.__to_dtos(location_riddles, requester_username)
+        self.__append_images_to_location_riddles(location_riddle_dtos, image_options)
         return location_riddle_dtos
 
+    def get_solved_location_riddles_for_user_page(
+        self,
+        event,
+        username: str,
+        requester_username: str,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str = None,
+        image_options: ImageOptions = ImageOptions(),
+    ) -> LocationRiddlePage:
+        location_riddle_ids = [
+            location_riddle["location_riddle_id"]
+            for location_riddle in self.user_microservice_client.get_user_scores(
+                event, username
+            )
+        ]
+
+        if len(location_riddle_ids) == 0:
+            raise NotFoundError(
+                f"No location riddles for user with username: {username} found"
+            )
+
+        # the scores are one list on the user, the cursor is the offset into it
+        start = Cursor.decode_offset(cursor)
+        next_cursor = (
+            Cursor.encode_offset(start + limit)
+            if start + limit < len(location_riddle_ids)
+            else None
+        )
+        # deleted location riddles are skipped by the bulk read
+        location_riddles = self.location_riddle_repository.get_location_riddles_by_ids(
+            location_riddle_ids[start : start + limit]
+        )
+
+        location_riddle_dtos = self.__to_dtos(location_riddles, requester_username)
+        self.__append_images_to_location_riddles(location_riddle_dtos, image_options)
+        return LocationRiddlePage(
+            location_riddles=location_riddle_dtos, cursor=next_cursor
+        )
+
     def get_location_riddles_feed(
-        self, event, username: str
+        self, event, username: str, image_options: ImageOptions = ImageOptions()
     ) -> list[Union[LocationRiddleDTO, SolvedLocationRiddleDTO]]:
-        following_users = self.user_microservice_client.get_following_users_list(event, username)
+        return self.get_location_riddles_feed_with_etag(event, username, image_options)[
+            0
+        ]
 
-        response = []
-        for following_user in following_users:
-            try:
-                response.extend(
-                    self.get_location_riddles_for_user(
-                        username=following_user["username"], requester_username=username
+    def get_location_riddles_feed_with_etag(
+        self,
+        event,
+        username: str,
+        image_options: ImageOptions = ImageOptions(),
+        if_none_match: str = None,
+    ) -> tuple[list[Union[LocationRiddleDTO, SolvedLocationRiddleDTO]], str]:
+        if self.feed_repository is not None:
+            location_riddle_ids = []
+            cursor = None
+            while True:
+                page_location_riddle_ids, cursor = (
+                    self.feed_repository.get_feed_location_riddle_ids(
+                        username, FEED_READ_PAGE_SIZE, cursor
                     )
                 )
-            except NotFoundError:
-                continue
-        return sorted(response, key=lambda riddle: riddle.created_at, reverse=True)
+                location_riddle_ids.extend(page_location_riddle_ids)
+                if cursor is None:
+                    break
+            # feed entries of deleted location riddles are skipped by the bulk read
+            location_riddles = (
+                self.location_riddle_repository.get_location_riddles_by_ids(
+                    location_riddle_ids
+                )
+            )
+        else:
+            following_users = self.user_microservice_client.get_following_users_list(
+                event, username
+            )
+
+            # query all followees concurrently, map() keeps the order of following_users
+            location_riddles_per_user = self.executor.map(
+                self.location_riddle_repository.get_all_location_riddles_by_username,
+                [following_user["username"] for following_user in following_users],
+            )
+
+            location_riddles = []
+            for user_location_riddles in location_riddles_per_user:
+                location_riddles.extend(user_location_riddles)
+
+        location_riddles.sort(key=lambda riddle: riddle.created_at, reverse=True)
+        # checked before the interactions and images are read
+        etag = self.__get_etag(location_riddles, username, image_options)
+        if ETag.matches(if_none_match, etag):
+            raise NotModifiedError(etag)
+
+        location_riddle_dtos = self.__to_dtos(location_riddles, username)
+        self.__append_images_to_location_riddles(location_riddle_dtos, image_options)
+        return location_riddle_dtos, etag
+
+    def get_location_riddles_feed_page(
+        self,
+        event,
+        username: str,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str = None,
+        image_options: ImageOptions = ImageOptions(),
+    ) -> LocationRiddlePage:
+        return self.get_location_riddles_feed_page_with_etag(
+            event, username, limit, cursor, image_options
+        )[0]
+
+    def get_location_riddles_feed_page_with_etag(
+        self,
+        event,
+        username: str,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str = None,
+        image_options: ImageOptions = ImageOptions(),
+        if_none_match: str = None,
+    ) -> tuple[LocationRiddlePage, str]:
+        if self.feed_repository is None:
+            # reads and image loads scale with limit, not with the history of the
+            # followees
+            following_users = self.user_microservice_client.get_following_users_list(
+                event, username
+            )
+            location_riddles, next_cursor = self.feed_merger.get_page(
+                [following_user["username"] for following_user in following_users],
+                limit,
+                cursor,
+            )
+        else:
+            location_riddle_ids, next_cursor = (
+                self.feed_repository.get_feed_location_riddle_ids(
+                    username, limit, cursor
+                )
+            )
+            # feed entries of deleted location riddles are skipped by the bulk read
+            location_riddles = (
+                self.location_riddle_repository.get_location_riddles_by_ids(
+                    location_riddle_ids
+                )
+            )
+        # checked before the interactions and images are read
+        etag = self.__get_etag(location_riddles, username, image_options, next_cursor)
+        if ETag.matches(if_none_match, etag):
+            raise NotModifiedError(etag)
+
+        location_riddle_dtos = self.__to_dtos(location_riddles, username)
+        self.__append_images_to_location_riddles(location_riddle_dtos, image_options)
+        return LocationRiddlePage(
+            location_riddles=location_riddle_dtos, cursor=next_cursor
+        ), etag
+
+    def add_followee_to_feed(self, username: str, followee: str):
+        # fan-out on post only reaches the followers at that time, the location riddles
+        # the followee posted before the follow are added here
+        self.feed_repository.push_location_riddles_to_feed(
+            username,
+            self.location_riddle_repository.get_all_location_riddles_by_username(
+                followee
+            ),
+        )
+
+    def remove_followee_from_feed(self, username: str, followee: str):
+        self.feed_repository.remove_author_from_feed(username, followee)
 
     def get_location_riddles_arena(
-            self, arena: str, username: str
+        self, arena: str, username: str, image_options: ImageOptions = ImageOptions()
     ) -> list[Union[LocationRiddleDTO, SolvedLocationRiddleDTO]]:
-        location_riddles = self.location_riddle_repository.get_all_location_riddles_containing_arena(arena, username)
-        if len(location_riddles) == 0:
-            raise NotFoundError(
-                f"No location riddles for arena: {arena} found"
+        location_riddles = (
+            self.location_riddle_repository.get_all_location_riddles_containing_arena(
+                arena, username
             )
+        )
+        if len(location_riddles) == 0:
+            raise NotFoundError(f"No location riddles for arena: {arena} found")
 
-        location_riddle_dtos = [
-            location_riddle.to_dto(username)
-            for location_riddle in location_riddles
-        ]
-        for location_riddle_dto in location_riddle_dtos:
-            self.__append_image_to_location_riddle(location_riddle_dto)
+        location_riddle_dtos = self.__to_dtos(location_riddles, username)
+        self.__append_images_to_location_riddles(location_riddle_dtos, image_options)
         return location_riddle_dtos
 
-    def rate_location_riddle(
-        self, location_riddle_id: str, username: str, rating: int
-    ) -> Union[LocationRiddleDTO, SolvedLocationRiddleDTO]:
-        location_riddle = self.location_riddle_repository.get_location_riddle_by_location_riddle_id_from_db(
-            location_riddle_id
+    def get_location_riddles_arena_page(
+        self,
+        arena: str,
+        username: str,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str = None,
+        image_options: ImageOptions = ImageOptions(),
+    ) -> LocationRiddlePage:
+        location_riddles, next_cursor = (
+            self.location_riddle_repository.get_location_riddles_containing_arena_page(
+                arena, username, limit, cursor
+            )
+        )
+        if len(location_riddles) == 0 and cursor is None:
+            raise NotFoundError(f"No location riddles for arena: {arena} found")
+
+        location_riddle_dtos = self.__to_dtos(location_riddles, username)
+        self.__append_images_to_location_riddles(location_riddle_dtos, image_options)
+        return LocationRiddlePage(
+            location_riddles=location_riddle_dtos, cursor=next_cursor
         )
 
-        if location_riddle.username == username:
-            raise BadRequestError("User cannot rate their own location riddle")
-        for rating_entry in location_riddle.ratings:
-            if rating_entry.username == username:
-                raise BadRequestError("User has already rated this location riddle")
+    def get_nearby_location_riddles(
+        self,
+        username: str,
+        lat: float,
+        lon: float,
+        radius: float,
+        limit: int = DEFAULT_PAGE_SIZE,
+        image_options: ImageOptions = ImageOptions(),
+    ) -> list[Union[LocationRiddleDTO, SolvedLocationRiddleDTO]]:
+        """
+        Reads the location riddles of other users within radius meters of (lat, lon),
+        nearest first. Only the geohash cells covering the circle are queried, the
+        candidates are then filtered by their exact distance.
+        """
+        cells = Geohash.covering_cells(
+            lat, lon, radius, GEO_INDEX_PARTITION_PRECISION, MAX_NEARBY_CELLS
+        )
+        distances = {}
+        for entries in self.executor.map(
+            self.location_riddle_repository.get_geo_index_entries_in_cell, cells
+        ):
+            for entry in entries:
+                if entry["username"] == username:
+                    continue
+                distance = Geohash.haversine_distance(
+                    lat, lon, float(entry["lat"]), float(entry["lon"])
+                )
+                if distance <= radius:
+                    distances[entry["location_riddle_id"]] = distance
+
+        nearest_location_riddle_ids = sorted(distances, key=distances.get)[:limit]
+        location_riddle_dtos = self.__to_dtos(
+            self.location_riddle_repository.get_location_riddles_by_ids(
+                nearest_location_riddle_ids
+            ),
+            username,
+        )
+        self.__append_images_to_location_riddles(location_riddle_dtos, image_options)
+        return location_riddle_dtos
 
+    def rate_location_riddle(
+        self,
+        location_riddle_id: str,
+        username: str,
+        rating: int,
+        image_options: ImageOptions = ImageOptions(),
+    ) -> Union[LocationRiddleDTO, SolvedLocationRiddleDTO]:
         try:
             rating = Rating(username=username, rating=rating)
         except ValidationError as e:
@@ -180,33 +496,28 @@ class LocationRiddlesService:
                 f"unable to update location_riddle with provided parameters. {e}"
             )
 
-        try:
-            updated_location_riddle = (
-                self.location_riddle_repository.update_location_riddle_rating_in_db(
-                    location_riddle_id, rating
-                )
+        # the repository rejects the owner and users that already rated in the same
+        # conditional update
+        updated_location_riddle = (
+            self.location_riddle_repository.update_location_riddle_rating_in_db(
+                location_riddle_id, rating
             )
-        except Exception as e:
-            logger.error(e)
-            raise BadRequestError(f"{e}")
+        )
 
-        location_riddle_dto = updated_location_riddle.to_dto(username)
-        self.__append_image_to_location_riddle(location_riddle_dto)
+        location_riddle_dto = self.__to_dto_with_interactions(
+            updated_location_riddle, username
+        )
+        self.__append_image_to_location_riddle(location_riddle_dto, image_options)
         return location_riddle_dto
 
     def guess_location_riddle(
-        self, event, location_riddle_id: str, username: str, guess: list
+        self,
+        event,
+        location_riddle_id: str,
+        username: str,
+        guess: list,
+        image_options: ImageOptions = ImageOptions(),
     ) -> dict:
-        location_riddle = self.location_riddle_repository.get_location_riddle_by_location_riddle_id_from_db(
-            location_riddle_id
-        )
-
-        if location_riddle.username == username:
-            raise BadRequestError("User cannot guess their own location riddle")
-        for guess_entry in location_riddle.guesses:
-            if guess_entry.username == username:
-                raise BadRequestError("User has already guessed this location riddle")
-
         try:
             guess = Guess(
                 username=username,
@@ -220,35 +531,37 @@ class LocationRiddlesService:
                 f"unable to update location_riddle with provided parameters. {e}"
             )
 
-        try:
-            updated_location_riddle = (
-                self.location_riddle_repository.update_location_riddle_guesses_in_db(
-                    location_riddle_id, guess
-                )
+        # the repository rejects the owner and users that already guessed in the same
+        # conditional update
+        updated_location_riddle = (
+            self.location_riddle_repository.update_location_riddle_guesses_in_db(
+                location_riddle_id, guess
             )
-        except Exception as e:
-            logger.error(e)
-            raise BadRequestError(f"{e}")
+        )
 
         score, distance = LocationRiddlesService.calculate_score_and_distance(
             [float(coord) for coord in updated_location_riddle.location.coordinate],
             [float(coord) for coord in guess.guess.coordinate],
+            scoring_mode=self.scoring_mode,
         )
 
-        try:
-            self.user_microservice_client.write_score_to_user_in_user_db(event, location_riddle_id, int(score))
-        except Exception as e:
-            logger.error(f"There was an error writing the score to the user db: {e}")
+        self.__write_score(event, username, location_riddle_id, int(score))
 
-        location_riddle_dto = updated_location_riddle.to_dto(username)
-        self.__append_image_to_location_riddle(location_riddle_dto)
+        location_riddle_dto = self.__to_dto_with_interactions(
+            updated_location_riddle, username
+        )
+        self.__append_image_to_location_riddle(location_riddle_dto, image_options)
         return {
             "location_riddle": location_riddle_dto.dict(),
             "guess_result": {"distance": distance, "received_score": score},
         }
 
     def comment_location_riddle(
-        self, location_riddle_id: str, username: str, comment: str
+        self,
+        location_riddle_id: str,
+        username: str,
+        comment: str,
+        image_options: ImageOptions = ImageOptions(),
     ) -> Union[LocationRiddleDTO, SolvedLocationRiddleDTO]:
         try:
             comment = Comment(username=username, comment=comment)
@@ -260,20 +573,63 @@ class LocationRiddlesService:
                 f"unable to update location_riddle with provided parameters. {e}"
             )
 
-        try:
-            updated_location_riddle = (
-                self.location_riddle_repository.update_location_riddle_comments_in_db(
-                    location_riddle_id, comment
-                )
+        updated_location_riddle = (
+            self.location_riddle_repository.update_location_riddle_comments_in_db(
+                location_riddle_id, comment
             )
-        except Exception as e:
-            logger.error(e)
-            raise BadRequestError(f"{e}")
+        )
 
-        location_riddle_dto = updated_location_riddle.to_dto(username)
-        self.__append_image_to_location_riddle(location_riddle_dto)
+        location_riddle_dto = self.__to_dto_with_interactions(
+            updated_location_riddle, username
+        )
+        self.__append_image_to_location_riddle(location_riddle_dto, image_options)
         return location_riddle_dto
 
+    def get_comments_page(
+        self,
+        location_riddle_id: str,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str = None,
+    ) -> CommentPage:
+        # raises NotFoundError for unknown location riddles
+        location_riddle = self.location_riddle_repository.get_location_riddle_by_location_riddle_id_from_db(
+            location_riddle_id
+        )
+        comments, next_cursor = self.__get_interactions_page(
+            location_riddle,
+            self.location_riddle_repository.get_comments_page,
+            LocationRiddlesService.__get_embedded_comments(location_riddle),
+            limit,
+            cursor,
+        )
+        return CommentPage(comments=comments, cursor=next_cursor)
+
+    def get_guesses_page(
+        self,
+        location_riddle_id: str,
+        username: str,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str = None,
+    ) -> GuessPage:
+        location_riddle = self.location_riddle_repository.get_location_riddle_by_location_riddle_id_from_db(
+            location_riddle_id
+        )
+        # the guesses give away the location, only the owner and users who guessed may
+        # see them
+        if not self.__to_dtos([location_riddle], username)[0].solved:
+            raise BadRequestError(
+                "User has to guess the location riddle before seeing its guesses"
+            )
+
+        guesses, next_cursor = self.__get_interactions_page(
+            location_riddle,
+            self.location_riddle_repository.get_guesses_page,
+            location_riddle.guesses,
+            limit,
+            cursor,
+        )
+        return GuessPage(guesses=guesses, cursor=next_cursor)
+
     def delete_location_riddle(self, location_riddle_id: str, username: str) -> dict:
         location_riddle = self.location_riddle_repository.get_location_riddle_by_location_riddle_id_from_db(
             location_riddle_id
@@ -284,31 +640,225 @@ class LocationRiddlesService:
                 "User does not have permission to delete this location riddle"
             )
 
-        key = f"location-riddles/{location_riddle.location_riddle_id}.png"
-        self.image_bucket_repository.delete_image_from_s3(key)
+        self.image_bucket_repository.delete_images_from_s3(
+            [
+                LocationRiddlesService.get_image_key(
+                    location_riddle.location_riddle_id, ImageSize(image_size)
+                )
+                for image_size in location_riddle.image_sizes
+            ]
+        )
         self.location_riddle_repository.delete_location_riddle_from_db(
             location_riddle_id
         )
         return {"message": "Location riddle deleted successfully"}
 
-    def __append_image_to_location_riddle(self, location_riddle: LocationRiddle):
-        key = f"location-riddles/{location_riddle.location_riddle_id}.png"
+    def __to_dtos(
+        self, location_riddles: list[LocationRiddle], username: str
+    ) -> list[Union[LocationRiddleDTO, SolvedLocationRiddleDTO]]:
+        # whether username guessed or rated is read from the interaction items in one
+        # batch
+        guessed_location_riddle_ids, rated_location_riddle_ids = (
+            self.location_riddle_repository.get_guessed_and_rated_location_riddle_ids(
+                [
+                    location_riddle.location_riddle_id
+                    for location_riddle in location_riddles
+                ],
+                username,
+            )
+            if location_riddles
+            else (set(), set())
+        )
+        return [
+            location_riddle.model_copy(
+                update={
+                    "is_guessed_by_user": location_riddle.location_riddle_id
+                    in guessed_location_riddle_ids,
+                    "is_rated_by_user": location_riddle.location_riddle_id
+                    in rated_location_riddle_ids,
+                }
+            ).to_dto(username)
+            for location_riddle in location_riddles
+        ]
+
+    def __to_dto_with_interactions(
+        self, location_riddle: LocationRiddle, username: str
+    ) -> Union[LocationRiddleDTO, SolvedLocationRiddleDTO]:
+        """
+        Single location riddle responses carry the newest page of comments and, once
+        solved, the first page of guesses. Both are read like get_comments_page and
+        get_guesses_page, including the entries still embedded in the location riddle.
+        """
+        if (
+            location_riddle.is_guessed_by_user is None
+            or location_riddle.is_rated_by_user is None
+        ):
+            location_riddle_dto = self.__to_dtos([location_riddle], username)[0]
+        else:
+            # the repository already read the interactions of username together with a
+            # write
+            location_riddle_dto = location_riddle.to_dto(username)
+        location_riddle_dto.comments, _ = self.__get_interactions_page(
+            location_riddle,
+            self.location_riddle_repository.get_comments_page,
+            LocationRiddlesService.__get_embedded_comments(location_riddle),
+            DEFAULT_PAGE_SIZE,
+        )
+        if location_riddle_dto.solved:
+            location_riddle_dto.guesses, _ = self.__get_interactions_page(
+                location_riddle,
+                self.location_riddle_repository.get_guesses_page,
+                location_riddle.guesses,
+                DEFAULT_PAGE_SIZE,
+            )
+        return location_riddle_dto
+
+    @staticmethod
+    def __get_interactions_page(
+        location_riddle: LocationRiddle,
+        get_page,
+        embedded: list,
+        limit: int,
+        cursor: str = None,
+    ) -> tuple[list, str]:
+        """
+        Pages through the interaction items first and continues with the entries still
+        embedded in location riddles not yet migrated by tools/migrate_interactions.py.
+        Interactions written after the interaction table was introduced are always
+        items, the embedded entries are the older ones.
+        """
+        position = Cursor.decode(cursor)
+        if position is not None and EMBEDDED_OFFSET in position:
+            interactions, offset = [], position[EMBEDDED_OFFSET]
+            if not isinstance(offset, int) or offset < 0:
+                raise BadRequestError(f"Invalid cursor: {cursor}")
+        else:
+            interactions, next_cursor = get_page(
+                location_riddle.location_riddle_id, limit, cursor
+            )
+            if next_cursor is not None or not embedded:
+                return interactions, next_cursor
+            offset = 0
+        end = offset + limit - len(interactions)
+        return interactions + embedded[offset:end], (
+            Cursor.encode({EMBEDDED_OFFSET: end}) if end < len(embedded) else None
+        )
+
+    @staticmethod
+    def __get_embedded_comments(location_riddle: LocationRiddle) -> list[Comment]:
+        # embedded comments were appended, the pages are newest first
+        return list(reversed(location_riddle.comments))
+
+    def __write_score(self, event, username: str, location_riddle_id: str, score: int):
+        if self.score_write_queue is not None:
+            try:
+                self.score_write_queue.enqueue_score(
+                    username, location_riddle_id, score
+                )
+                # cached scores are stale until the queue is drained, at most for the
+                # cache ttl
+                self.user_microservice_client.invalidate_user_scores(username)
+                return
+            except Exception as e:
+                # the users service ignores a score it already has, falling back can not
+                # count it twice
+                logger.error(
+                    "There was an error enqueueing the score, "
+                    f"writing it synchronously: {e}"
+                )
+        try:
+            self.user_microservice_client.write_score_to_user_in_user_db(
+                event, username, location_riddle_id, score
+            )
+        except Exception as e:
+            logger.error(f"There was an error writing the score to the user db: {e}")
+
+    @staticmethod
+    def __get_etag(
+        location_riddles: list[LocationRiddle],
+        username: str,
+        image_options: ImageOptions,
+        *parts,
+    ) -> str:
+        # the response depends on the requesting user, e.g. solved or rated, and on the
+        # image options
+        image_url_window = (
+            int(time.time()) // ETAG_IMAGE_URL_WINDOW_SECONDS
+            if image_options.delivery == ImageDelivery.URL
+            else None
+        )
+        return ETag.compute(
+            username,
+            image_options.delivery.value,
+            image_options.size.value,
+            image_url_window,
+            *parts,
+            *(
+                location_riddle.model_dump_json()
+                for location_riddle in location_riddles
+            ),
+        )
+
+    def __append_image_to_location_riddle(
+        self, location_riddle: LocationRiddle, image_options: ImageOptions
+    ):
+        key = LocationRiddlesService.__get_image_key_for_dto(
+            location_riddle, image_options.size
+        )
+        if image_options.delivery == ImageDelivery.URL:
+            location_riddle.image_url = self.image_bucket_repository.get_image_url(key)
+            return
         location_riddle.image_base64 = self.image_bucket_repository.get_image_from_s3(
             key
         )
 
+    def __append_images_to_location_riddles(
+        self, location_riddles: list, image_options: ImageOptions
+    ):
+        if image_options.delivery == ImageDelivery.URL:
+            for location_riddle in location_riddles:
+                self.__append_image_to_location_riddle(location_riddle, image_options)
+            return
+
+        # a missing image leaves image_base64 empty instead of failing the whole list
+        images = self.image_bucket_repository.get_images_from_s3(
+            [
+                LocationRiddlesService.__get_image_key_for_dto(
+                    location_riddle, image_options.size
+                )
+                for location_riddle in location_riddles
+            ]
+        )
+        for location_riddle, image in zip(location_riddles, images):
+            location_riddle.image_base64 = image
+
+    @staticmethod
+    def __get_image_key_for_dto(location_riddle, image_size: ImageSize) -> str:
+        # location riddles uploaded before the derivatives existed are only available in
+        # full size
+        if image_size.value not in location_riddle.image_sizes:
+            image_size = ImageSize.FULL
+        return LocationRiddlesService.get_image_key(
+            location_riddle.location_riddle_id, image_size
+        )
+
+    @staticmethod
+    def get_image_key(
+        location_riddle_id: str, image_size: ImageSize = ImageSize.FULL
+    ) -> str:
+        if image_size == ImageSize.FULL:
+            return f"location-riddles/{location_riddle_id}.png"
+        return f"location-riddles/{location_riddle_id}_{image_size.value}.webp"
+
     @staticmethod
     def calculate_score_and_distance(
-        actual_coord, guessed_coord, max_score=10000, distance_penalty=3
+        actual_coord,
+        guessed_coord,
+        max_score=DEFAULT_MAX_SCORE,
+        distance_penalty=DEFAULT_DISTANCE_PENALTY,
+        scoring_mode: ScoringMode = ScoringMode.LEGACY,
     ):
-        distance = (
-            math.sqrt(
-                (actual_coord[0] - guessed_coord[0]) ** 2
-                + (actual_coord[1] - guessed_coord[1]) ** 2
-            )
-            / 1000
+        scores, distances = ScoringEngine.calculate_scores_and_distances(
+            [actual_coord], [guessed_coord], max_score, distance_penalty, scoring_mode
         )
-
-        # Calculate score with simple linear penalty
-        score = max(0, max_score - distance * distance_penalty)
-        return score, distance
+        return float(scores[0]), float(distances[0])
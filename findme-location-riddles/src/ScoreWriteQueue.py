@@ -0,0 +1,31 @@
+import json
+import os
+
+import boto3
+
+from .base.AbstractScoreWriteQueue import AbstractScoreWriteQueue
+
+
+class ScoreWriteQueue(AbstractScoreWriteQueue):
+    """
+    Hands score writes to the users service through SQS instead of invoking it
+    synchronously. The users service consumes the queue with idempotent writes, failed
+    messages are redelivered and moved to the dead-letter queue after maxReceiveCount
+    attempts.
+    """
+
+    def __init__(self):
+        self.client = boto3.client("sqs", region_name="eu-central-2")
+        self.queue_url = os.environ["SCORE_WRITE_QUEUE_URL"]
+
+    def enqueue_score(self, username: str, location_riddle_id: str, score: int):
+        self.client.send_message(
+            QueueUrl=self.queue_url,
+            MessageBody=json.dumps(
+                {
+                    "username": username,
+                    "location_riddle_id": location_riddle_id,
+                    "score": score,
+                }
+            ),
+        )
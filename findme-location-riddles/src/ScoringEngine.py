@@ -0,0 +1,67 @@
+import numpy as np
+
+from .Geohash import EARTH_RADIUS_METERS, WEB_MERCATOR_RADIUS_METERS
+from .entities.ScoringMode import ScoringMode
+
+DEFAULT_MAX_SCORE = 10000
+DEFAULT_DISTANCE_PENALTY = 3
+
+
+class ScoringEngine:
+    """
+    Scores guesses in one vectorized NumPy pass. Coordinates are [x, y] pairs in Web
+    Mercator (EPSG:3857) meters, distances are returned in km.
+    """
+
+    @staticmethod
+    def calculate_scores_and_distances(
+        actual_coords,
+        guessed_coords,
+        max_score: float = DEFAULT_MAX_SCORE,
+        distance_penalty: float = DEFAULT_DISTANCE_PENALTY,
+        scoring_mode: ScoringMode = ScoringMode.LEGACY,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        actual_coords = np.asarray(actual_coords, dtype=np.float64).reshape(-1, 2)
+        guessed_coords = np.asarray(guessed_coords, dtype=np.float64).reshape(-1, 2)
+        if actual_coords.shape != guessed_coords.shape:
+            raise ValueError(
+                f"actual_coords {actual_coords.shape} and "
+                f"guessed_coords {guessed_coords.shape} differ in shape"
+            )
+
+        if scoring_mode == ScoringMode.HAVERSINE:
+            distances = ScoringEngine.haversine_distances(actual_coords, guessed_coords)
+        else:
+            distances = (
+                np.hypot(
+                    actual_coords[:, 0] - guessed_coords[:, 0],
+                    actual_coords[:, 1] - guessed_coords[:, 1],
+                )
+                / 1000
+            )
+
+        # simple linear penalty
+        scores = np.maximum(0, max_score - distances * distance_penalty)
+        return scores, distances
+
+    @staticmethod
+    def haversine_distances(
+        actual_coords: np.ndarray, guessed_coords: np.ndarray
+    ) -> np.ndarray:
+        actual_lat, actual_lon = ScoringEngine.to_lat_lon_radians(actual_coords)
+        guessed_lat, guessed_lon = ScoringEngine.to_lat_lon_radians(guessed_coords)
+        a = (
+            np.sin((guessed_lat - actual_lat) / 2) ** 2
+            + np.cos(actual_lat)
+            * np.cos(guessed_lat)
+            * np.sin((guessed_lon - actual_lon) / 2) ** 2
+        )
+        return 2 * EARTH_RADIUS_METERS * np.arcsin(np.minimum(1.0, np.sqrt(a))) / 1000
+
+    @staticmethod
+    def to_lat_lon_radians(coords: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        lon = coords[:, 0] / WEB_MERCATOR_RADIUS_METERS
+        lat = (
+            2 * np.arctan(np.exp(coords[:, 1] / WEB_MERCATOR_RADIUS_METERS)) - np.pi / 2
+        )
+        return lat, lon
@@ -0,0 +1,66 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+
+class TTLCache:
+    """
+    Least recently used cache whose entries expire ttl_seconds after they were put,
+    bounded by max_entries. Meant for per-container caching of responses of other
+    services, stale reads are limited to ttl_seconds unless keys are invalidated when
+    the data changes. None can not be cached.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        # key -> (expires_at, value)
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and entry[0] <= self.clock():
+                del self.__entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.__entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, value: Any):
+        with self.__lock:
+            self.__entries.pop(key, None)
+            self.__entries[key] = (self.clock() + self.ttl_seconds, value)
+            while len(self.__entries) > self.max_entries:
+                self.__entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: str):
+        with self.__lock:
+            self.__entries.pop(key, None)
+
+    def get_statistics(self) -> dict:
+        with self.__lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "expirations": self.expirations,
+                "evictions": self.evictions,
+                "entries": len(self.__entries),
+            }
@@ -1,47 +1,76 @@
-import json
-import os
-import boto3
-from urllib.parse import urljoin
+from .LambdaUserTransport import LambdaUserTransport
+from .LatencyRecorder import LatencyRecorder
+from .TTLCache import TTLCache
 from .base.AbstractUserMicroserviceClient import AbstractUserMicroserviceClient
+from .base.AbstractUserTransport import AbstractUserTransport
+
+CONNECTIONS_CACHE_PREFIX = "CONNECTIONS#"
+SCORES_CACHE_PREFIX = "SCORES#"
 
 
 class UserMicroserviceClient(AbstractUserMicroserviceClient):
-    def __init__(self):
-        self.client = boto3.client("lambda", region_name="eu-central-2")
-        self.base_url = "/users/"
+    def __init__(self, transport: AbstractUserTransport = None, cache: TTLCache = None):
+        # the users Lambda is invoked unless another transport is given
+        self.transport = transport if transport is not None else LambdaUserTransport()
+        # without a cache every call reaches the users service
+        self.cache = cache
+        # cache hits are not measured, the latencies are the ones of the transport
+        self.latency_recorder = LatencyRecorder()
 
     def get_following_users_list(self, event, username: str):
-        event_dict = dict(event)
-        event_dict["path"] = urljoin(self.base_url, f"{username}/follow")
-        user_connections = self.__invoke_request(event_dict)
+        return self.__get_user_connections(event, username)["following"]
 
-        return user_connections["following"]
+    def get_followers_users_list(self, event, username: str):
+        return self.__get_user_connections(event, username)["followers"]
 
     def get_user_scores(self, event, username: str):
-        event_dict = dict(event)
-        event_dict["path"] = urljoin(self.base_url, f"{username}/scores")
-        user_scores = self.__invoke_request(event_dict)
-
-        return user_scores
+        return self.__get_cached(
+            f"{SCORES_CACHE_PREFIX}{username}",
+            "get_user_scores",
+            self.transport.get_user_scores,
+            event,
+            username,
+        )
 
     def write_score_to_user_in_user_db(
-        self, event, location_riddle_id: str, score: int
+        self, event, username: str, location_riddle_id: str, score: int
     ):
-        event_dict = dict(event)
-        event_dict["path"] = urljoin(self.base_url, "score")
-        event_dict["body"] = json.dumps(
-            {"score": score, "location_riddle_id": location_riddle_id}
-        )
-        _ = self.__invoke_request(event_dict)
+        try:
+            self.latency_recorder.measure(
+                "write_score",
+                self.transport.write_score,
+                event,
+                username,
+                location_riddle_id,
+                score,
+            )
+        finally:
+            self.invalidate_user_scores(username)
+
+    def invalidate_user_scores(self, username: str):
+        if self.cache is not None:
+            self.cache.invalidate(f"{SCORES_CACHE_PREFIX}{username}")
+
+    def get_latency_statistics(self) -> dict:
+        return {
+            "transport": type(self.transport).__name__,
+            "operations": self.latency_recorder.get_statistics(),
+        }
 
-    def __invoke_request(self, event_dict: dict):
-        response = self.client.invoke(
-            FunctionName=os.environ["USER_FUNCTION_NAME"],
-            Payload=json.dumps(event_dict),
+    def __get_user_connections(self, event, username: str):
+        # followers and following are returned by the same request and cached together
+        return self.__get_cached(
+            f"{CONNECTIONS_CACHE_PREFIX}{username}",
+            "get_user_connections",
+            self.transport.get_user_connections,
+            event,
+            username,
         )
 
-        streaming_body = response["Payload"]
-        payload_bytes = streaming_body.read()
-        payload_str = payload_bytes.decode("utf-8")
-        payload_dict = json.loads(payload_str)
-        return json.loads(payload_dict["body"])
\ No newline at end of file
+    def __get_cached(self, key: str, operation: str, function, *args):
+        value = self.cache.get(key) if self.cache is not None else None
+        if value is None:
+            value = self.latency_recorder.measure(operation, function, *args)
+            if self.cache is not None:
+                self.cache.put(key, value)
+        return value
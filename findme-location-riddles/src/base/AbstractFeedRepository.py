@@ -0,0 +1,27 @@
+from abc import ABC, abstractmethod
+
+from ..entities.LocationRiddle import LocationRiddle
+
+
+class AbstractFeedRepository(ABC):
+    @abstractmethod
+    def push_location_riddle_to_feeds(
+        self, usernames: list[str], location_riddle: LocationRiddle
+    ):
+        pass
+
+    @abstractmethod
+    def push_location_riddles_to_feed(
+        self, username: str, location_riddles: list[LocationRiddle]
+    ):
+        pass
+
+    @abstractmethod
+    def remove_author_from_feed(self, username: str, author: str):
+        pass
+
+    @abstractmethod
+    def get_feed_location_riddle_ids(
+        self, username: str, limit: int, cursor: str = None
+    ):
+        pass
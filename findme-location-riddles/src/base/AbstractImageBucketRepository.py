@@ -2,15 +2,28 @@ from abc import ABC, abstractmethod
 
 
 class AbstractImageBucketRepository(ABC):
-
     @abstractmethod
-    def post_image_to_s3(self, image_base64: str, key: str):
+    def post_image_to_s3(
+        self, image_base64: str, key: str, derivative_keys: dict = None
+    ):
         pass
 
     @abstractmethod
     def get_image_from_s3(self, key: str):
         pass
 
+    @abstractmethod
+    def get_images_from_s3(self, keys: list[str]):
+        pass
+
+    @abstractmethod
+    def get_image_url(self, key: str):
+        pass
+
     @abstractmethod
     def delete_image_from_s3(self, key: str):
         pass
+
+    @abstractmethod
+    def delete_images_from_s3(self, keys: list[str]):
+        pass
@@ -15,16 +15,41 @@ class AbstractLocationRiddlesRepository(ABC):
     def get_all_location_riddles_by_username(self, username: str):
         pass
 
+    @abstractmethod
+    def get_location_riddles_by_username_page(
+        self,
+        username: str,
+        limit: int,
+        cursor: str = None,
+        since: int = None,
+        before: int = None,
+    ):
+        pass
+
     @abstractmethod
     def get_location_riddle_by_location_riddle_id_from_db(
         self, location_riddle_id: str
     ):
         pass
 
+    @abstractmethod
+    def get_location_riddles_by_ids(self, location_riddle_ids: list[str]):
+        pass
+
     @abstractmethod
     def get_all_location_riddles_containing_arena(self, arena: str, username: str):
         pass
 
+    @abstractmethod
+    def get_location_riddles_containing_arena_page(
+        self, arena: str, username: str, limit: int, cursor: str = None
+    ):
+        pass
+
+    @abstractmethod
+    def get_geo_index_entries_in_cell(self, cell: str):
+        pass
+
     @abstractmethod
     def update_location_riddle_rating_in_db(
         self, location_riddle_id: str, rating: Rating
@@ -43,6 +68,22 @@ class AbstractLocationRiddlesRepository(ABC):
     ):
         pass
 
+    @abstractmethod
+    def get_guessed_and_rated_location_riddle_ids(
+        self, location_riddle_ids: list[str], username: str
+    ):
+        pass
+
+    @abstractmethod
+    def get_comments_page(
+        self, location_riddle_id: str, limit: int, cursor: str = None
+    ):
+        pass
+
+    @abstractmethod
+    def get_guesses_page(self, location_riddle_id: str, limit: int, cursor: str = None):
+        pass
+
     @abstractmethod
     def delete_location_riddle_from_db(self, location_riddle_id: str):
         pass
@@ -0,0 +1,7 @@
+from abc import ABC, abstractmethod
+
+
+class AbstractScoreWriteQueue(ABC):
+    @abstractmethod
+    def enqueue_score(self, username: str, location_riddle_id: str, score: int):
+        pass
@@ -0,0 +1,20 @@
+from abc import ABC, abstractmethod
+
+
+class AbstractUserTransport(ABC):
+    """
+    Reaches the users service for UserMicroserviceClient. Responses are plain dicts
+    shaped like the JSON responses of the users endpoints.
+    """
+
+    @abstractmethod
+    def get_user_connections(self, event, username: str) -> dict:
+        pass
+
+    @abstractmethod
+    def get_user_scores(self, event, username: str) -> list[dict]:
+        pass
+
+    @abstractmethod
+    def write_score(self, event, username: str, location_riddle_id: str, score: int):
+        pass
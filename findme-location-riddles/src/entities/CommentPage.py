@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+from .Comment import Comment
+
+
+class CommentPage(BaseModel):
+    comments: List[Comment] = []
+    cursor: Optional[str] = None
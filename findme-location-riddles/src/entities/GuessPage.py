@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+from .Guess import Guess
+
+
+class GuessPage(BaseModel):
+    guesses: List[Guess] = []
+    cursor: Optional[str] = None
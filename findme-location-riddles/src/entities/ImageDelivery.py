@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+class ImageDelivery(Enum):
+    # image inlined as base64 string into image_base64 (legacy clients)
+    BASE64 = "base64"
+    # short-lived presigned GET url (or CDN url) in image_url
+    URL = "url"
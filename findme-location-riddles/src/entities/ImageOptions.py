@@ -0,0 +1,11 @@
+from pydantic import BaseModel, ConfigDict
+
+from .ImageDelivery import ImageDelivery
+from .ImageSize import ImageSize
+
+
+class ImageOptions(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    delivery: ImageDelivery = ImageDelivery.BASE64
+    size: ImageSize = ImageSize.FULL
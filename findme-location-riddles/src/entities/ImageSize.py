@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+class ImageSize(Enum):
+    THUMBNAIL = "thumbnail"
+    MEDIUM = "medium"
+    # the image as uploaded by the user
+    FULL = "full"
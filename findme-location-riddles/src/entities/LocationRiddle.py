@@ -1,11 +1,12 @@
 from datetime import datetime
 from decimal import Decimal
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional
 
 from .Coordinate import Coordinate
 from .Comment import Comment
 from .Guess import Guess
+from .ImageSize import ImageSize
 from .Rating import Rating
 
 
@@ -13,32 +14,61 @@ class LocationRiddle(BaseModel):
     location_riddle_id: str
     username: str
     location: Coordinate
+    # embedded only on location riddles not yet migrated by
+    # tools/migrate_interactions.py, otherwise stored as separate items in
+    # locationRiddleInteractionTable
     ratings: List[Rating] = []
     comments: List[Comment] = []
     guesses: List[Guess] = []
     arenas: List[str] = []
-    created_at: int = int(datetime.now().timestamp())
+    # evaluated per location riddle, a default evaluated once would give every riddle of
+    # a container one timestamp
+    created_at: int = Field(default_factory=lambda: int(datetime.now().timestamp()))
     average_rating: Optional[float] = None
     is_rated_by_user: Optional[bool] = None
+    image_sizes: List[str] = [ImageSize.FULL.value]
+    # maintained atomically together with the interaction items, the embedded lists are
+    # not included until tools/migrate_interactions.py adds them, see get_guess_count
+    rating_sum: int = 0
+    rating_count: int = 0
+    guess_count: int = 0
+    comment_count: int = 0
+    # set per requesting user from the interaction items, see LocationRiddlesService
+    is_guessed_by_user: Optional[bool] = None
 
     def __init__(self, **data):
         super().__init__(**data)
-        if self.ratings and isinstance(self.ratings[0], Rating):
-            self.average_rating = sum(rating.rating for rating in self.ratings) / len(
-                self.ratings
-            )
+        # a location riddle rated after the counters were introduced can still have
+        # embedded ratings
+        rating_count = self.rating_count + len(self.ratings)
+        if rating_count:
+            self.average_rating = (
+                self.rating_sum + sum(rating.rating for rating in self.ratings)
+            ) / rating_count
+
+    def get_guess_count(self) -> int:
+        # the stored counters stay unchanged, reading the location riddle again does not
+        # count twice
+        return self.guess_count + len(self.guesses)
+
+    def get_comment_count(self) -> int:
+        return self.comment_count + len(self.comments)
 
     def to_dto(self, username: str):
-        self.is_rated_by_user = any(
+        # the flags set by the service are combined with the embedded lists without
+        # storing the result, the same location riddle can be projected for several
+        # users
+        is_rated_by_user = bool(self.is_rated_by_user) or any(
             rating.username == username for rating in self.ratings
         )
         # creates a solved or regular LocationRiddleDTO object based on the user that is requesting the data
         if (
-            any(guess.username == username for guess in self.guesses)
+            self.is_guessed_by_user
+            or any(guess.username == username for guess in self.guesses)
             or self.username == username
         ):
-            return SolvedLocationRiddleDTO(**self.dict())
-        return LocationRiddleDTO(**self.dict())
+            return SolvedLocationRiddleDTO.from_location_riddle(self, is_rated_by_user)
+        return LocationRiddleDTO.from_location_riddle(self, is_rated_by_user)
 
 
 class SolvedLocationRiddleDTO(BaseModel):
@@ -51,7 +81,11 @@ class SolvedLocationRiddleDTO(BaseModel):
     is_rated_by_user: bool
     created_at: int = int(datetime.now().timestamp())
     average_rating: Optional[float] = None
+    guess_count: int = 0
+    comment_count: int = 0
+    image_sizes: List[str] = [ImageSize.FULL.value]
     image_base64: Optional[str] = None
+    image_url: Optional[str] = None
 
     def __init__(self, **data):
         location_riddle = LocationRiddle(**data)
@@ -65,6 +99,30 @@ class SolvedLocationRiddleDTO(BaseModel):
             is_rated_by_user=location_riddle.is_rated_by_user,
             created_at=location_riddle.created_at,
             average_rating=location_riddle.average_rating,
+            guess_count=location_riddle.get_guess_count(),
+            comment_count=location_riddle.get_comment_count(),
+            image_sizes=location_riddle.image_sizes,
+        )
+
+    @classmethod
+    def from_location_riddle(
+        cls, location_riddle: LocationRiddle, is_rated_by_user: bool
+    ) -> "SolvedLocationRiddleDTO":
+        # the fields of location_riddle are already validated, they are projected
+        # without validating them again
+        return cls.model_construct(
+            solved=True,
+            location_riddle_id=location_riddle.location_riddle_id,
+            username=location_riddle.username,
+            location=location_riddle.location,
+            comments=location_riddle.comments,
+            guesses=location_riddle.guesses,
+            is_rated_by_user=is_rated_by_user,
+            created_at=location_riddle.created_at,
+            average_rating=location_riddle.average_rating,
+            guess_count=location_riddle.get_guess_count(),
+            comment_count=location_riddle.get_comment_count(),
+            image_sizes=location_riddle.image_sizes,
         )
 
 
@@ -76,7 +134,10 @@ class LocationRiddleDTO(BaseModel):
     is_rated_by_user: bool
     created_at: int = int(datetime.now().timestamp())
     average_rating: Optional[float] = None
+    comment_count: int = 0
+    image_sizes: List[str] = [ImageSize.FULL.value]
     image_base64: Optional[str] = None
+    image_url: Optional[str] = None
 
     def __init__(self, **data):
         location_riddle = LocationRiddle(**data)
@@ -88,4 +149,24 @@ class LocationRiddleDTO(BaseModel):
             is_rated_by_user=location_riddle.is_rated_by_user,
             created_at=location_riddle.created_at,
             average_rating=location_riddle.average_rating,
+            comment_count=location_riddle.get_comment_count(),
+            image_sizes=location_riddle.image_sizes,
+        )
+
+    @classmethod
+    def from_location_riddle(
+        cls, location_riddle: LocationRiddle, is_rated_by_user: bool
+    ) -> "LocationRiddleDTO":
+        # the fields of location_riddle are already validated, they are projected
+        # without validating them again
+        return cls.model_construct(
+            solved=False,
+            location_riddle_id=location_riddle.location_riddle_id,
+            username=location_riddle.username,
+            comments=location_riddle.comments,
+            is_rated_by_user=is_rated_by_user,
+            created_at=location_riddle.created_at,
+            average_rating=location_riddle.average_rating,
+            comment_count=location_riddle.get_comment_count(),
+            image_sizes=location_riddle.image_sizes,
         )
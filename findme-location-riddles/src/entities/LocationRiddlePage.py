@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+from typing import List, Optional, Union
+
+from .LocationRiddle import LocationRiddleDTO, SolvedLocationRiddleDTO
+
+
+class LocationRiddlePage(BaseModel):
+    location_riddles: List[Union[SolvedLocationRiddleDTO, LocationRiddleDTO]] = []
+    cursor: Optional[str] = None
@@ -0,0 +1,9 @@
+from enum import Enum
+
+
+class ScoringMode(Enum):
+    # euclidean distance of the Web Mercator coordinates, distorted away from the
+    # equator
+    LEGACY = "legacy"
+    # great circle distance on the WGS84 mean radius
+    HAVERSINE = "haversine"
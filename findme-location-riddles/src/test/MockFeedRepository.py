@@ -0,0 +1,49 @@
+from ..Cursor import Cursor
+from ..base.AbstractFeedRepository import AbstractFeedRepository
+from ..entities.LocationRiddle import LocationRiddle
+
+
+class MockFeedRepository(AbstractFeedRepository):
+    def __init__(self):
+        self.feeds = {}
+
+    def push_location_riddle_to_feeds(
+        self, usernames: list[str], location_riddle: LocationRiddle
+    ):
+        for username in usernames:
+            self.feeds.setdefault(username, []).append(location_riddle)
+
+    def push_location_riddles_to_feed(
+        self, username: str, location_riddles: list[LocationRiddle]
+    ):
+        feed = self.feeds.setdefault(username, [])
+        feed_ids = {location_riddle.location_riddle_id for location_riddle in feed}
+        feed.extend(
+            location_riddle
+            for location_riddle in location_riddles
+            if location_riddle.location_riddle_id not in feed_ids
+        )
+
+    def remove_author_from_feed(self, username: str, author: str):
+        self.feeds[username] = [
+            location_riddle
+            for location_riddle in self.feeds.get(username, [])
+            if location_riddle.username != author
+        ]
+
+    def get_feed_location_riddle_ids(
+        self, username: str, limit: int, cursor: str = None
+    ):
+        feed = sorted(
+            self.feeds.get(username, []),
+            key=lambda location_riddle: location_riddle.created_at,
+            reverse=True,
+        )
+        start = Cursor.decode_offset(cursor)
+        next_cursor = (
+            Cursor.encode_offset(start + limit) if start + limit < len(feed) else None
+        )
+        return [
+            location_riddle.location_riddle_id
+            for location_riddle in feed[start : start + limit]
+        ], next_cursor
@@ -5,11 +5,22 @@ class MockImageBucketRepository(AbstractImageBucketRepository):
     def __init__(self):
         self.mock_data = "mock_image_base64"
 
-    def post_image_to_s3(self, image_base64: str, key: str):
+    def post_image_to_s3(
+        self, image_base64: str, key: str, derivative_keys: dict = None
+    ):
         return {"message": "Mock image upload successful"}
 
     def get_image_from_s3(self, key: str):
         return self.mock_data
 
+    def get_images_from_s3(self, keys: list[str]):
+        return [self.mock_data for _ in keys]
+
+    def get_image_url(self, key: str):
+        return f"https://mock-bucket/{key}"
+
     def delete_image_from_s3(self, key: str):
         return {"message": "Mock image delete successful"}
+
+    def delete_images_from_s3(self, keys: list[str]):
+        return {"message": "Mock images delete successful"}
@@ -1,3 +1,7 @@
+from aws_lambda_powertools.event_handler.exceptions import BadRequestError
+
+from ..Cursor import Cursor
+from ..Geohash import Geohash, GEO_INDEX_PRECISION
 from ..entities.Coordinate import Coordinate
 from ..base.AbstractLocationRiddlesRepository import AbstractLocationRiddlesRepository
 from ..entities.Comment import Comment
@@ -16,12 +20,37 @@ class MockLocationRiddlesRepository(AbstractLocationRiddlesRepository):
                 arenas=["mock_arena"],
             )
         ]
+        self.interactions = {}
 
     def write_location_riddle_to_db(self, location_riddle: LocationRiddle):
         self.mock_data.append(location_riddle)
 
     def get_all_location_riddles_by_username(self, username: str):
-        return [mock_data for mock_data in self.mock_data if mock_data.username == username]
+        return [
+            mock_data for mock_data in self.mock_data if mock_data.username == username
+        ]
+
+    def get_location_riddles_by_username_page(
+        self,
+        username: str,
+        limit: int,
+        cursor: str = None,
+        since: int = None,
+        before: int = None,
+    ):
+        location_riddles = sorted(
+            (
+                location_riddle
+                for location_riddle in self.get_all_location_riddles_by_username(
+                    username
+                )
+                if (since is None or location_riddle.created_at > since)
+                and (before is None or location_riddle.created_at <= before)
+            ),
+            key=lambda location_riddle: location_riddle.created_at,
+            reverse=True,
+        )
+        return MockLocationRiddlesRepository.__get_page(location_riddles, limit, cursor)
 
     def get_location_riddle_by_location_riddle_id_from_db(
         self, location_riddle_id: str
@@ -31,35 +60,163 @@ class MockLocationRiddlesRepository(AbstractLocationRiddlesRepository):
                 return mock_data
         raise Exception("Location riddle not found")
 
+    def get_location_riddles_by_ids(self, location_riddle_ids: list[str]):
+        location_riddles_by_id = {
+            mock_data.location_riddle_id: mock_data for mock_data in self.mock_data
+        }
+        return [
+            location_riddles_by_id[location_riddle_id]
+            for location_riddle_id in location_riddle_ids
+            if location_riddle_id in location_riddles_by_id
+        ]
+
     def get_all_location_riddles_containing_arena(self, arena: str, username: str):
-        return [mock_data for mock_data in self.mock_data if arena in mock_data.arenas and mock_data.username != username]
+        return [
+            mock_data
+            for mock_data in self.mock_data
+            if arena in mock_data.arenas and mock_data.username != username
+        ]
+
+    def get_location_riddles_containing_arena_page(
+        self, arena: str, username: str, limit: int, cursor: str = None
+    ):
+        location_riddles = sorted(
+            self.get_all_location_riddles_containing_arena(arena, username),
+            key=lambda location_riddle: location_riddle.created_at,
+            reverse=True,
+        )
+        return MockLocationRiddlesRepository.__get_page(location_riddles, limit, cursor)
+
+    def get_geo_index_entries_in_cell(self, cell: str):
+        entries = []
+        for mock_data in self.mock_data:
+            lat, lon = Geohash.to_lat_lon(mock_data.location.coordinate)
+            if Geohash.encode(lat, lon, GEO_INDEX_PRECISION).startswith(cell):
+                entries.append(
+                    {
+                        "location_riddle_id": mock_data.location_riddle_id,
+                        "username": mock_data.username,
+                        "lat": lat,
+                        "lon": lon,
+                    }
+                )
+        return entries
 
     def update_location_riddle_rating_in_db(
         self, location_riddle_id: str, rating: Rating
     ):
-        mock_data = self.get_location_riddle_by_location_riddle_id_from_db(location_riddle_id).dict()
-        mock_data["ratings"].append(rating)
-        updated_location_riddle = LocationRiddle(**mock_data)
-        self.mock_data = [updated_location_riddle]
-        return updated_location_riddle
+        return self.__write_interaction(
+            location_riddle_id,
+            "ratings",
+            rating,
+            {"rating_sum": rating.rating, "rating_count": 1},
+        )
 
     def update_location_riddle_comments_in_db(
         self, location_riddle_id: str, comment: Comment
     ):
-        mock_data = self.get_location_riddle_by_location_riddle_id_from_db(location_riddle_id).dict()
-        mock_data["comments"].append(comment)
-        updated_location_riddle = LocationRiddle(**mock_data)
-        self.mock_data = [updated_location_riddle]
-        return updated_location_riddle
+        return self.__write_interaction(
+            location_riddle_id, "comments", comment, {"comment_count": 1}
+        )
 
     def update_location_riddle_guesses_in_db(
         self, location_riddle_id: str, guess: Guess
     ):
-        mock_data = self.get_location_riddle_by_location_riddle_id_from_db(location_riddle_id).dict()
-        mock_data["guesses"].append(guess)
+        return self.__write_interaction(
+            location_riddle_id, "guesses", guess, {"guess_count": 1}
+        )
+
+    def get_guessed_and_rated_location_riddle_ids(
+        self, location_riddle_ids: list[str], username: str
+    ):
+        # like the interaction items, only interactions written through the repository
+        # are found, embedded ones are checked by LocationRiddle.to_dto
+        return {
+            location_riddle_id
+            for location_riddle_id in location_riddle_ids
+            if any(
+                guess.username == username
+                for guess in self.__get_interactions(location_riddle_id, "guesses")
+            )
+        }, {
+            location_riddle_id
+            for location_riddle_id in location_riddle_ids
+            if any(
+                rating.username == username
+                for rating in self.__get_interactions(location_riddle_id, "ratings")
+            )
+        }
+
+    def get_comments_page(
+        self, location_riddle_id: str, limit: int, cursor: str = None
+    ):
+        comments = list(
+            reversed(self.__get_interactions(location_riddle_id, "comments"))
+        )
+        return MockLocationRiddlesRepository.__get_page(comments, limit, cursor)
+
+    def get_guesses_page(self, location_riddle_id: str, limit: int, cursor: str = None):
+        guesses = sorted(
+            self.__get_interactions(location_riddle_id, "guesses"),
+            key=lambda guess: guess.username,
+        )
+        return MockLocationRiddlesRepository.__get_page(guesses, limit, cursor)
+
+    def __get_interactions(self, location_riddle_id: str, attribute: str) -> list:
+        return self.interactions.get(location_riddle_id, {}).get(attribute, [])
+
+    def __write_interaction(
+        self, location_riddle_id: str, attribute: str, interaction, counters: dict
+    ):
+        # interactions are kept apart from the embedded lists like in
+        # locationRiddleInteractionTable, the counters only cover them
+        mock_data = self.get_location_riddle_by_location_riddle_id_from_db(
+            location_riddle_id
+        ).dict()
+        if attribute != "comments":
+            if mock_data["username"] == interaction.username:
+                raise BadRequestError(
+                    f"User cannot add {attribute} to their own location riddle"
+                )
+            if any(
+                entry["username"] == interaction.username
+                for entry in mock_data[attribute]
+            ) or any(
+                entry.username == interaction.username
+                for entry in self.__get_interactions(location_riddle_id, attribute)
+            ):
+                raise BadRequestError(
+                    f"User has already added {attribute} to this location riddle"
+                )
+        self.interactions.setdefault(location_riddle_id, {}).setdefault(
+            attribute, []
+        ).append(interaction)
+        for counter, increment in counters.items():
+            mock_data[counter] += increment
+        mock_data["is_guessed_by_user"], mock_data["is_rated_by_user"] = (
+            location_riddle_id in ids
+            for ids in self.get_guessed_and_rated_location_riddle_ids(
+                [location_riddle_id], interaction.username
+            )
+        )
         updated_location_riddle = LocationRiddle(**mock_data)
-        self.mock_data = [updated_location_riddle]
+        self.mock_data = [
+            updated_location_riddle
+            if location_riddle.location_riddle_id == location_riddle_id
+            else location_riddle
+            for location_riddle in self.mock_data
+        ]
         return updated_location_riddle
 
+    @staticmethod
+    def __get_page(entries: list, limit: int, cursor: str = None):
+        start = Cursor.decode_offset(cursor)
+        next_cursor = (
+            Cursor.encode_offset(start + limit)
+            if start + limit < len(entries)
+            else None
+        )
+        return entries[start : start + limit], next_cursor
+
     def delete_location_riddle_from_db(self, location_riddle_id: str):
         return {"message": "Mock delete successful"}
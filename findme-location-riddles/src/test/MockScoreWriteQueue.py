@@ -0,0 +1,15 @@
+from ..base.AbstractScoreWriteQueue import AbstractScoreWriteQueue
+
+
+class MockScoreWriteQueue(AbstractScoreWriteQueue):
+    def __init__(self):
+        self.messages = []
+
+    def enqueue_score(self, username: str, location_riddle_id: str, score: int):
+        self.messages.append(
+            {
+                "username": username,
+                "location_riddle_id": location_riddle_id,
+                "score": score,
+            }
+        )
@@ -0,0 +1,111 @@
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+import boto3
+from moto import mock_aws
+
+from ..src.LocationRiddlesRepository import LocationRiddlesRepository
+
+# the tools are run from the findme-location-riddles directory and import src as a
+# top-level package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tools import backfill_participant_sets  # noqa: E402
+from tools.backfill_arena_index import scan_location_riddles  # noqa: E402
+
+
+@mock_aws
+class TestBackfillParticipantSets(unittest.TestCase):
+    def setUp(self):
+        boto3.client("dynamodb", region_name="eu-central-2").create_table(
+            TableName="locationRiddleTable",
+            AttributeDefinitions=[
+                {"AttributeName": "location_riddle_id", "AttributeType": "S"}
+            ],
+            KeySchema=[{"AttributeName": "location_riddle_id", "KeyType": "HASH"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        self.location_riddle_repository = LocationRiddlesRepository()
+        self.table = self.location_riddle_repository.table
+        self.table.put_item(
+            Item={
+                "location_riddle_id": "mock_location_riddle_id",
+                "username": "mock_username",
+                "location": {"coordinate": [0, 0]},
+                "guesses": [
+                    {"username": username, "guess": {"coordinate": [1, 1]}}
+                    for username in ["mock_username2", "mock_username3"]
+                ],
+                "ratings": [{"username": "mock_username2", "rating": 4}],
+            }
+        )
+        # migrated, the interactions are items in locationRiddleInteractionTable
+        self.table.put_item(
+            Item={
+                "location_riddle_id": "mock_location_riddle_id2",
+                "username": "mock_username",
+                "location": {"coordinate": [0, 0]},
+                "guess_count": 1,
+            }
+        )
+
+    def __get_item(self, location_riddle_id):
+        return self.table.get_item(Key={"location_riddle_id": location_riddle_id}).get(
+            "Item"
+        )
+
+    def test_backfills_sets_of_embedded_lists(self):
+        for _ in range(2):
+            # a rerun adds the same usernames to the sets again
+            self.assertEqual(
+                backfill_participant_sets.backfill_participant_sets(
+                    self.location_riddle_repository
+                ),
+                1,
+            )
+            item = self.__get_item("mock_location_riddle_id")
+            self.assertEqual(item["guessed_by"], {"mock_username2", "mock_username3"})
+            self.assertEqual(item["rated_by"], {"mock_username2"})
+        self.assertNotIn("guessed_by", self.__get_item("mock_location_riddle_id2"))
+
+    def test_location_riddle_changed_since_the_scan_is_skipped(self):
+        self.table.put_item(
+            Item={
+                "location_riddle_id": "mock_location_riddle_id3",
+                "username": "mock_username",
+                "location": {"coordinate": [0, 0]},
+                "guesses": [
+                    {"username": "mock_username2", "guess": {"coordinate": [1, 1]}}
+                ],
+            }
+        )
+        location_riddles = list(scan_location_riddles(self.location_riddle_repository))
+        # migrated and deleted while the backfill is running
+        self.table.update_item(
+            Key={"location_riddle_id": "mock_location_riddle_id"},
+            UpdateExpression="ADD guess_count :guess_count REMOVE guesses, ratings",
+            ExpressionAttributeValues={":guess_count": 2},
+        )
+        self.table.delete_item(Key={"location_riddle_id": "mock_location_riddle_id3"})
+
+        with patch.object(
+            backfill_participant_sets,
+            "scan_location_riddles",
+            return_value=location_riddles,
+        ):
+            self.assertEqual(
+                backfill_participant_sets.backfill_participant_sets(
+                    self.location_riddle_repository
+                ),
+                0,
+            )
+
+        item = self.__get_item("mock_location_riddle_id")
+        self.assertNotIn("guessed_by", item)
+        self.assertNotIn("rated_by", item)
+        self.assertIsNone(self.__get_item("mock_location_riddle_id3"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import base64
+import json
+import unittest
+from decimal import Decimal
+
+from aws_lambda_powertools.event_handler.exceptions import BadRequestError
+
+from ..src.Cursor import Cursor
+
+
+def encode_json(value) -> str:
+    return base64.urlsafe_b64encode(json.dumps(value).encode("utf-8")).decode("utf-8")
+
+
+class TestCursor(unittest.TestCase):
+    def test_round_trip(self):
+        position = {"location_riddle_id": "mock_location_riddle_id", "sort_key": "a"}
+        self.assertEqual(
+            Cursor.decode(Cursor.encode(position), ["location_riddle_id", "sort_key"]),
+            position,
+        )
+        # numbers of DynamoDB keys are Decimals
+        self.assertEqual(
+            Cursor.decode(Cursor.encode({"created_at": Decimal(1)})),
+            {"created_at": 1},
+        )
+        self.assertIsNone(Cursor.encode(None))
+        self.assertIsNone(Cursor.decode(None))
+        self.assertEqual(Cursor.decode_offset(Cursor.encode_offset(3)), 3)
+        self.assertEqual(Cursor.decode_offset(None), 0)
+
+    def test_invalid_cursor(self):
+        for cursor in [
+            "not base64!",
+            encode_json("1")[:-1],
+            encode_json("1"),
+            encode_json(1),
+            encode_json([]),
+            encode_json(None),
+            encode_json({"location_riddle_id": ["mock_location_riddle_id"]}),
+            encode_json({"location_riddle_id": True}),
+            encode_json({"location_riddle_id": 1.5}),
+        ]:
+            with self.assertRaises(BadRequestError, msg=cursor):
+                Cursor.decode(cursor)
+
+    def test_cursor_with_other_keys(self):
+        for position in [
+            {"location_riddle_id": "mock_location_riddle_id"},
+            {"location_riddle_id": "mock_location_riddle_id", "sort_key": "a", "b": 1},
+        ]:
+            with self.assertRaises(BadRequestError):
+                Cursor.decode(
+                    Cursor.encode(position), ["location_riddle_id", "sort_key"]
+                )
+
+    def test_invalid_offset(self):
+        for cursor in [
+            Cursor.encode_offset(-1),
+            Cursor.encode({"offset": "1"}),
+            Cursor.encode({"location_riddle_id": "mock_location_riddle_id"}),
+        ]:
+            with self.assertRaises(BadRequestError):
+                Cursor.decode_offset(cursor)
+
+
+if __name__ == "__main__":
+    unittest.main()
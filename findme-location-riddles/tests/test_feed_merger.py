@@ -0,0 +1,132 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from ..src.FeedMerger import FeedMerger
+from ..src.entities.Coordinate import Coordinate
+from ..src.entities.LocationRiddle import LocationRiddle
+from ..src.test.MockLocationRiddlesRepository import MockLocationRiddlesRepository
+
+
+class CountingLocationRiddlesRepository(MockLocationRiddlesRepository):
+    def __init__(self):
+        super().__init__()
+        self.mock_data = []
+        self.read_location_riddles = 0
+
+    def get_location_riddles_by_username_page(
+        self, username, limit, cursor=None, since=None, before=None
+    ):
+        location_riddles, next_cursor = super().get_location_riddles_by_username_page(
+            username, limit, cursor, since, before
+        )
+        self.read_location_riddles += len(location_riddles)
+        return location_riddles, next_cursor
+
+
+class TestFeedMerger(unittest.TestCase):
+    def setUp(self):
+        self.location_riddle_repository = CountingLocationRiddlesRepository()
+        self.feed_merger = FeedMerger(
+            self.location_riddle_repository, ThreadPoolExecutor(max_workers=4)
+        )
+        # all users post in the same second at some created_at, e.g. 0, 30 and 90
+        for username, step in [
+            ("mock_username", 3),
+            ("mock_username2", 5),
+            ("mock_username3", 10),
+        ]:
+            for created_at in range(0, 100, step):
+                self.location_riddle_repository.write_location_riddle_to_db(
+                    LocationRiddle(
+                        location_riddle_id=f"{username}_{created_at}",
+                        username=username,
+                        location=Coordinate(coordinate=[0.0, 0.0]),
+                        created_at=created_at,
+                    )
+                )
+        self.usernames = ["mock_username", "mock_username2", "mock_username3"]
+
+    def test_get_page_merges_streams_in_feed_order(self):
+        expected_ids = [
+            location_riddle.location_riddle_id
+            for location_riddle in sorted(
+                self.location_riddle_repository.mock_data,
+                key=lambda location_riddle: (
+                    -location_riddle.created_at,
+                    location_riddle.location_riddle_id,
+                ),
+            )
+        ]
+
+        location_riddle_ids = []
+        cursor = None
+        while True:
+            location_riddles, cursor = self.feed_merger.get_page(
+                self.usernames, 7, cursor
+            )
+            self.assertLessEqual(len(location_riddles), 7)
+            location_riddle_ids.extend(
+                location_riddle.location_riddle_id
+                for location_riddle in location_riddles
+            )
+            if cursor is None:
+                break
+
+        self.assertEqual(location_riddle_ids, expected_ids)
+
+    def test_get_page_orders_ties_split_across_pages(self):
+        # the index returns location riddles of the same second in no particular order
+        for suffix in ["e", "a", "g", "c", "f", "b", "d"]:
+            self.location_riddle_repository.write_location_riddle_to_db(
+                LocationRiddle(
+                    location_riddle_id=f"mock_location_riddle_{suffix}",
+                    username="mock_username4",
+                    location=Coordinate(coordinate=[0.0, 0.0]),
+                    created_at=50,
+                )
+            )
+
+        location_riddle_ids = []
+        cursor = None
+        while True:
+            location_riddles, cursor = self.feed_merger.get_page(
+                ["mock_username4"], 3, cursor
+            )
+            location_riddle_ids.extend(
+                location_riddle.location_riddle_id
+                for location_riddle in location_riddles
+            )
+            if cursor is None:
+                break
+
+        self.assertEqual(
+            location_riddle_ids,
+            [f"mock_location_riddle_{suffix}" for suffix in "abcdefg"],
+        )
+
+    def test_get_page_reads_scale_with_limit(self):
+        location_riddles, cursor = self.feed_merger.get_page(self.usernames, 5)
+
+        self.assertEqual(
+            [
+                location_riddle.location_riddle_id
+                for location_riddle in location_riddles
+            ],
+            [
+                "mock_username_99",
+                "mock_username_96",
+                "mock_username2_95",
+                "mock_username_93",
+                "mock_username2_90",
+            ],
+        )
+        self.assertIsNotNone(cursor)
+        # at most one page of limit location riddles per followee
+        self.assertLessEqual(
+            self.location_riddle_repository.read_location_riddles,
+            5 * len(self.usernames),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
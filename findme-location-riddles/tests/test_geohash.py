@@ -0,0 +1,55 @@
+import unittest
+
+from ..src.Geohash import Geohash
+
+
+class TestGeohash(unittest.TestCase):
+    def setUp(self):
+        self.location_zurich = (
+            950773.5032378712,
+            6003947.738097198,
+        )  # Zurich Hauptbahnhof
+        self.location_st_gallen = (
+            1043079.6590545248,
+            6011475.68947705,
+        )  # St. Gallen Hauptbahnhof
+
+    def test_encode(self):
+        self.assertEqual(Geohash.encode(57.64911, 10.40744, 11), "u4pruydqqvj")
+        self.assertEqual(Geohash.encode(57.64911, 10.40744, 4), "u4pr")
+
+    def test_to_lat_lon(self):
+        lat, lon = Geohash.to_lat_lon(self.location_zurich)
+        self.assertAlmostEqual(lat, 47.3782, delta=0.001)
+        self.assertAlmostEqual(lon, 8.5409, delta=0.001)
+
+    def test_haversine_distance_zurich_to_st_gallen(self):
+        distance = Geohash.haversine_distance(
+            *Geohash.to_lat_lon(self.location_zurich),
+            *Geohash.to_lat_lon(self.location_st_gallen),
+        )
+        self.assertAlmostEqual(distance, 62600, delta=1000)
+
+    def test_covering_cells_contain_points_within_radius(self):
+        lat, lon = Geohash.to_lat_lon(self.location_zurich)
+        cells = Geohash.covering_cells(lat, lon, 1000, 4, 16)
+
+        self.assertLessEqual(len(cells), 16)
+        # points on the circle in every direction are covered by one of the cells
+        for delta_lat, delta_lon in [
+            (0.0089, 0),
+            (-0.0089, 0),
+            (0, 0.0132),
+            (0, -0.0132),
+        ]:
+            geohash = Geohash.encode(lat + delta_lat, lon + delta_lon, 9)
+            self.assertTrue(any(geohash.startswith(cell) for cell in cells))
+
+    def test_covering_cells_keep_the_partition_precision(self):
+        cells = Geohash.covering_cells(47.3782, 8.5409, 50000, 4, 16)
+
+        self.assertTrue(all(len(cell) == 4 for cell in cells))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+import base64
+import io
+import os
+import unittest
+from unittest.mock import patch
+
+import boto3
+from moto import mock_aws
+from PIL import Image
+
+from ..src.ImageBucketRepository import ImageBucketRepository
+from ..src.ImageCache import ImageCache
+from ..src.entities.ImageSize import ImageSize
+
+
+@mock_aws
+class TestImageBucketRepository(unittest.TestCase):
+    def setUp(self):
+        self.s3 = boto3.client("s3", region_name="eu-central-2")
+        self.s3.create_bucket(
+            Bucket="ase-findme-image-upload-bucket",
+            CreateBucketConfiguration={"LocationConstraint": "eu-central-2"},
+        )
+        self.image_bucket_repository = ImageBucketRepository()
+
+    def test_get_image_from_s3(self):
+        image_base64 = base64.b64encode(b"image").decode("utf-8")
+        self.image_bucket_repository.post_image_to_s3(
+            image_base64, "location-riddles/1.png"
+        )
+
+        self.assertEqual(
+            self.image_bucket_repository.get_image_from_s3("location-riddles/1.png"),
+            image_base64,
+        )
+
+    def test_post_image_to_s3_streams_large_images(self):
+        image_data = os.urandom(9 * 1024 * 1024 + 3)
+        image_base64 = base64.encodebytes(image_data).decode(
+            "utf-8"
+        )  # line breaks every 76 characters
+
+        self.image_bucket_repository.post_image_to_s3(
+            image_base64, "location-riddles/1.png"
+        )
+
+        stored_image = self.s3.get_object(
+            Bucket="ase-findme-image-upload-bucket", Key="location-riddles/1.png"
+        )
+        self.assertEqual(stored_image["Body"].read(), image_data)
+        self.assertEqual(stored_image["ContentType"], "image/png")
+
+    def test_post_image_to_s3_with_derivatives(self):
+        image = io.BytesIO()
+        Image.new("RGB", (2000, 1000), (255, 0, 0)).save(image, format="PNG")
+        derivative_keys = {
+            ImageSize.THUMBNAIL: "location-riddles/1_thumbnail.webp",
+            ImageSize.MEDIUM: "location-riddles/1_medium.webp",
+        }
+
+        response = self.image_bucket_repository.post_image_to_s3(
+            base64.b64encode(image.getvalue()).decode("utf-8"),
+            "location-riddles/1.png",
+            derivative_keys,
+        )
+
+        self.assertCountEqual(response["image_sizes"], ["full", "thumbnail", "medium"])
+        thumbnail = self.s3.get_object(
+            Bucket="ase-findme-image-upload-bucket",
+            Key="location-riddles/1_thumbnail.webp",
+        )
+        self.assertEqual(thumbnail["ContentType"], "image/webp")
+        self.assertEqual(Image.open(thumbnail["Body"]).size, (320, 160))
+
+        self.image_bucket_repository.delete_images_from_s3(
+            ["location-riddles/1.png", *derivative_keys.values()]
+        )
+        self.assertEqual(
+            self.s3.list_objects_v2(Bucket="ase-findme-image-upload-bucket")[
+                "KeyCount"
+            ],
+            0,
+        )
+
+    def test_post_image_to_s3_stores_undecodable_image_in_full_size(self):
+        response = self.image_bucket_repository.post_image_to_s3(
+            "aW1hZ2U=",
+            "location-riddles/1.png",
+            {ImageSize.THUMBNAIL: "location-riddles/1_thumbnail.webp"},
+        )
+
+        self.assertEqual(response["image_sizes"], ["full"])
+
+    def test_post_image_to_s3_stores_oversized_image_in_full_size(self):
+        # Pillow warns above MAX_IMAGE_PIXELS and fails above twice of it
+        for size in [(12, 12), (20, 20)]:
+            image = io.BytesIO()
+            Image.new("RGB", size, (255, 0, 0)).save(image, format="PNG")
+            with patch.object(Image, "MAX_IMAGE_PIXELS", 100):
+                response = self.image_bucket_repository.post_image_to_s3(
+                    base64.b64encode(image.getvalue()).decode("utf-8"),
+                    "location-riddles/1.png",
+                    {ImageSize.THUMBNAIL: "location-riddles/1_thumbnail.webp"},
+                )
+
+            self.assertEqual(response["image_sizes"], ["full"])
+            self.assertEqual(
+                self.s3.get_object(
+                    Bucket="ase-findme-image-upload-bucket",
+                    Key="location-riddles/1.png",
+                )["Body"].read(),
+                image.getvalue(),
+            )
+
+    def test_get_images_from_s3_keeps_order_and_reports_missing_images(self):
+        keys = [f"location-riddles/{i}.png" for i in range(10)]
+        for i, key in enumerate(keys):
+            if i != 3:
+                self.image_bucket_repository.post_image_to_s3(
+                    base64.b64encode(f"image{i}".encode()).decode("utf-8"), key
+                )
+
+        images = self.image_bucket_repository.get_images_from_s3(keys)
+
+        self.assertEqual(len(images), 10)
+        self.assertIsNone(images[3])
+        for i, image in enumerate(images):
+            if i != 3:
+                self.assertEqual(base64.b64decode(image), f"image{i}".encode())
+
+    def test_get_image_from_s3_cached(self):
+        image_bucket_repository = ImageBucketRepository(
+            image_cache=ImageCache(max_bytes=1024)
+        )
+        image_bucket_repository.post_image_to_s3("aW1hZ2U=", "location-riddles/1.png")
+        image_bucket_repository.get_image_from_s3("location-riddles/1.png")
+        self.s3.delete_object(
+            Bucket="ase-findme-image-upload-bucket", Key="location-riddles/1.png"
+        )
+
+        # served from the cache although the object is gone
+        self.assertEqual(
+            image_bucket_repository.get_image_from_s3("location-riddles/1.png"),
+            "aW1hZ2U=",
+        )
+        self.assertEqual(
+            image_bucket_repository.image_cache.get_statistics()["hits"], 1
+        )
+
+        image_bucket_repository.delete_image_from_s3("location-riddles/1.png")
+        self.assertEqual(
+            image_bucket_repository.get_images_from_s3(["location-riddles/1.png"]),
+            [None],
+        )
+
+    def test_delete_image_from_s3(self):
+        self.image_bucket_repository.post_image_to_s3(
+            "aW1hZ2U=", "location-riddles/1.png"
+        )
+        self.image_bucket_repository.delete_image_from_s3("location-riddles/1.png")
+
+        self.assertEqual(
+            self.image_bucket_repository.get_images_from_s3(["location-riddles/1.png"]),
+            [None],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+
+from ..src.ImageCache import ImageCache
+
+
+class TestImageCache(unittest.TestCase):
+    def setUp(self):
+        self.spill_directory = tempfile.TemporaryDirectory()
+        self.image_cache = ImageCache(max_bytes=10)
+
+    def tearDown(self):
+        self.spill_directory.cleanup()
+
+    def test_get_and_put(self):
+        self.assertIsNone(self.image_cache.get("a"))
+        self.image_cache.put("a", "aaaa")
+
+        self.assertEqual(self.image_cache.get("a"), "aaaa")
+        statistics = self.image_cache.get_statistics()
+        self.assertEqual(statistics["hits"], 1)
+        self.assertEqual(statistics["misses"], 1)
+        self.assertEqual(statistics["bytes"], 4)
+
+    def test_evicts_least_recently_used_by_size(self):
+        self.image_cache.put("a", "aaaa")
+        self.image_cache.put("b", "bbbb")
+        self.image_cache.get("a")
+        self.image_cache.put("c", "cccc")
+
+        self.assertIsNone(self.image_cache.get("b"))
+        self.assertEqual(self.image_cache.get("a"), "aaaa")
+        self.assertEqual(self.image_cache.get("c"), "cccc")
+        self.assertEqual(self.image_cache.get_statistics()["evictions"], 1)
+
+    def test_does_not_cache_images_larger_than_the_cache(self):
+        self.image_cache.put("a", "a" * 11)
+
+        self.assertIsNone(self.image_cache.get("a"))
+        self.assertEqual(self.image_cache.get_statistics()["bytes"], 0)
+
+    def test_spills_evicted_images(self):
+        image_cache = ImageCache(
+            max_bytes=4, spill_directory=self.spill_directory.name, max_spill_bytes=8
+        )
+        image_cache.put("a", "aaaa")
+        image_cache.put("b", "bbbb")
+        image_cache.put("c", "cccc")
+        image_cache.put("d", "dddd")
+
+        # "a" was dropped from the spill tier to make room for "c"
+        self.assertIsNone(image_cache.get("a"))
+        self.assertEqual(image_cache.get("b"), "bbbb")
+        self.assertEqual(image_cache.get_statistics()["spill_hits"], 1)
+        self.assertEqual(len(os.listdir(self.spill_directory.name)), 2)
+
+    def test_invalidate(self):
+        image_cache = ImageCache(
+            max_bytes=4, spill_directory=self.spill_directory.name, max_spill_bytes=8
+        )
+        image_cache.put("a", "aaaa")
+        image_cache.put("b", "bbbb")
+        image_cache.invalidate("a")
+        image_cache.invalidate("b")
+
+        self.assertIsNone(image_cache.get("a"))
+        self.assertIsNone(image_cache.get("b"))
+        self.assertEqual(os.listdir(self.spill_directory.name), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+from decimal import Decimal
+
+from ..src.entities.Comment import Comment
+from ..src.entities.Coordinate import Coordinate
+from ..src.entities.Guess import Guess
+from ..src.entities.LocationRiddle import (
+    LocationRiddle,
+    LocationRiddleDTO,
+    SolvedLocationRiddleDTO,
+)
+from ..src.entities.Rating import Rating
+
+
+class TestLocationRiddle(unittest.TestCase):
+    def setUp(self):
+        self.location_riddle = LocationRiddle(
+            location_riddle_id="mock_location_riddle_id",
+            username="mock_username",
+            location=Coordinate(coordinate=[Decimal(1), Decimal(2)]),
+            guesses=[
+                Guess(
+                    username="mock_username2",
+                    guess=Coordinate(coordinate=[Decimal(3), Decimal(4)]),
+                )
+            ],
+            comments=[Comment(username="mock_username2", comment="mock_comment")],
+            ratings=[Rating(username="mock_username2", rating=4)],
+            created_at=1,
+        )
+
+    def test_to_dto_matches_validated_dto(self):
+        # the projection has to produce the same response as validating the location
+        # riddle again
+        for username, dto_class in [
+            ("mock_username2", SolvedLocationRiddleDTO),
+            ("mock_username3", LocationRiddleDTO),
+        ]:
+            location_riddle_dto = self.location_riddle.to_dto(username)
+            self.assertIsInstance(location_riddle_dto, dto_class)
+            self.assertEqual(
+                location_riddle_dto.model_dump(),
+                dto_class(
+                    **{
+                        **self.location_riddle.dict(),
+                        "is_rated_by_user": location_riddle_dto.is_rated_by_user,
+                    }
+                ).model_dump(),
+            )
+
+    def test_to_dto_is_rated_by_user(self):
+        # the result for one user must not leak into the projection for the next one
+        self.assertTrue(self.location_riddle.to_dto("mock_username2").is_rated_by_user)
+        self.assertFalse(self.location_riddle.to_dto("mock_username3").is_rated_by_user)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,25 @@
+import io
+import json
+import os
 import unittest
 from decimal import Decimal
+from unittest.mock import patch
+
+from findme_shared.NotModifiedError import NotModifiedError
 
 from ..src.LocationRiddlesService import LocationRiddlesService
+from ..src.UserMicroserviceClient import UserMicroserviceClient
+from ..src.entities.Comment import Comment
+from ..src.entities.Coordinate import Coordinate
+from ..src.entities.Guess import Guess
+from ..src.entities.ImageDelivery import ImageDelivery
+from ..src.entities.ImageOptions import ImageOptions
+from ..src.entities.ImageSize import ImageSize
+from ..src.entities.LocationRiddle import LocationRiddle
+from ..src.test.MockFeedRepository import MockFeedRepository
 from ..src.test.MockImageBucketRepository import MockImageBucketRepository
 from ..src.test.MockLocationRiddlesRepository import MockLocationRiddlesRepository
+from ..src.test.MockScoreWriteQueue import MockScoreWriteQueue
 from ..src.test.MockUserMicroserviceClient import MockUserMicroserviceClient
 
 
@@ -14,13 +30,19 @@ class TestLocationRiddleService(unittest.TestCase):
         self.location_riddle_repository = MockLocationRiddlesRepository()
         self.user_microservice_client = MockUserMicroserviceClient()
         self.location_riddles_service = LocationRiddlesService(
-            self.location_riddle_repository, self.image_bucket_repository, self.user_microservice_client
+            self.location_riddle_repository,
+            self.image_bucket_repository,
+            self.user_microservice_client,
         )
 
     def test_post_location_riddle(self):
         self.assertEqual(
             self.location_riddles_service.post_location_riddle(
-                "mock_image_base64", [45, 13], ["zurich", "parks"], "mock_username2"
+                "event",
+                "mock_image_base64",
+                [45, 13],
+                ["zurich", "parks"],
+                "mock_username2",
             ),
             {"message": "Mock image upload successful"},
         )
@@ -35,6 +57,95 @@ class TestLocationRiddleService(unittest.TestCase):
         self.assertEqual(location_riddle.comments, [])
         self.assertEqual(location_riddle.image_base64, "mock_image_base64")
 
+    def test_get_location_riddle_image_url(self):
+        location_riddle = self.location_riddles_service.get_location_riddle(
+            "mock_location_riddle_id",
+            "mock_username",
+            ImageOptions(delivery=ImageDelivery.URL),
+        )
+
+        self.assertEqual(
+            location_riddle.image_url,
+            "https://mock-bucket/location-riddles/mock_location_riddle_id.png",
+        )
+        self.assertIsNone(location_riddle.image_base64)
+
+    def test_get_location_riddle_image_size(self):
+        self.location_riddles_service.post_location_riddle(
+            "event", "mock_image_base64", [45, 13], [], "mock_username2"
+        )
+        # the mock image bucket does not create derivatives
+        location_riddle = (
+            self.location_riddle_repository.get_all_location_riddles_by_username(
+                "mock_username2"
+            )[0]
+        )
+        self.assertEqual(location_riddle.image_sizes, ["full"])
+        location_riddle.image_sizes = ["full", "thumbnail", "medium"]
+
+        image_options = ImageOptions(
+            delivery=ImageDelivery.URL, size=ImageSize.THUMBNAIL
+        )
+        location_riddle_dto = self.location_riddles_service.get_location_riddle(
+            location_riddle.location_riddle_id, "mock_username", image_options
+        )
+        self.assertEqual(
+            location_riddle_dto.image_url,
+            "https://mock-bucket/location-riddles/"
+            f"{location_riddle.location_riddle_id}_thumbnail.webp",
+        )
+
+        # falls back to the full image for location riddles without derivatives
+        location_riddle_dto = self.location_riddles_service.get_location_riddle(
+            "mock_location_riddle_id", "mock_username", image_options
+        )
+        self.assertEqual(
+            location_riddle_dto.image_url,
+            "https://mock-bucket/location-riddles/mock_location_riddle_id.png",
+        )
+
+    def test_get_location_riddle_with_etag(self):
+        location_riddle, etag = (
+            self.location_riddles_service.get_location_riddle_with_etag(
+                "mock_location_riddle_id", "mock_username2"
+            )
+        )
+        self.assertEqual(location_riddle.image_base64, "mock_image_base64")
+
+        # a matching If-None-Match is answered before the image is loaded
+        with patch.object(
+            self.image_bucket_repository, "get_image_from_s3"
+        ) as get_image_from_s3:
+            with self.assertRaises(NotModifiedError) as context:
+                self.location_riddles_service.get_location_riddle_with_etag(
+                    "mock_location_riddle_id",
+                    "mock_username2",
+                    if_none_match=f'"other", {etag.removeprefix("W/")}',
+                )
+        self.assertEqual(context.exception.etag, etag)
+        get_image_from_s3.assert_not_called()
+
+        # the etag depends on the requester, the image options and the location riddle
+        _, etag_other_user = (
+            self.location_riddles_service.get_location_riddle_with_etag(
+                "mock_location_riddle_id", "mock_username3"
+            )
+        )
+        _, etag_thumbnail = self.location_riddles_service.get_location_riddle_with_etag(
+            "mock_location_riddle_id",
+            "mock_username2",
+            ImageOptions(size=ImageSize.THUMBNAIL),
+        )
+        self.location_riddles_service.comment_location_riddle(
+            "mock_location_riddle_id", "mock_username3", "mock_comment"
+        )
+        _, etag_commented = self.location_riddles_service.get_location_riddle_with_etag(
+            "mock_location_riddle_id", "mock_username2", if_none_match=etag
+        )
+        self.assertEqual(
+            len({etag, etag_other_user, etag_thumbnail, etag_commented}), 4
+        )
+
     def test_get_location_riddles_for_user(self):
         location_riddles = self.location_riddles_service.get_location_riddles_for_user(
             "mock_username", "mock_requester_username"
@@ -49,8 +160,10 @@ class TestLocationRiddleService(unittest.TestCase):
         self.assertEqual(location_riddle.image_base64, "mock_image_base64")
 
     def test_get_solved_location_riddles_for_user(self):
-        location_riddles = self.location_riddles_service.get_solved_location_riddles_for_user(
-            "event", "mock_username", "mock_username"
+        location_riddles = (
+            self.location_riddles_service.get_solved_location_riddles_for_user(
+                "event", "mock_username", "mock_username"
+            )
         )
         location_riddle = location_riddles[0]
 
@@ -58,6 +171,57 @@ class TestLocationRiddleService(unittest.TestCase):
         self.assertEqual(location_riddle.username, "mock_username")
         self.assertEqual(location_riddle.solved, True)
 
+    def test_get_location_riddles_for_user_page(self):
+        for _ in range(3):
+            self.location_riddles_service.post_location_riddle(
+                "event", "mock_image_base64", [45, 13], [], "mock_username2"
+            )
+
+        location_riddle_ids = []
+        cursor = None
+        while True:
+            location_riddle_page = (
+                self.location_riddles_service.get_location_riddles_for_user_page(
+                    "mock_username2", "mock_username", 2, cursor
+                )
+            )
+            self.assertLessEqual(len(location_riddle_page.location_riddles), 2)
+            location_riddle_ids.extend(
+                location_riddle.location_riddle_id
+                for location_riddle in location_riddle_page.location_riddles
+            )
+            cursor = location_riddle_page.cursor
+            if cursor is None:
+                break
+        self.assertEqual(len(set(location_riddle_ids)), 3)
+
+    def test_get_solved_location_riddles_for_user_page(self):
+        location_riddle_page = (
+            self.location_riddles_service.get_solved_location_riddles_for_user_page(
+                "event", "mock_username", "mock_username", 1
+            )
+        )
+        self.assertEqual(
+            [
+                location_riddle.location_riddle_id
+                for location_riddle in location_riddle_page.location_riddles
+            ],
+            ["mock_location_riddle_id"],
+        )
+
+        # mock_location_riddle_id2 does not exist anymore
+        location_riddle_page = (
+            self.location_riddles_service.get_solved_location_riddles_for_user_page(
+                "event",
+                "mock_username",
+                "mock_username",
+                1,
+                location_riddle_page.cursor,
+            )
+        )
+        self.assertEqual(location_riddle_page.location_riddles, [])
+        self.assertIsNone(location_riddle_page.cursor)
+
     def test_get_location_riddles_feed(self):
         location_riddles = self.location_riddles_service.get_location_riddles_feed(
             "event", "mock_username"
@@ -69,6 +233,270 @@ class TestLocationRiddleService(unittest.TestCase):
         self.assertEqual(location_riddle.comments, [])
         self.assertEqual(location_riddle.image_base64, "mock_image_base64")
 
+    def test_get_location_riddles_feed_ordering(self):
+        for location_riddle_id, username, created_at in [
+            ("mock_location_riddle_id2", "mock_username2", 3),
+            ("mock_location_riddle_id3", "mock_username", 2),
+            ("mock_location_riddle_id4", "mock_username2", 1),
+        ]:
+            self.location_riddle_repository.write_location_riddle_to_db(
+                LocationRiddle(
+                    location_riddle_id=location_riddle_id,
+                    username=username,
+                    location=Coordinate(coordinate=[0.0, 0.0]),
+                    created_at=created_at,
+                )
+            )
+        self.location_riddle_repository.mock_data[0].created_at = 0
+
+        sequential_service = LocationRiddlesService(
+            self.location_riddle_repository,
+            self.image_bucket_repository,
+            self.user_microservice_client,
+            max_workers=1,
+        )
+        for service in [self.location_riddles_service, sequential_service]:
+            location_riddles = service.get_location_riddles_feed(
+                "event", "mock_requester"
+            )
+            self.assertEqual(
+                [
+                    location_riddle.location_riddle_id
+                    for location_riddle in location_riddles
+                ],
+                [
+                    "mock_location_riddle_id2",
+                    "mock_location_riddle_id3",
+                    "mock_location_riddle_id4",
+                    "mock_location_riddle_id",
+                ],
+            )
+            self.assertTrue(
+                all(
+                    location_riddle.image_base64 == "mock_image_base64"
+                    for location_riddle in location_riddles
+                )
+            )
+
+    def test_get_location_riddles_feed_page_on_read(self):
+        for created_at in range(1, 6):
+            self.location_riddle_repository.write_location_riddle_to_db(
+                LocationRiddle(
+                    location_riddle_id=f"mock_location_riddle_id{created_at}",
+                    username=["mock_username", "mock_username2"][created_at % 2],
+                    location=Coordinate(coordinate=[0.0, 0.0]),
+                    created_at=created_at,
+                )
+            )
+        self.location_riddle_repository.mock_data[0].created_at = 0
+
+        location_riddle_page = (
+            self.location_riddles_service.get_location_riddles_feed_page(
+                "event", "mock_requester", 3
+            )
+        )
+        self.assertEqual(
+            [
+                location_riddle.location_riddle_id
+                for location_riddle in location_riddle_page.location_riddles
+            ],
+            [
+                "mock_location_riddle_id5",
+                "mock_location_riddle_id4",
+                "mock_location_riddle_id3",
+            ],
+        )
+        location_riddle_page = (
+            self.location_riddles_service.get_location_riddles_feed_page(
+                "event", "mock_requester", 3, location_riddle_page.cursor
+            )
+        )
+        self.assertEqual(
+            [
+                location_riddle.location_riddle_id
+                for location_riddle in location_riddle_page.location_riddles
+            ],
+            [
+                "mock_location_riddle_id2",
+                "mock_location_riddle_id1",
+                "mock_location_riddle_id",
+            ],
+        )
+        self.assertIsNone(location_riddle_page.cursor)
+
+    def test_get_location_riddles_feed_page_with_etag(self):
+        location_riddle_page, etag = (
+            self.location_riddles_service.get_location_riddles_feed_page_with_etag(
+                "event", "mock_requester", 1
+            )
+        )
+        self.assertEqual(len(location_riddle_page.location_riddles), 1)
+        with self.assertRaises(NotModifiedError):
+            self.location_riddles_service.get_location_riddles_feed_page_with_etag(
+                "event", "mock_requester", 1, if_none_match=etag
+            )
+
+        self.location_riddle_repository.write_location_riddle_to_db(
+            LocationRiddle(
+                location_riddle_id="mock_location_riddle_id2",
+                username="mock_username2",
+                location=Coordinate(coordinate=[0.0, 0.0]),
+                created_at=self.location_riddle_repository.mock_data[0].created_at + 1,
+            )
+        )
+        location_riddle_page, _ = (
+            self.location_riddles_service.get_location_riddles_feed_page_with_etag(
+                "event", "mock_requester", 1, if_none_match=etag
+            )
+        )
+        self.assertEqual(
+            location_riddle_page.location_riddles[0].location_riddle_id,
+            "mock_location_riddle_id2",
+        )
+
+    def test_get_location_riddles_feed_page_materialized(self):
+        feed_repository = MockFeedRepository()
+        service = LocationRiddlesService(
+            self.location_riddle_repository,
+            self.image_bucket_repository,
+            self.user_microservice_client,
+            feed_repository=feed_repository,
+        )
+        for location in [[45, 13], [46, 14], [47, 15]]:
+            service.post_location_riddle(
+                "event", "mock_image_base64", location, [], "mock_username"
+            )
+        # mock_username3 is the only follower of mock_username
+        self.assertEqual(len(feed_repository.feeds["mock_username3"]), 3)
+        self.assertNotIn("mock_username", feed_repository.feeds)
+
+        first_page = service.get_location_riddles_feed_page(
+            "event", "mock_username3", limit=2
+        )
+        self.assertEqual(len(first_page.location_riddles), 2)
+        self.assertIsNotNone(first_page.cursor)
+        self.assertEqual(
+            first_page.location_riddles[0].image_base64, "mock_image_base64"
+        )
+
+        second_page = service.get_location_riddles_feed_page(
+            "event", "mock_username3", limit=2, cursor=first_page.cursor
+        )
+        self.assertEqual(len(second_page.location_riddles), 1)
+        self.assertIsNone(second_page.cursor)
+        self.assertEqual(
+            len(
+                {
+                    location_riddle.location_riddle_id
+                    for location_riddle in first_page.location_riddles
+                    + second_page.location_riddles
+                }
+            ),
+            3,
+        )
+
+        # feed entries of deleted location riddles are skipped
+        feed_repository.push_location_riddle_to_feeds(
+            ["mock_username3"],
+            LocationRiddle(
+                location_riddle_id="deleted_location_riddle_id",
+                username="mock_username",
+                location=Coordinate(coordinate=[0.0, 0.0]),
+            ),
+        )
+        self.assertEqual(
+            len(service.get_location_riddles_feed("event", "mock_username3")), 3
+        )
+
+    @patch.dict(os.environ, {"USER_FUNCTION_NAME": "findme-users-test"})
+    def test_post_location_riddle_reads_followers_with_get(self):
+        payloads = []
+
+        def invoke(FunctionName, Payload):
+            payloads.append(json.loads(Payload))
+            body = json.dumps(
+                {"followers": [{"username": "mock_username3"}], "following": []}
+            )
+            return {
+                "Payload": io.BytesIO(
+                    json.dumps({"statusCode": 200, "body": body}).encode("utf-8")
+                )
+            }
+
+        user_microservice_client = UserMicroserviceClient()
+        feed_repository = MockFeedRepository()
+        service = LocationRiddlesService(
+            self.location_riddle_repository,
+            self.image_bucket_repository,
+            user_microservice_client,
+            feed_repository=feed_repository,
+        )
+        # the incoming request is the POST of the location riddle
+        event = {
+            "httpMethod": "POST",
+            "path": "/location-riddles",
+            "headers": {"Authorization": "Bearer mock_token"},
+            "body": json.dumps({"image_base64": "mock_image_base64"}),
+        }
+        with patch.object(
+            user_microservice_client.transport.client, "invoke", side_effect=invoke
+        ):
+            service.post_location_riddle(
+                event, "mock_image_base64", [45, 13], [], "mock_username"
+            )
+
+        self.assertEqual(
+            payloads,
+            [
+                {
+                    "internal_request": {
+                        "version": 1,
+                        "method": "GET",
+                        "path": "/users/mock_username/follow",
+                        "authorization": "Bearer mock_token",
+                        "body": None,
+                    }
+                }
+            ],
+        )
+        self.assertEqual(len(feed_repository.feeds["mock_username3"]), 1)
+
+    def test_get_location_riddles_feed_materialized_is_complete(self):
+        feed_repository = MockFeedRepository()
+        service = LocationRiddlesService(
+            self.location_riddle_repository,
+            self.image_bucket_repository,
+            self.user_microservice_client,
+            feed_repository=feed_repository,
+        )
+        for created_at in range(1, 31):
+            self.location_riddle_repository.write_location_riddle_to_db(
+                LocationRiddle(
+                    location_riddle_id=f"mock_location_riddle_id{created_at}",
+                    username="mock_username4",
+                    location=Coordinate(coordinate=[0.0, 0.0]),
+                    created_at=created_at,
+                )
+            )
+
+        # location riddles posted before the follow are added, the unpaginated feed is
+        # not cut to a page
+        service.add_followee_to_feed("mock_username3", "mock_username4")
+        service.add_followee_to_feed("mock_username3", "mock_username4")
+        location_riddles = service.get_location_riddles_feed("event", "mock_username3")
+        self.assertEqual(
+            [
+                location_riddle.location_riddle_id
+                for location_riddle in location_riddles
+            ],
+            [f"mock_location_riddle_id{created_at}" for created_at in range(30, 0, -1)],
+        )
+
+        service.remove_followee_from_feed("mock_username3", "mock_username4")
+        self.assertEqual(
+            service.get_location_riddles_feed("event", "mock_username3"), []
+        )
+
     def test_get_location_riddles_arena(self):
         location_riddles = self.location_riddles_service.get_location_riddles_arena(
             "mock_arena", "mock_username2"
@@ -86,6 +514,42 @@ class TestLocationRiddleService(unittest.TestCase):
                 "mock_arena2", "mock_username2"
             )
 
+    def test_get_nearby_location_riddles(self):
+        # the mock location riddle is located at [0, 0] (lat 0, lon 0)
+        self.location_riddle_repository.write_location_riddle_to_db(
+            LocationRiddle(
+                location_riddle_id="mock_location_riddle_id2",
+                username="mock_username",
+                location=Coordinate(coordinate=[Decimal(500), Decimal(0)]),
+            )
+        )
+        self.location_riddle_repository.write_location_riddle_to_db(
+            LocationRiddle(
+                location_riddle_id="mock_location_riddle_id3",
+                username="mock_username",
+                location=Coordinate(coordinate=[Decimal(5000), Decimal(0)]),
+            )
+        )
+
+        location_riddles = self.location_riddles_service.get_nearby_location_riddles(
+            "mock_username2", 0.0, 0.004, 1000
+        )
+        self.assertEqual(
+            [
+                location_riddle.location_riddle_id
+                for location_riddle in location_riddles
+            ],
+            ["mock_location_riddle_id2", "mock_location_riddle_id"],
+        )
+
+        # riddles of the requesting user are left out
+        self.assertEqual(
+            self.location_riddles_service.get_nearby_location_riddles(
+                "mock_username", 0.0, 0.004, 1000
+            ),
+            [],
+        )
+
     def test_guess_location_riddle(self):
         # Test that the user can not rate its own location riddle
         with self.assertRaises(Exception):
@@ -106,8 +570,10 @@ class TestLocationRiddleService(unittest.TestCase):
         self.assertEqual(
             guess_result["location_riddle"]["guesses"][0]["username"], "mock_username2"
         )
-        self.assertEqual(guess_result["location_riddle"]["guesses"][0]["guess"]["coordinate"],
-                         [Decimal('0.0'), Decimal('0.0')])
+        self.assertEqual(
+            guess_result["location_riddle"]["guesses"][0]["guess"]["coordinate"],
+            [Decimal("0.0"), Decimal("0.0")],
+        )
         self.assertEqual(guess_result["location_riddle"]["average_rating"], None)
         self.assertEqual(guess_result["guess_result"]["distance"], 0.0)
         self.assertEqual(guess_result["guess_result"]["received_score"], 10000.0)
@@ -118,6 +584,43 @@ class TestLocationRiddleService(unittest.TestCase):
                 "event", "mock_location_riddle_id", "mock_username2", [0.0, 0.0]
             )
 
+    def test_guess_location_riddle_score_write_queue(self):
+        score_write_queue = MockScoreWriteQueue()
+        service = LocationRiddlesService(
+            self.location_riddle_repository,
+            self.image_bucket_repository,
+            self.user_microservice_client,
+            score_write_queue=score_write_queue,
+        )
+        with patch.object(
+            self.user_microservice_client, "write_score_to_user_in_user_db"
+        ) as write_score_to_user_in_user_db:
+            service.guess_location_riddle(
+                "event", "mock_location_riddle_id", "mock_username2", [0.0, 0.0]
+            )
+            write_score_to_user_in_user_db.assert_not_called()
+            self.assertEqual(
+                score_write_queue.messages,
+                [
+                    {
+                        "username": "mock_username2",
+                        "location_riddle_id": "mock_location_riddle_id",
+                        "score": 10000,
+                    }
+                ],
+            )
+
+            # a score that can not be enqueued is written synchronously
+            with patch.object(
+                score_write_queue, "enqueue_score", side_effect=Exception("unavailable")
+            ):
+                service.guess_location_riddle(
+                    "event", "mock_location_riddle_id", "mock_username3", [0.0, 0.0]
+                )
+            write_score_to_user_in_user_db.assert_called_once_with(
+                "event", "mock_username3", "mock_location_riddle_id", 10000
+            )
+
     def test_rate_location_riddle(self):
         # Test that the user can not rate its own location riddle
         with self.assertRaises(Exception):
@@ -165,6 +668,125 @@ class TestLocationRiddleService(unittest.TestCase):
         self.assertEqual(location_riddle.comments[0].username, "mock_username2")
         self.assertEqual(location_riddle.comments[0].comment, "mock_comment")
 
+    def test_get_comments_page(self):
+        for i in range(3):
+            self.location_riddles_service.comment_location_riddle(
+                "mock_location_riddle_id", "mock_username2", f"mock_comment_{i}"
+            )
+
+        comment_page = self.location_riddles_service.get_comments_page(
+            "mock_location_riddle_id", 2
+        )
+        self.assertEqual(
+            [comment.comment for comment in comment_page.comments],
+            ["mock_comment_2", "mock_comment_1"],
+        )
+        comment_page = self.location_riddles_service.get_comments_page(
+            "mock_location_riddle_id", 2, comment_page.cursor
+        )
+        self.assertEqual(
+            [comment.comment for comment in comment_page.comments], ["mock_comment_0"]
+        )
+        self.assertIsNone(comment_page.cursor)
+
+    def test_get_guesses_page(self):
+        # the guesses give away the location
+        with self.assertRaises(Exception):
+            self.location_riddles_service.get_guesses_page(
+                "mock_location_riddle_id", "mock_username2"
+            )
+
+        self.location_riddles_service.guess_location_riddle(
+            "event", "mock_location_riddle_id", "mock_username2", [0.0, 0.0]
+        )
+        guess_page = self.location_riddles_service.get_guesses_page(
+            "mock_location_riddle_id", "mock_username2"
+        )
+        self.assertEqual(
+            [guess.username for guess in guess_page.guesses], ["mock_username2"]
+        )
+        self.assertIsNone(guess_page.cursor)
+
+    def test_interactions_of_location_riddles_not_yet_migrated(self):
+        # written before the interaction table, the interactions are still embedded
+        self.location_riddle_repository.write_location_riddle_to_db(
+            LocationRiddle(
+                location_riddle_id="mock_location_riddle_id2",
+                username="mock_username",
+                location=Coordinate(coordinate=[0.0, 0.0]),
+                comments=[
+                    Comment(username="mock_username2", comment=f"mock_embedded_{i}")
+                    for i in range(2)
+                ],
+                guesses=[
+                    Guess(
+                        username="mock_username4",
+                        guess=Coordinate(coordinate=[0.0, 0.0]),
+                    )
+                ],
+            )
+        )
+        self.location_riddles_service.comment_location_riddle(
+            "mock_location_riddle_id2", "mock_username2", "mock_comment"
+        )
+        self.location_riddles_service.guess_location_riddle(
+            "event", "mock_location_riddle_id2", "mock_username3", [0.0, 0.0]
+        )
+        location_riddle = self.location_riddles_service.get_location_riddle(
+            "mock_location_riddle_id2", "mock_username3"
+        )
+
+        # the newest page holds the new comment and the embedded ones
+        self.assertEqual(
+            [comment.comment for comment in location_riddle.comments],
+            ["mock_comment", "mock_embedded_1", "mock_embedded_0"],
+        )
+        self.assertEqual(
+            [guess.username for guess in location_riddle.guesses],
+            ["mock_username3", "mock_username4"],
+        )
+        self.assertEqual(location_riddle.comment_count, 3)
+
+        comments = []
+        cursor = None
+        while True:
+            comment_page = self.location_riddles_service.get_comments_page(
+                "mock_location_riddle_id2", 2, cursor
+            )
+            comments.extend(comment.comment for comment in comment_page.comments)
+            cursor = comment_page.cursor
+            if cursor is None:
+                break
+        self.assertEqual(
+            comments, ["mock_comment", "mock_embedded_1", "mock_embedded_0"]
+        )
+
+        guess_page = self.location_riddles_service.get_guesses_page(
+            "mock_location_riddle_id2", "mock_username3", 1
+        )
+        self.assertEqual(
+            [guess.username for guess in guess_page.guesses], ["mock_username3"]
+        )
+        guess_page = self.location_riddles_service.get_guesses_page(
+            "mock_location_riddle_id2", "mock_username3", 1, guess_page.cursor
+        )
+        self.assertEqual(
+            [guess.username for guess in guess_page.guesses], ["mock_username4"]
+        )
+        self.assertIsNone(guess_page.cursor)
+
+        # a user who only guessed before the migration has solved it as well
+        guess_page = self.location_riddles_service.get_guesses_page(
+            "mock_location_riddle_id2", "mock_username4"
+        )
+        self.assertEqual(len(guess_page.guesses), 2)
+
+        # an embedded guess still counts as the one guess of its user
+        with self.assertRaises(Exception):
+            self.location_riddles_service.guess_location_riddle(
+                "event", "mock_location_riddle_id2", "mock_username4", [0.0, 0.0]
+            )
+
     def test_delete_location_riddle(self):
         self.assertEqual(
             self.location_riddles_service.delete_location_riddle(
@@ -0,0 +1,390 @@
+import base64
+import unittest
+from decimal import Decimal
+from unittest.mock import patch
+
+import boto3
+from moto import mock_aws
+
+from aws_lambda_powertools.event_handler.exceptions import (
+    BadRequestError,
+    NotFoundError,
+)
+
+from ..src.Cursor import Cursor
+from ..src.LocationRiddlesRepository import LocationRiddlesRepository
+from ..src.entities.Comment import Comment
+from ..src.entities.Coordinate import Coordinate
+from ..src.entities.Guess import Guess
+from ..src.entities.LocationRiddle import LocationRiddle
+from ..src.entities.Rating import Rating
+
+
+@mock_aws
+class TestLocationRiddlesRepository(unittest.TestCase):
+    def setUp(self):
+        dynamodb = boto3.client("dynamodb", region_name="eu-central-2")
+        dynamodb.create_table(
+            TableName="locationRiddleTable",
+            AttributeDefinitions=[
+                {"AttributeName": "location_riddle_id", "AttributeType": "S"},
+                {"AttributeName": "username", "AttributeType": "S"},
+                {"AttributeName": "created_at", "AttributeType": "N"},
+            ],
+            KeySchema=[{"AttributeName": "location_riddle_id", "KeyType": "HASH"}],
+            GlobalSecondaryIndexes=[
+                {
+                    "IndexName": "UserCreatedAtIndex",
+                    "KeySchema": [
+                        {"AttributeName": "username", "KeyType": "HASH"},
+                        {"AttributeName": "created_at", "KeyType": "RANGE"},
+                    ],
+                    "Projection": {"ProjectionType": "ALL"},
+                }
+            ],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        for table_name, hash_key in [
+            ("arenaIndexTable", "arena"),
+            ("geoIndexTable", "cell"),
+            ("locationRiddleInteractionTable", "location_riddle_id"),
+        ]:
+            dynamodb.create_table(
+                TableName=table_name,
+                AttributeDefinitions=[
+                    {"AttributeName": hash_key, "AttributeType": "S"},
+                    {"AttributeName": "sort_key", "AttributeType": "S"},
+                ],
+                KeySchema=[
+                    {"AttributeName": hash_key, "KeyType": "HASH"},
+                    {"AttributeName": "sort_key", "KeyType": "RANGE"},
+                ],
+                BillingMode="PAY_PER_REQUEST",
+            )
+        self.location_riddle_repository = LocationRiddlesRepository()
+
+    def __write_location_riddles(self, count, username="mock_username", arenas=None):
+        for i in range(count):
+            self.location_riddle_repository.write_location_riddle_to_db(
+                LocationRiddle(
+                    location_riddle_id=f"{username}_{i}" if arenas else str(i),
+                    username=username,
+                    location=Coordinate(coordinate=[Decimal(i), Decimal(i)]),
+                    arenas=arenas or [],
+                    created_at=i,
+                )
+            )
+
+    def test_get_location_riddles_by_ids(self):
+        self.__write_location_riddles(150)
+        location_riddle_ids = [str(i) for i in reversed(range(150))] + ["missing", "0"]
+
+        location_riddles = self.location_riddle_repository.get_location_riddles_by_ids(
+            location_riddle_ids
+        )
+
+        self.assertEqual(
+            [
+                location_riddle.location_riddle_id
+                for location_riddle in location_riddles
+            ],
+            [str(i) for i in reversed(range(150))] + ["0"],
+        )
+
+    def test_get_location_riddles_by_ids_retries_unprocessed_keys(self):
+        self.__write_location_riddles(2)
+        dynamodb = self.location_riddle_repository.dynamodb
+        batch_get_item = dynamodb.batch_get_item
+        unprocessed_keys = {
+            "locationRiddleTable": {"Keys": [{"location_riddle_id": "1"}]}
+        }
+
+        def throttled_batch_get_item(RequestItems):
+            # the first call only processes location riddle 0
+            if len(RequestItems["locationRiddleTable"]["Keys"]) == 2:
+                response = batch_get_item(
+                    RequestItems={
+                        "locationRiddleTable": {"Keys": [{"location_riddle_id": "0"}]}
+                    }
+                )
+                response["UnprocessedKeys"] = unprocessed_keys
+                return response
+            return batch_get_item(RequestItems=RequestItems)
+
+        with patch.object(
+            dynamodb, "batch_get_item", side_effect=throttled_batch_get_item
+        ) as mock:
+            location_riddles = (
+                self.location_riddle_repository.get_location_riddles_by_ids(["0", "1"])
+            )
+
+        self.assertEqual(mock.call_count, 2)
+        self.assertEqual(
+            [
+                location_riddle.location_riddle_id
+                for location_riddle in location_riddles
+            ],
+            ["0", "1"],
+        )
+
+    def test_get_location_riddles_by_username_page(self):
+        self.__write_location_riddles(5)
+        self.__write_location_riddles(1, "mock_username2", ["mock_arena"])
+
+        location_riddle_ids = []
+        cursor = None
+        while True:
+            location_riddles, cursor = (
+                self.location_riddle_repository.get_location_riddles_by_username_page(
+                    "mock_username", 2, cursor
+                )
+            )
+            self.assertLessEqual(len(location_riddles), 2)
+            location_riddle_ids.extend(
+                location_riddle.location_riddle_id
+                for location_riddle in location_riddles
+            )
+            if cursor is None:
+                break
+        self.assertEqual(location_riddle_ids, ["4", "3", "2", "1", "0"])
+
+        # the query stops at the since bound
+        location_riddles, cursor = (
+            self.location_riddle_repository.get_location_riddles_by_username_page(
+                "mock_username", 10, since=2
+            )
+        )
+        self.assertEqual(
+            [
+                location_riddle.location_riddle_id
+                for location_riddle in location_riddles
+            ],
+            ["4", "3"],
+        )
+        self.assertIsNone(cursor)
+        location_riddles, _ = (
+            self.location_riddle_repository.get_location_riddles_by_username_page(
+                "mock_username", 10, since=0, before=2
+            )
+        )
+        self.assertEqual(
+            [
+                location_riddle.location_riddle_id
+                for location_riddle in location_riddles
+            ],
+            ["2", "1"],
+        )
+
+        # a cursor that is no key of the index is rejected before the query
+        for cursor in [
+            base64.urlsafe_b64encode(b'"1"').decode("utf-8"),
+            Cursor.encode({"arena": "mock_arena", "sort_key": "1"}),
+        ]:
+            with self.assertRaises(BadRequestError):
+                self.location_riddle_repository.get_location_riddles_by_username_page(
+                    "mock_username", 2, cursor
+                )
+
+    def test_get_location_riddles_containing_arena_page(self):
+        self.__write_location_riddles(3, "mock_username", ["mock_arena"])
+        self.__write_location_riddles(
+            3, "mock_username2", ["mock_arena", "mock_arena2"]
+        )
+
+        location_riddle_ids = []
+        cursor = None
+        while True:
+            repository = self.location_riddle_repository
+            location_riddles, cursor = (
+                repository.get_location_riddles_containing_arena_page(
+                    "mock_arena", "mock_username", 2, cursor
+                )
+            )
+            location_riddle_ids.extend(
+                location_riddle.location_riddle_id
+                for location_riddle in location_riddles
+            )
+            if cursor is None:
+                break
+
+        # riddles of the requesting user are filtered on every page, newest first
+        self.assertEqual(
+            location_riddle_ids,
+            ["mock_username2_2", "mock_username2_1", "mock_username2_0"],
+        )
+
+    def test_delete_location_riddle_removes_arena_index_entries(self):
+        self.__write_location_riddles(
+            2, "mock_username2", ["mock_arena", "mock_arena2"]
+        )
+
+        self.location_riddle_repository.delete_location_riddle_from_db(
+            "mock_username2_1"
+        )
+
+        repository = self.location_riddle_repository
+        for arena in ["mock_arena", "mock_arena2"]:
+            self.assertEqual(
+                [
+                    location_riddle.location_riddle_id
+                    for location_riddle in (
+                        repository.get_all_location_riddles_containing_arena(
+                            arena, "mock_username"
+                        )
+                    )
+                ],
+                ["mock_username2_0"],
+            )
+
+    def test_get_geo_index_entries_in_cell(self):
+        location_zurich = [Decimal("950773.5032378712"), Decimal("6003947.738097198")]
+        self.location_riddle_repository.write_location_riddle_to_db(
+            LocationRiddle(
+                location_riddle_id="zurich",
+                username="mock_username",
+                location=Coordinate(coordinate=location_zurich),
+            )
+        )
+        cell = LocationRiddlesRepository.get_geo_index_key(location_zurich, "zurich")[
+            "cell"
+        ]
+
+        entries = self.location_riddle_repository.get_geo_index_entries_in_cell(cell)
+        self.assertEqual([entry["location_riddle_id"] for entry in entries], ["zurich"])
+        self.assertAlmostEqual(float(entries[0]["lat"]), 47.3782, delta=0.001)
+
+        self.location_riddle_repository.delete_location_riddle_from_db("zurich")
+        self.assertEqual(
+            self.location_riddle_repository.get_geo_index_entries_in_cell(cell), []
+        )
+
+    def test_update_location_riddle_guesses_in_db(self):
+        self.__write_location_riddles(1)
+        guess = Guess(
+            username="mock_username2",
+            guess=Coordinate(coordinate=[Decimal(1), Decimal(1)]),
+        )
+
+        location_riddle = (
+            self.location_riddle_repository.update_location_riddle_guesses_in_db(
+                "0", guess
+            )
+        )
+        self.assertEqual(location_riddle.guess_count, 1)
+        # the interactions of the guessing user are read back with the location riddle
+        self.assertEqual(
+            (location_riddle.is_guessed_by_user, location_riddle.is_rated_by_user),
+            (True, False),
+        )
+        self.assertTrue(location_riddle.to_dto("mock_username2").solved)
+        guesses, _ = self.location_riddle_repository.get_guesses_page("0", 10, None)
+        self.assertEqual([entry.username for entry in guesses], ["mock_username2"])
+        self.assertEqual(
+            self.location_riddle_repository.get_guessed_and_rated_location_riddle_ids(
+                ["0"], "mock_username2"
+            ),
+            ({"0"}, set()),
+        )
+
+        with self.assertRaisesRegex(BadRequestError, "already guessed"):
+            self.location_riddle_repository.update_location_riddle_guesses_in_db(
+                "0", guess
+            )
+        with self.assertRaisesRegex(BadRequestError, "own location riddle"):
+            self.location_riddle_repository.update_location_riddle_guesses_in_db(
+                "0", Guess(username="mock_username", guess=guess.guess)
+            )
+        with self.assertRaises(NotFoundError):
+            self.location_riddle_repository.update_location_riddle_guesses_in_db(
+                "missing", guess
+            )
+
+    def test_counters_include_embedded_interactions(self):
+        # a location riddle not migrated yet keeps its embedded lists next to the new
+        # interaction items
+        self.location_riddle_repository.table.put_item(
+            Item={
+                "location_riddle_id": "legacy",
+                "username": "mock_username",
+                "location": {"coordinate": [Decimal(1), Decimal(1)]},
+                "created_at": 1,
+                "ratings": [{"username": "mock_username2", "rating": 4}],
+                "rated_by": {"mock_username2"},
+                "guesses": [
+                    {
+                        "username": "mock_username2",
+                        "guess": {"coordinate": [Decimal(0), Decimal(0)]},
+                    }
+                ],
+                "guessed_by": {"mock_username2"},
+            }
+        )
+
+        location_riddle = (
+            self.location_riddle_repository.update_location_riddle_rating_in_db(
+                "legacy", Rating(username="mock_username3", rating=1)
+            )
+        )
+        self.assertEqual(location_riddle.average_rating, 2.5)
+        location_riddle = (
+            self.location_riddle_repository.update_location_riddle_guesses_in_db(
+                "legacy",
+                Guess(
+                    username="mock_username3",
+                    guess=Coordinate(coordinate=[Decimal(1), Decimal(1)]),
+                ),
+            )
+        )
+        self.assertEqual(location_riddle.get_guess_count(), 2)
+        self.assertEqual(location_riddle.to_dto("mock_username").guess_count, 2)
+        # reading the location riddle again does not count the embedded interactions
+        # twice
+        self.assertEqual(LocationRiddle(**location_riddle.dict()).get_guess_count(), 2)
+
+    def test_update_location_riddle_rating_and_comments_in_db(self):
+        self.__write_location_riddles(1)
+
+        self.location_riddle_repository.update_location_riddle_rating_in_db(
+            "0", Rating(username="mock_username2", rating=4)
+        )
+        location_riddle = (
+            self.location_riddle_repository.update_location_riddle_rating_in_db(
+                "0", Rating(username="mock_username3", rating=1)
+            )
+        )
+        self.assertEqual(
+            (location_riddle.rating_sum, location_riddle.rating_count), (5, 2)
+        )
+        self.assertEqual(location_riddle.average_rating, 2.5)
+        with self.assertRaisesRegex(BadRequestError, "already rated"):
+            self.location_riddle_repository.update_location_riddle_rating_in_db(
+                "0", Rating(username="mock_username2", rating=5)
+            )
+
+        # comments are not restricted, the owner can comment multiple times
+        for i in range(3):
+            location_riddle = (
+                self.location_riddle_repository.update_location_riddle_comments_in_db(
+                    "0", Comment(username="mock_username", comment=f"mock_comment_{i}")
+                )
+            )
+        self.assertEqual(
+            (location_riddle.comment_count, location_riddle.rating_count), (3, 2)
+        )
+
+        comments, cursor = self.location_riddle_repository.get_comments_page(
+            "0", 2, None
+        )
+        self.assertEqual(
+            [comment.comment for comment in comments],
+            ["mock_comment_2", "mock_comment_1"],
+        )
+        comments, cursor = self.location_riddle_repository.get_comments_page(
+            "0", 2, cursor
+        )
+        self.assertEqual([comment.comment for comment in comments], ["mock_comment_0"])
+        self.assertIsNone(cursor)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+import boto3
+from moto import mock_aws
+
+from ..src.LocationRiddlesRepository import LocationRiddlesRepository
+
+# the tools are run from the findme-location-riddles directory and import src as a
+# top-level package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tools import migrate_interactions  # noqa: E402
+
+
+@mock_aws
+class TestMigrateInteractions(unittest.TestCase):
+    def setUp(self):
+        dynamodb = boto3.client("dynamodb", region_name="eu-central-2")
+        dynamodb.create_table(
+            TableName="locationRiddleTable",
+            AttributeDefinitions=[
+                {"AttributeName": "location_riddle_id", "AttributeType": "S"}
+            ],
+            KeySchema=[{"AttributeName": "location_riddle_id", "KeyType": "HASH"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        dynamodb.create_table(
+            TableName="locationRiddleInteractionTable",
+            AttributeDefinitions=[
+                {"AttributeName": "location_riddle_id", "AttributeType": "S"},
+                {"AttributeName": "sort_key", "AttributeType": "S"},
+            ],
+            KeySchema=[
+                {"AttributeName": "location_riddle_id", "KeyType": "HASH"},
+                {"AttributeName": "sort_key", "KeyType": "RANGE"},
+            ],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        self.location_riddle_repository = LocationRiddlesRepository()
+        # the counters already hold a rating written to the interaction table
+        self.location_riddle_repository.table.put_item(
+            Item={
+                "location_riddle_id": "mock_location_riddle_id",
+                "username": "mock_username",
+                "location": {"coordinate": [0, 0]},
+                "created_at": 1,
+                "guesses": [
+                    {"username": "mock_username2", "guess": {"coordinate": [1, 1]}}
+                ],
+                "comments": [
+                    {"username": "mock_username2", "comment": f"mock_comment_{i}"}
+                    for i in range(2)
+                ],
+                "ratings": [{"username": "mock_username2", "rating": 4}],
+                "guessed_by": {"mock_username2"},
+                "rated_by": {"mock_username2"},
+                "rating_sum": 2,
+                "rating_count": 1,
+            }
+        )
+
+    def __get_location_riddle(self):
+        repository = self.location_riddle_repository
+        return repository.get_location_riddle_by_location_riddle_id_from_db(
+            "mock_location_riddle_id"
+        )
+
+    def __get_sort_keys(self):
+        return [
+            item["sort_key"]
+            for item in self.location_riddle_repository.interaction_table.scan()[
+                "Items"
+            ]
+        ]
+
+    def test_migrates_embedded_interactions(self):
+        self.assertEqual(
+            migrate_interactions.migrate_interactions(self.location_riddle_repository),
+            (1, 4),
+        )
+
+        item = self.location_riddle_repository.table.get_item(
+            Key={"location_riddle_id": "mock_location_riddle_id"}
+        )["Item"]
+        for attribute in ["guesses", "comments", "ratings", "guessed_by", "rated_by"]:
+            self.assertNotIn(attribute, item)
+        self.assertEqual(
+            (
+                item["guess_count"],
+                item["comment_count"],
+                item["rating_sum"],
+                item["rating_count"],
+            ),
+            (1, 2, 6, 2),
+        )
+        self.assertCountEqual(
+            self.__get_sort_keys(),
+            [
+                "GUESS#mock_username2",
+                "RATING#mock_username2",
+                "COMMENT#0000000001000000#000000",
+                "COMMENT#0000000001000001#000001",
+            ],
+        )
+        # the migrated location riddle reads the same as before
+        comments, _ = self.location_riddle_repository.get_comments_page(
+            "mock_location_riddle_id", 10
+        )
+        self.assertEqual(
+            [comment.comment for comment in comments],
+            ["mock_comment_1", "mock_comment_0"],
+        )
+        location_riddle = self.__get_location_riddle()
+        self.assertEqual(location_riddle.average_rating, 3.0)
+        self.assertEqual(location_riddle.get_guess_count(), 1)
+        self.assertEqual(location_riddle.get_comment_count(), 2)
+
+    def test_rerun_does_not_count_twice(self):
+        migrate_interactions.migrate_interactions(self.location_riddle_repository)
+
+        self.assertEqual(
+            migrate_interactions.migrate_interactions(self.location_riddle_repository),
+            (0, 0),
+        )
+        location_riddle = self.__get_location_riddle()
+        self.assertEqual(location_riddle.average_rating, 3.0)
+        self.assertEqual(location_riddle.get_guess_count(), 1)
+        self.assertEqual(len(self.__get_sort_keys()), 4)
+
+    def test_location_riddle_migrated_concurrently_is_skipped(self):
+        items = list(
+            migrate_interactions.scan_location_riddles_with_interactions(
+                self.location_riddle_repository
+            )
+        )
+        # a concurrent run migrates the location riddle after the scan
+        migrate_interactions.migrate_interactions(self.location_riddle_repository)
+
+        with patch.object(
+            migrate_interactions,
+            "scan_location_riddles_with_interactions",
+            return_value=items,
+        ):
+            self.assertEqual(
+                migrate_interactions.migrate_interactions(
+                    self.location_riddle_repository
+                ),
+                (0, 0),
+            )
+        location_riddle = self.__get_location_riddle()
+        self.assertEqual(location_riddle.average_rating, 3.0)
+        self.assertEqual(location_riddle.get_guess_count(), 1)
+        self.assertEqual(location_riddle.get_comment_count(), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
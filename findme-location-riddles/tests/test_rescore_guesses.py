@@ -0,0 +1,248 @@
+import csv
+import os
+import sys
+import tempfile
+import unittest
+from decimal import Decimal
+from unittest.mock import patch
+
+import boto3
+from moto import mock_aws
+
+from ..src.ScoringEngine import ScoringEngine
+
+# the tools are run from the findme-location-riddles directory and import src as a
+# top-level package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tools import rescore_guesses  # noqa: E402
+
+LOCATIONS = {"riddle_a": [0, 0], "riddle_b": [10000, 0]}
+
+
+@mock_aws
+class TestRescoreGuesses(unittest.TestCase):
+    def setUp(self):
+        dynamodb = boto3.client("dynamodb", region_name="eu-central-2")
+        for table_name, hash_key, range_key in [
+            ("usersTable", "partition_key", "username"),
+            ("locationRiddleTable", "location_riddle_id", None),
+            ("locationRiddleInteractionTable", "location_riddle_id", "sort_key"),
+        ]:
+            key_schema = [{"AttributeName": hash_key, "KeyType": "HASH"}]
+            if range_key:
+                key_schema.append({"AttributeName": range_key, "KeyType": "RANGE"})
+            dynamodb.create_table(
+                TableName=table_name,
+                AttributeDefinitions=[
+                    {"AttributeName": key["AttributeName"], "AttributeType": "S"}
+                    for key in key_schema
+                ],
+                KeySchema=key_schema,
+                BillingMode="PAY_PER_REQUEST",
+            )
+        resource = boto3.resource("dynamodb", region_name="eu-central-2")
+        self.users_table = resource.Table("usersTable")
+        self.location_riddle_table = resource.Table("locationRiddleTable")
+        self.interaction_table = resource.Table("locationRiddleInteractionTable")
+        # the resources of the main thread are bound to the previous test
+        rescore_guesses._local.__dict__.clear()
+        self.checkpoint_directory = tempfile.mkdtemp()
+        self.report_path = os.path.join(self.checkpoint_directory, "report.csv")
+
+    def __write_location_riddle(self, location_riddle_id, embedded_guessers=()):
+        item = {
+            "location_riddle_id": location_riddle_id,
+            "username": "mock_owner",
+            "location": {"coordinate": self.__coordinate(location_riddle_id)},
+            "created_at": 1,
+        }
+        if embedded_guessers:
+            item["guesses"] = [
+                {"username": username, "guess": {"coordinate": self.__guess(username)}}
+                for username in embedded_guessers
+            ]
+        self.location_riddle_table.put_item(Item=item)
+
+    def __write_interaction_guess(self, location_riddle_id, username):
+        self.interaction_table.put_item(
+            Item={
+                "location_riddle_id": location_riddle_id,
+                "sort_key": f"GUESS#{username}",
+                "username": username,
+                "guess": {"coordinate": self.__guess(username)},
+            }
+        )
+
+    def __write_user(self, username, location_riddle_ids):
+        self.users_table.put_item(
+            Item={
+                "partition_key": "USER",
+                "username": username,
+                "scores": [
+                    {"location_riddle_id": location_riddle_id, "score": 0}
+                    for location_riddle_id in location_riddle_ids
+                ],
+            }
+        )
+
+    def __get_scores(self, username):
+        return {
+            score["location_riddle_id"]: int(score["score"])
+            for score in self.users_table.get_item(
+                Key={"partition_key": "USER", "username": username}
+            )["Item"]["scores"]
+        }
+
+    def __run(self, *arguments):
+        with patch.object(
+            sys,
+            "argv",
+            [
+                "rescore_guesses",
+                "--checkpoint-dir",
+                self.checkpoint_directory,
+                "--report",
+                self.report_path,
+                "--segments",
+                "2",
+                *arguments,
+            ],
+        ):
+            rescore_guesses.main()
+        with open(self.report_path) as report_file:
+            return list(csv.reader(report_file))[1:]
+
+    @staticmethod
+    def __coordinate(location_riddle_id):
+        return [Decimal(coord) for coord in LOCATIONS[location_riddle_id]]
+
+    @staticmethod
+    def __guess(username):
+        # every user guesses a different distance away
+        return [Decimal(1000 * int(username[-1])), Decimal(0)]
+
+    @staticmethod
+    def __expected_score(location_riddle_id, username):
+        scores, _ = ScoringEngine.calculate_scores_and_distances(
+            [float(coord) for coord in LOCATIONS[location_riddle_id]],
+            [float(coord) for coord in TestRescoreGuesses.__guess(username)],
+        )
+        return int(scores[0])
+
+    def test_scores_embedded_and_interaction_guesses_once(self):
+        # riddle_a is migrated, riddle_b is migrated while it is scanned and has the
+        # guess of mock_user1 in both places
+        self.__write_location_riddle("riddle_a")
+        self.__write_interaction_guess("riddle_a", "mock_user1")
+        self.__write_location_riddle("riddle_b", ["mock_user1", "mock_user2"])
+        self.__write_interaction_guess("riddle_b", "mock_user1")
+        self.__write_user("mock_user1", ["riddle_a", "riddle_b"])
+        self.__write_user("mock_user2", ["riddle_b"])
+
+        changes = self.__run()
+
+        self.assertCountEqual(
+            changes,
+            [
+                [username, location_riddle_id, "0"]
+                + [str(self.__expected_score(location_riddle_id, username))]
+                for username, location_riddle_id in [
+                    ("mock_user1", "riddle_a"),
+                    ("mock_user1", "riddle_b"),
+                    ("mock_user2", "riddle_b"),
+                ]
+            ],
+        )
+        self.assertEqual(
+            self.__get_scores("mock_user1"),
+            {
+                "riddle_a": self.__expected_score("riddle_a", "mock_user1"),
+                "riddle_b": self.__expected_score("riddle_b", "mock_user1"),
+            },
+        )
+
+    def test_resumes_from_checkpoint(self):
+        self.__write_location_riddle("riddle_a", ["mock_user1", "mock_user2"])
+        self.__write_user("mock_user1", ["riddle_a"])
+        self.__write_user("mock_user2", ["riddle_a"])
+        rescore_user = rescore_guesses.rescore_user
+
+        def interrupted_rescore_user(username, new_scores, dry_run):
+            if username == "mock_user2":
+                raise RuntimeError("interrupted")
+            return rescore_user(username, new_scores, dry_run)
+
+        with patch.object(rescore_guesses, "USER_BATCH_SIZE", 1):
+            with patch.object(
+                rescore_guesses, "rescore_user", side_effect=interrupted_rescore_user
+            ):
+                with self.assertRaises(RuntimeError):
+                    self.__run()
+            self.assertEqual(
+                self.__get_scores("mock_user1"),
+                {"riddle_a": self.__expected_score("riddle_a", "mock_user1")},
+            )
+            self.assertEqual(self.__get_scores("mock_user2"), {"riddle_a": 0})
+
+            # the scanned segments are not read again, mock_user1 is not written again
+            with patch.object(
+                rescore_guesses, "score_page", side_effect=AssertionError
+            ), patch.object(
+                rescore_guesses, "rescore_user", wraps=rescore_user
+            ) as resumed_rescore_user:
+                changes = self.__run()
+
+        self.assertEqual(
+            [call.args[0] for call in resumed_rescore_user.call_args_list],
+            ["mock_user2"],
+        )
+        self.assertEqual(
+            changes,
+            [
+                [
+                    "mock_user2",
+                    "riddle_a",
+                    "0",
+                    str(self.__expected_score("riddle_a", "mock_user2")),
+                ]
+            ],
+        )
+        self.assertEqual(
+            self.__get_scores("mock_user2"),
+            {"riddle_a": self.__expected_score("riddle_a", "mock_user2")},
+        )
+
+    def test_new_score_written_concurrently_is_kept(self):
+        self.__write_user("mock_user1", ["riddle_a"])
+        get_user = rescore_guesses.get_user
+
+        def get_user_before_new_score(username):
+            user = get_user(username)
+            if len(user["scores"]) == 1:
+                # the users service writes a score between the read and the update
+                self.users_table.update_item(
+                    Key={"partition_key": "USER", "username": username},
+                    UpdateExpression="SET scores = list_append(scores, :score)",
+                    ExpressionAttributeValues={
+                        ":score": [{"location_riddle_id": "riddle_b", "score": 500}]
+                    },
+                )
+            return user
+
+        with patch.object(
+            rescore_guesses, "get_user", side_effect=get_user_before_new_score
+        ) as mock:
+            changes = rescore_guesses.rescore_user(
+                "mock_user1", {"riddle_a": 100}, dry_run=False
+            )
+
+        # the failed conditional update re-reads the user
+        self.assertEqual(mock.call_count, 2)
+        self.assertEqual(changes, [["mock_user1", "riddle_a", 0, 100]])
+        self.assertEqual(
+            self.__get_scores("mock_user1"), {"riddle_a": 100, "riddle_b": 500}
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
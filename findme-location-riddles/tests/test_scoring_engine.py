@@ -0,0 +1,69 @@
+import unittest
+
+import numpy as np
+
+from ..src.LocationRiddlesService import LocationRiddlesService
+from ..src.ScoringEngine import ScoringEngine
+from ..src.entities.ScoringMode import ScoringMode
+
+
+class TestScoringEngine(unittest.TestCase):
+    def setUp(self):
+        self.location_zurich = (
+            950773.5032378712,
+            6003947.738097198,
+        )  # Zurich Hauptbahnhof
+        self.location_st_gallen = (
+            1043079.6590545248,
+            6011475.68947705,
+        )  # St. Gallen Hauptbahnhof
+
+    def test_legacy_mode_matches_single_guess_scoring(self):
+        actual_coords = [
+            self.location_zurich,
+            self.location_st_gallen,
+            self.location_zurich,
+        ]
+        guessed_coords = [
+            self.location_st_gallen,
+            self.location_zurich,
+            self.location_zurich,
+        ]
+
+        scores, distances = ScoringEngine.calculate_scores_and_distances(
+            actual_coords, guessed_coords, 10000, 100
+        )
+
+        for i in range(3):
+            score, distance = LocationRiddlesService.calculate_score_and_distance(
+                actual_coords[i], guessed_coords[i], 10000, 100
+            )
+            self.assertAlmostEqual(scores[i], score)
+            self.assertAlmostEqual(distances[i], distance)
+
+    def test_haversine_mode_zurich_to_st_gallen(self):
+        # the great circle distance is ~62.6km, web mercator inflates it to ~92.6km at
+        # this latitude
+        scores, distances = ScoringEngine.calculate_scores_and_distances(
+            [self.location_zurich],
+            [self.location_st_gallen],
+            scoring_mode=ScoringMode.HAVERSINE,
+        )
+        self.assertAlmostEqual(distances[0], 62.6, delta=1)
+        self.assertAlmostEqual(scores[0], 10000 - distances[0] * 3)
+
+    def test_scores_are_never_negative(self):
+        scores, _ = ScoringEngine.calculate_scores_and_distances(
+            np.array([[0.0, 0.0]]),
+            np.array([[2e7, 0.0]]),
+            scoring_mode=ScoringMode.HAVERSINE,
+        )
+        self.assertEqual(scores[0], 0)
+
+    def test_shape_mismatch(self):
+        with self.assertRaises(ValueError):
+            ScoringEngine.calculate_scores_and_distances([self.location_zurich], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
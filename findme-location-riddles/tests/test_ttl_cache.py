@@ -0,0 +1,50 @@
+import unittest
+
+from ..src.TTLCache import TTLCache
+
+
+class TestTTLCache(unittest.TestCase):
+    def setUp(self):
+        self.now = 0
+        self.ttl_cache = TTLCache(max_entries=2, ttl_seconds=10, clock=lambda: self.now)
+
+    def test_get_and_put(self):
+        self.assertIsNone(self.ttl_cache.get("a"))
+        self.ttl_cache.put("a", [])
+
+        self.assertEqual(self.ttl_cache.get("a"), [])
+        statistics = self.ttl_cache.get_statistics()
+        self.assertEqual(statistics["hits"], 1)
+        self.assertEqual(statistics["misses"], 1)
+
+    def test_entries_expire_after_ttl(self):
+        self.ttl_cache.put("a", "a")
+        self.now = 9.9
+        self.assertEqual(self.ttl_cache.get("a"), "a")
+        self.now = 10
+
+        self.assertIsNone(self.ttl_cache.get("a"))
+        self.assertEqual(self.ttl_cache.get_statistics()["expirations"], 1)
+        self.assertEqual(self.ttl_cache.get_statistics()["entries"], 0)
+
+    def test_evicts_least_recently_used(self):
+        self.ttl_cache.put("a", "a")
+        self.ttl_cache.put("b", "b")
+        self.ttl_cache.get("a")
+        self.ttl_cache.put("c", "c")
+
+        self.assertIsNone(self.ttl_cache.get("b"))
+        self.assertEqual(self.ttl_cache.get("a"), "a")
+        self.assertEqual(self.ttl_cache.get("c"), "c")
+        self.assertEqual(self.ttl_cache.get_statistics()["evictions"], 1)
+
+    def test_invalidate(self):
+        self.ttl_cache.put("a", "a")
+        self.ttl_cache.invalidate("a")
+        self.ttl_cache.invalidate("missing")
+
+        self.assertIsNone(self.ttl_cache.get("a"))
+
+
+if __name__ == "__main__":
+    unittest.main()
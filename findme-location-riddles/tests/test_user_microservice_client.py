@@ -0,0 +1,103 @@
+import io
+import json
+import os
+import unittest
+from unittest.mock import patch
+
+from ..src.TTLCache import TTLCache
+from ..src.UserMicroserviceClient import UserMicroserviceClient
+
+
+@patch.dict(os.environ, {"USER_FUNCTION_NAME": "findme-users-test"})
+class TestUserMicroserviceClient(unittest.TestCase):
+    def setUp(self):
+        self.user_microservice_client = UserMicroserviceClient(
+            cache=TTLCache(max_entries=10, ttl_seconds=60)
+        )
+        self.responses = {
+            "/users/mock_username/follow": {
+                "followers": [{"username": "mock_username3"}],
+                "following": [{"username": "mock_username2"}],
+            },
+            "/users/mock_username/scores": [
+                {"location_riddle_id": "mock_location_riddle_id", "score": 100}
+            ],
+            "/users/score": {"username": "mock_username"},
+        }
+        self.payloads = []
+
+    def __invoke(self, FunctionName, Payload):
+        self.payloads.append(json.loads(Payload))
+        body = json.dumps(self.responses[self.payloads[-1]["internal_request"]["path"]])
+        return {
+            "Payload": io.BytesIO(
+                json.dumps({"statusCode": 200, "body": body}).encode("utf-8")
+            )
+        }
+
+    def test_caches_connections_and_scores(self):
+        with patch.object(
+            self.user_microservice_client.transport.client,
+            "invoke",
+            side_effect=self.__invoke,
+        ) as invoke:
+            for _ in range(2):
+                self.assertEqual(
+                    self.user_microservice_client.get_following_users_list(
+                        {}, "mock_username"
+                    ),
+                    [{"username": "mock_username2"}],
+                )
+                self.assertEqual(
+                    self.user_microservice_client.get_followers_users_list(
+                        {}, "mock_username"
+                    ),
+                    [{"username": "mock_username3"}],
+                )
+                self.user_microservice_client.get_user_scores({}, "mock_username")
+            self.assertEqual(invoke.call_count, 2)
+
+            # writing a score invalidates the cached scores of the user
+            self.user_microservice_client.write_score_to_user_in_user_db(
+                {
+                    "headers": {"authorization": "Bearer mock_token"},
+                    "body": "mock_image_base64",
+                },
+                "mock_username",
+                "mock_location_riddle_id2",
+                50,
+            )
+            self.user_microservice_client.get_user_scores({}, "mock_username")
+            self.user_microservice_client.get_following_users_list({}, "mock_username")
+            self.assertEqual(invoke.call_count, 4)
+
+        # only the token of the incoming event is forwarded
+        self.assertEqual(
+            self.payloads[2],
+            {
+                "internal_request": {
+                    "version": 1,
+                    "method": "POST",
+                    "path": "/users/score",
+                    "authorization": "Bearer mock_token",
+                    "body": json.dumps(
+                        {"score": 50, "location_riddle_id": "mock_location_riddle_id2"}
+                    ),
+                }
+            },
+        )
+        statistics = self.user_microservice_client.cache.get_statistics()
+        self.assertEqual((statistics["hits"], statistics["misses"]), (5, 3))
+        latency_statistics = self.user_microservice_client.get_latency_statistics()
+        self.assertEqual(latency_statistics["transport"], "LambdaUserTransport")
+        self.assertEqual(
+            {
+                operation: latency["calls"]
+                for operation, latency in latency_statistics["operations"].items()
+            },
+            {"get_user_connections": 1, "get_user_scores": 2, "write_score": 1},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,191 @@
+import unittest
+from decimal import Decimal
+from typing import List, Optional
+from unittest.mock import MagicMock, patch
+
+import boto3
+from moto import mock_aws
+from aws_lambda_powertools.event_handler.exceptions import BadRequestError
+from pydantic import BaseModel
+
+from ..src.Backoff import Backoff, MAX_RETRIES
+from ..src.DynamoDBUserTransport import DynamoDBUserTransport
+from ..src.InProcessUserTransport import InProcessUserTransport
+
+USERS = {
+    "mock_username": {"first_name": "Test", "last_name": "User", "scores": []},
+    "mock_username2": {
+        "first_name": "Test2",
+        "last_name": "User2",
+        "bio": "mock_bio",
+        "scores": [
+            {"location_riddle_id": "mock_location_riddle_id", "score": Decimal(100)},
+            {"location_riddle_id": "mock_location_riddle_id2", "score": Decimal(50)},
+        ],
+    },
+}
+EXPECTED_CONNECTIONS = {
+    "followers": [],
+    "following": [
+        {
+            "username": "mock_username2",
+            "first_name": "Test2",
+            "last_name": "User2",
+            "bio": "mock_bio",
+            "average_score": 75.0,
+        }
+    ],
+}
+EXPECTED_SCORES = [
+    {"location_riddle_id": "mock_location_riddle_id", "score": 100},
+    {"location_riddle_id": "mock_location_riddle_id2", "score": 50},
+]
+
+
+class MockUserDTO(BaseModel):
+    username: str
+    first_name: str
+    last_name: str
+    bio: Optional[str] = None
+    average_score: Optional[float] = None
+
+
+class MockScore(BaseModel):
+    location_riddle_id: str
+    score: int
+
+
+class MockUserConnectionsUsernames(BaseModel):
+    following: List[str] = []
+    followers: List[str] = []
+
+
+@mock_aws
+class TestDynamoDBUserTransport(unittest.TestCase):
+    def setUp(self):
+        dynamodb = boto3.resource("dynamodb", region_name="eu-central-2")
+        for table_name, sort_key in [
+            ("usersTable", "username"),
+            ("FollowerTable", "sort_key"),
+        ]:
+            dynamodb.create_table(
+                TableName=table_name,
+                KeySchema=[
+                    {"AttributeName": "partition_key", "KeyType": "HASH"},
+                    {"AttributeName": sort_key, "KeyType": "RANGE"},
+                ],
+                AttributeDefinitions=[
+                    {"AttributeName": "partition_key", "AttributeType": "S"},
+                    {"AttributeName": sort_key, "AttributeType": "S"},
+                ],
+                BillingMode="PAY_PER_REQUEST",
+            )
+        for username, user in USERS.items():
+            dynamodb.Table("usersTable").put_item(
+                Item={"partition_key": "USER", "username": username, **user}
+            )
+        # mock_username follows mock_username2, mock_username20 is not a connection of
+        # mock_username2
+        for partition_key, sort_key in [
+            ("FOLLOWING", "mock_username#mock_username2"),
+            ("FOLLOWERS", "mock_username2#mock_username"),
+            ("FOLLOWERS", "mock_username20#mock_username"),
+        ]:
+            dynamodb.Table("FollowerTable").put_item(
+                Item={"partition_key": partition_key, "sort_key": sort_key}
+            )
+        self.write_transport = MagicMock()
+        self.user_transport = DynamoDBUserTransport(
+            write_transport=self.write_transport
+        )
+
+    def test_get_user_connections_and_scores(self):
+        self.assertEqual(
+            self.user_transport.get_user_connections("event", "mock_username"),
+            EXPECTED_CONNECTIONS,
+        )
+        self.assertEqual(
+            self.user_transport.get_user_connections("event", "mock_username2")[
+                "followers"
+            ][0]["username"],
+            "mock_username",
+        )
+        self.assertEqual(
+            self.user_transport.get_user_scores("event", "mock_username2"),
+            EXPECTED_SCORES,
+        )
+
+    def test_unprocessed_keys_are_retried_with_backoff(self):
+        unprocessed_keys = {
+            "usersTable": {
+                "Keys": [{"partition_key": "USER", "username": "mock_username2"}]
+            }
+        }
+        self.user_transport.dynamodb = MagicMock()
+        self.user_transport.dynamodb.batch_get_item.return_value = {
+            "Responses": {},
+            "UnprocessedKeys": unprocessed_keys,
+        }
+
+        with patch.object(Backoff, "sleep") as sleep:
+            with self.assertRaises(BadRequestError):
+                self.user_transport.get_user_connections("event", "mock_username")
+        self.assertEqual(
+            self.user_transport.dynamodb.batch_get_item.call_count, MAX_RETRIES + 1
+        )
+        self.assertEqual(
+            [call.args[0] for call in sleep.call_args_list],
+            list(range(MAX_RETRIES + 1)),
+        )
+
+    def test_write_score_uses_write_transport(self):
+        self.user_transport.write_score(
+            "event", "mock_username", "mock_location_riddle_id", 10
+        )
+
+        self.write_transport.write_score.assert_called_once_with(
+            "event", "mock_username", "mock_location_riddle_id", 10
+        )
+
+
+class TestInProcessUserTransport(unittest.TestCase):
+    def setUp(self):
+        self.user_service = MagicMock()
+        self.user_service.get_user.side_effect = lambda username: MockUserDTO(
+            username=username,
+            first_name="Test2",
+            last_name="User2",
+            bio="mock_bio",
+            average_score=75,
+        )
+        self.user_service.get_user_scores.return_value = [
+            MockScore(**score) for score in EXPECTED_SCORES
+        ]
+        follower_service = MagicMock()
+        follower_service.get_user_connections.return_value = (
+            MockUserConnectionsUsernames(following=["mock_username2"])
+        )
+        self.user_transport = InProcessUserTransport(
+            self.user_service, follower_service
+        )
+
+    def test_returns_the_responses_of_the_users_endpoints(self):
+        self.assertEqual(
+            self.user_transport.get_user_connections("event", "mock_username"),
+            EXPECTED_CONNECTIONS,
+        )
+        self.assertEqual(
+            self.user_transport.get_user_scores("event", "mock_username2"),
+            EXPECTED_SCORES,
+        )
+
+        self.user_transport.write_score(
+            "event", "mock_username", "mock_location_riddle_id", 10
+        )
+        self.user_service.write_guessing_score_to_user.assert_called_once_with(
+            "mock_username", "mock_location_riddle_id", 10
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
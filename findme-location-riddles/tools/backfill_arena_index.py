@@ -0,0 +1,59 @@
+"""
+Backfills the arena index (arenaIndexTable) from the location riddles in
+locationRiddleTable.
+
+Every location riddle gets one index entry per arena it belongs to. Writes are
+idempotent, the script can therefore be rerun at any time.
+
+Usage (from the findme-location-riddles directory):
+    python -m tools.backfill_arena_index [--dry-run]
+"""
+
+import argparse
+
+from src.LocationRiddlesRepository import LocationRiddlesRepository
+from src.entities.LocationRiddle import LocationRiddle
+
+
+def scan_location_riddles(location_riddle_repository):
+    scan_parameters = {}
+    while True:
+        response = location_riddle_repository.table.scan(**scan_parameters)
+        for item in response["Items"]:
+            yield LocationRiddle(**item)
+        if "LastEvaluatedKey" not in response:
+            return
+        scan_parameters["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def backfill_arena_index(location_riddle_repository, dry_run=False):
+    written_entries = 0
+    for location_riddle in scan_location_riddles(location_riddle_repository):
+        if not location_riddle.arenas:
+            continue
+        if not dry_run:
+            location_riddle_repository.write_arena_index_entries(location_riddle)
+        written_entries += len(set(location_riddle.arenas))
+        arenas = sorted(set(location_riddle.arenas))
+        print(f"{location_riddle.location_riddle_id}: {arenas}")
+    return written_entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="only report the entries that would be written",
+    )
+    args = parser.parse_args()
+
+    written_entries = backfill_arena_index(LocationRiddlesRepository(), args.dry_run)
+    print(
+        f"{'would write' if args.dry_run else 'wrote'} {written_entries} "
+        "arena index entries"
+    )
+
+
+if __name__ == "__main__":
+    main()
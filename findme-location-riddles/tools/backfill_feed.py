@@ -0,0 +1,79 @@
+"""
+Backfills the materialized feeds (feedTable) from the existing follow graph in
+FollowerTable.
+
+Every location riddle of a user is pushed into the feed of each of their followers.
+Writes are idempotent, the script can therefore be rerun at any time, e.g. after a
+failed fan-out.
+
+Usage (from the findme-location-riddles directory):
+    python -m tools.backfill_feed [--dry-run]
+"""
+
+import argparse
+
+import boto3
+from boto3.dynamodb.conditions import Key
+
+from src.FeedRepository import FeedRepository
+from src.LocationRiddlesRepository import LocationRiddlesRepository
+
+
+def get_followers_by_username(follower_table) -> dict[str, list[str]]:
+    # sort_key: "requestee#requester" -> "requestee" has the follower "requester"
+    query_parameters = {"KeyConditionExpression": Key("partition_key").eq("FOLLOWERS")}
+    followers_by_username = {}
+    while True:
+        response = follower_table.query(**query_parameters)
+        for item in response["Items"]:
+            username, follower = item["sort_key"].split("#", 1)
+            followers_by_username.setdefault(username, []).append(follower)
+        if "LastEvaluatedKey" not in response:
+            return followers_by_username
+        query_parameters["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def backfill_feeds(
+    follower_table, location_riddle_repository, feed_repository, dry_run=False
+):
+    followers_by_username = get_followers_by_username(follower_table)
+    written_entries = 0
+    for username, followers in followers_by_username.items():
+        location_riddles = (
+            location_riddle_repository.get_all_location_riddles_by_username(username)
+        )
+        for location_riddle in location_riddles:
+            if not dry_run:
+                feed_repository.push_location_riddle_to_feeds(
+                    followers, location_riddle
+                )
+            written_entries += len(followers)
+        print(
+            f"{username}: {len(location_riddles)} location riddles -> "
+            f"{len(followers)} followers"
+        )
+    return written_entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="only report the entries that would be written",
+    )
+    args = parser.parse_args()
+
+    follower_table = boto3.resource("dynamodb", region_name="eu-central-2").Table(
+        "FollowerTable"
+    )
+    written_entries = backfill_feeds(
+        follower_table, LocationRiddlesRepository(), FeedRepository(), args.dry_run
+    )
+    print(
+        f"{'would write' if args.dry_run else 'wrote'} {written_entries} feed entries"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Backfills the spatial index (geoIndexTable) from the location riddles in
+locationRiddleTable.
+
+Every location riddle gets one index entry keyed by the geohash of its location. Writes
+are idempotent, the script can therefore be rerun at any time.
+
+Usage (from the findme-location-riddles directory):
+    python -m tools.backfill_geo_index [--dry-run]
+"""
+
+import argparse
+
+from src.LocationRiddlesRepository import LocationRiddlesRepository
+from tools.backfill_arena_index import scan_location_riddles
+
+
+def backfill_geo_index(location_riddle_repository, dry_run=False):
+    written_entries = 0
+    for location_riddle in scan_location_riddles(location_riddle_repository):
+        if not dry_run:
+            location_riddle_repository.write_geo_index_entry(location_riddle)
+        written_entries += 1
+    return written_entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="only report the entries that would be written",
+    )
+    args = parser.parse_args()
+
+    written_entries = backfill_geo_index(LocationRiddlesRepository(), args.dry_run)
+    print(
+        f"{'would write' if args.dry_run else 'wrote'} {written_entries} "
+        "geo index entries"
+    )
+
+
+if __name__ == "__main__":
+    main()
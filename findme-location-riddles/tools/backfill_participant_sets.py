@@ -0,0 +1,104 @@
+"""
+Backfills the guessed_by and rated_by string sets of the location riddles in
+locationRiddleTable.
+
+The sets back the conditions that reject a second guess or rating of the same user. They
+are derived from the embedded guesses and ratings lists. ADD merges into existing sets,
+the script can therefore be rerun at any time and run while guesses and ratings are
+coming in. The update is conditional on the embedded lists still having the scanned
+length, a location riddle migrated by tools.migrate_interactions or deleted in the
+meantime is skipped instead of getting the sets back.
+
+Usage (from the findme-location-riddles directory):
+    python -m tools.backfill_participant_sets [--dry-run]
+"""
+
+import argparse
+
+from botocore.exceptions import ClientError
+
+from src.LocationRiddlesRepository import LocationRiddlesRepository
+from tools.backfill_arena_index import scan_location_riddles
+
+
+def backfill_participant_sets(location_riddle_repository, dry_run=False):
+    updated_location_riddles = 0
+    for location_riddle in scan_location_riddles(location_riddle_repository):
+        participant_sets = {
+            "guessed_by": {guess.username for guess in location_riddle.guesses},
+            "rated_by": {rating.username for rating in location_riddle.ratings},
+        }
+        # DynamoDB does not store empty sets
+        participant_sets = {
+            attribute: usernames
+            for attribute, usernames in participant_sets.items()
+            if usernames
+        }
+        if not participant_sets:
+            continue
+        if not dry_run and not add_participant_sets(
+            location_riddle_repository, location_riddle, participant_sets
+        ):
+            continue
+        updated_location_riddles += 1
+    return updated_location_riddles
+
+
+def add_participant_sets(
+    location_riddle_repository, location_riddle, participant_sets: dict
+) -> bool:
+    embedded_lists = {
+        "guesses": location_riddle.guesses,
+        "ratings": location_riddle.ratings,
+    }
+    try:
+        location_riddle_repository.table.update_item(
+            Key={"location_riddle_id": location_riddle.location_riddle_id},
+            UpdateExpression="ADD "
+            + ", ".join(f"{attribute} :{attribute}" for attribute in participant_sets),
+            ConditionExpression=" AND ".join(
+                f"attribute_exists({attribute}) "
+                f"AND size({attribute}) = :{attribute}_size"
+                for attribute, entries in embedded_lists.items()
+                if entries
+            ),
+            ExpressionAttributeValues={
+                **{
+                    f":{attribute}": usernames
+                    for attribute, usernames in participant_sets.items()
+                },
+                **{
+                    f":{attribute}_size": len(entries)
+                    for attribute, entries in embedded_lists.items()
+                    if entries
+                },
+            },
+        )
+        return True
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+            raise
+        # migrated or deleted since the scan
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="only report the location riddles that would be updated",
+    )
+    args = parser.parse_args()
+
+    updated_location_riddles = backfill_participant_sets(
+        LocationRiddlesRepository(), args.dry_run
+    )
+    print(
+        f"{'would update' if args.dry_run else 'updated'} "
+        f"{updated_location_riddles} location riddles"
+    )
+
+
+if __name__ == "__main__":
+    main()
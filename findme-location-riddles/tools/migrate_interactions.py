@@ -0,0 +1,156 @@
+"""
+Moves the embedded guesses, comments and ratings of the location riddles in
+locationRiddleTable into locationRiddleInteractionTable.
+
+Every interaction becomes its own item (GUESS#<username>, RATING#<username>,
+COMMENT#<created_at>#<n>), the lists are then removed from the location riddle and its
+guess_count, comment_count, rating_sum and rating_count are increased by the moved
+entries. The counters only cover the interactions written since the interaction table
+was introduced, the moved entries are added exactly once: the removal is conditional on
+the lists still having the moved length, a location riddle that was already migrated is
+skipped. Interaction items are written with idempotent puts, the script can therefore be
+rerun at any time.
+
+Usage (from the findme-location-riddles directory):
+    python -m tools.migrate_interactions [--dry-run]
+"""
+
+import argparse
+
+from botocore.exceptions import ClientError
+
+from src.LocationRiddlesRepository import (
+    LocationRiddlesRepository,
+    GUESS_PREFIX,
+    RATING_PREFIX,
+    COMMENT_PREFIX,
+)
+
+EMBEDDED_ATTRIBUTES = ["guesses", "comments", "ratings"]
+
+
+def scan_location_riddles_with_interactions(location_riddle_repository):
+    scan_parameters = {
+        "FilterExpression": " OR ".join(
+            f"attribute_exists({attribute})" for attribute in EMBEDDED_ATTRIBUTES
+        )
+    }
+    while True:
+        response = location_riddle_repository.table.scan(**scan_parameters)
+        yield from response["Items"]
+        if "LastEvaluatedKey" not in response:
+            return
+        scan_parameters["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def get_interaction_items(item: dict) -> list[dict]:
+    location_riddle_id = item["location_riddle_id"]
+    created_at = int(item.get("created_at", 0))
+    interaction_items = [
+        {
+            "location_riddle_id": location_riddle_id,
+            "sort_key": f"{GUESS_PREFIX}{guess['username']}",
+            "username": guess["username"],
+            "guess": guess["guess"],
+        }
+        for guess in item.get("guesses", [])
+    ]
+    interaction_items += [
+        {
+            "location_riddle_id": location_riddle_id,
+            "sort_key": f"{RATING_PREFIX}{rating['username']}",
+            "username": rating["username"],
+            "rating": rating["rating"],
+        }
+        for rating in item.get("ratings", [])
+    ]
+    # embedded comments have no timestamp, they keep their order one microsecond apart
+    interaction_items += [
+        {
+            "location_riddle_id": location_riddle_id,
+            "sort_key": (
+                f"{COMMENT_PREFIX}{created_at * 1_000_000 + index:016d}#{index:06d}"
+            ),
+            "username": comment["username"],
+            "comment": comment["comment"],
+            "created_at": created_at,
+        }
+        for index, comment in enumerate(item.get("comments", []))
+    ]
+    return interaction_items
+
+
+def remove_embedded_interactions(location_riddle_repository, item: dict) -> bool:
+    ratings = item.get("ratings", [])
+    conditions = []
+    expression_attribute_values = {
+        ":guess_count": len(item.get("guesses", [])),
+        ":comment_count": len(item.get("comments", [])),
+        ":rating_sum": sum(int(rating["rating"]) for rating in ratings),
+        ":rating_count": len(ratings),
+    }
+    for attribute in EMBEDDED_ATTRIBUTES:
+        if attribute in item:
+            conditions.append(
+                f"attribute_exists({attribute}) "
+                f"AND size({attribute}) = :{attribute}_size"
+            )
+            expression_attribute_values[f":{attribute}_size"] = len(item[attribute])
+    try:
+        location_riddle_repository.table.update_item(
+            Key={"location_riddle_id": item["location_riddle_id"]},
+            UpdateExpression=(
+                "ADD guess_count :guess_count, comment_count :comment_count, "
+                "rating_sum :rating_sum, rating_count :rating_count "
+                "REMOVE guesses, comments, ratings, guessed_by, rated_by"
+            ),
+            ConditionExpression=" AND ".join(conditions),
+            ExpressionAttributeValues=expression_attribute_values,
+        )
+        return True
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+            raise
+        # migrated by a concurrent run or deleted since the scan
+        return False
+
+
+def migrate_interactions(location_riddle_repository, dry_run=False):
+    migrated_location_riddles = 0
+    written_items = 0
+    for item in scan_location_riddles_with_interactions(location_riddle_repository):
+        interaction_items = get_interaction_items(item)
+        if not dry_run:
+            # the items are written before the lists are removed, an interrupted run
+            # loses nothing
+            with location_riddle_repository.interaction_table.batch_writer() as batch:
+                for interaction_item in interaction_items:
+                    batch.put_item(Item=interaction_item)
+            if not remove_embedded_interactions(location_riddle_repository, item):
+                continue
+        migrated_location_riddles += 1
+        written_items += len(interaction_items)
+        print(f"{item['location_riddle_id']}: {len(interaction_items)} interactions")
+    return migrated_location_riddles, written_items
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="only report the interactions that would be moved",
+    )
+    args = parser.parse_args()
+
+    migrated_location_riddles, written_items = migrate_interactions(
+        LocationRiddlesRepository(), args.dry_run
+    )
+    print(
+        f"{'would move' if args.dry_run else 'moved'} {written_items} interactions of "
+        f"{migrated_location_riddles} location riddles"
+    )
+
+
+if __name__ == "__main__":
+    main()
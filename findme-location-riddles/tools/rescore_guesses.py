@@ -0,0 +1,450 @@
+"""
+Re-scores all historical guesses with the current (or the given) scoring parameters and
+writes the new scores back to the users in usersTable.
+
+The job runs in two resumable phases, progress is checkpointed to --checkpoint-dir after
+every page:
+  1. scan: the guesses in locationRiddleInteractionTable and the guesses still embedded
+     in locationRiddleTable are read with parallel segmented scans, the guesses of every
+     page are scored in one vectorized pass and appended to
+     scores-<table>-<segment>.jsonl.
+  2. write: the scores files are sorted by username in runs of at most RUN_SIZE lines
+     and merged, only the new scores of one user are held in memory at a time. Every
+     user with re-scored guesses is read, the scores of the re-scored location riddles
+     are replaced and written back with conditional updates that fail if the user
+     received a new score in the meantime (the user is then re-read and retried).
+With --dry-run nothing is written to usersTable, a diff report (--report, csv) lists the
+changes instead. Rerunning the command continues from the last checkpoint, --restart
+discards it.
+
+Usage (from the findme-location-riddles directory):
+    python -m tools.rescore_guesses [--dry-run] [--report diff.csv] [--segments 8]
+        [--max-score 10000] [--distance-penalty 3] [--scoring-mode legacy|haversine]
+"""
+
+import argparse
+import csv
+import heapq
+import itertools
+import json
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from typing import Iterator
+
+import boto3
+from botocore.exceptions import ClientError
+
+from src.Cursor import Cursor
+from src.LocationRiddlesRepository import LocationRiddlesRepository, GUESS_PREFIX
+from src.ScoringEngine import ScoringEngine, DEFAULT_MAX_SCORE, DEFAULT_DISTANCE_PENALTY
+from src.entities.ScoringMode import ScoringMode
+
+USERS_TABLE_NAME = "usersTable"
+LOCATION_RIDDLE_TABLE_NAME = "locationRiddleTable"
+INTERACTION_TABLE_NAME = "locationRiddleInteractionTable"
+# embedded guesses are only left on location riddles not moved by
+# tools.migrate_interactions yet
+SCAN_PARAMETERS = {
+    INTERACTION_TABLE_NAME: {
+        "FilterExpression": "begins_with(sort_key, :prefix)",
+        "ExpressionAttributeValues": {":prefix": GUESS_PREFIX},
+    },
+    LOCATION_RIDDLE_TABLE_NAME: {
+        "ProjectionExpression": "location_riddle_id, #location, guesses",
+        "ExpressionAttributeNames": {"#location": "location"},
+        "FilterExpression": "attribute_exists(guesses)",
+    },
+}
+USER_PARTITION_KEY = "USER"
+MAX_CONDITIONAL_UPDATE_RETRIES = 3
+# score lines sorted in memory at once while the scores files are split into runs
+RUN_SIZE = 100_000
+# users rescored in parallel before the checkpoint moves on
+USER_BATCH_SIZE = 100
+
+_local = threading.local()
+
+
+def get_location_riddle_repository() -> LocationRiddlesRepository:
+    # the repository keeps a dynamodb resource per thread
+    if not hasattr(_local, "location_riddle_repository"):
+        _local.location_riddle_repository = LocationRiddlesRepository()
+    return _local.location_riddle_repository
+
+
+def get_table(table_name: str):
+    # boto3 resources are not thread-safe, every worker thread gets its own
+    tables = _local.__dict__.setdefault("tables", {})
+    if table_name not in tables:
+        tables[table_name] = (
+            boto3.session.Session()
+            .resource("dynamodb", region_name="eu-central-2")
+            .Table(table_name)
+        )
+    return tables[table_name]
+
+
+class Checkpoint:
+    def __init__(self, directory: str, parameters: dict, restart: bool):
+        self.directory = directory
+        self.path = os.path.join(directory, "state.json")
+        self.lock = threading.Lock()
+        if restart and os.path.isdir(directory):
+            shutil.rmtree(directory)
+        os.makedirs(directory, exist_ok=True)
+
+        if os.path.exists(self.path):
+            with open(self.path) as file:
+                self.state = json.load(file)
+            if self.state["parameters"] != parameters:
+                raise SystemExit(
+                    f"checkpoint in {directory} was created with "
+                    f"{self.state['parameters']}, "
+                    "rerun with the same parameters or pass --restart"
+                )
+        else:
+            self.state = {"parameters": parameters, "segments": {}, "users": {}}
+            self.save()
+
+    def save(self):
+        with self.lock:
+            self.__write()
+
+    def get_segment(self, segment_key: str) -> dict:
+        with self.lock:
+            return dict(self.state["segments"].get(segment_key, {}))
+
+    def save_segment(self, segment_key: str, segment_state: dict):
+        # the scan threads only touch the shared state under the lock, json.dump never
+        # sees a change
+        with self.lock:
+            self.state["segments"][segment_key] = dict(segment_state)
+            self.__write()
+
+    def __write(self):
+        temporary_path = f"{self.path}.tmp"
+        with open(temporary_path, "w") as file:
+            json.dump(self.state, file)
+        # atomic replace, a crash leaves either the old or the new checkpoint
+        os.replace(temporary_path, self.path)
+
+    def scores_path(self, table_name: str, segment: int) -> str:
+        return os.path.join(self.directory, f"scores-{table_name}-{segment}.jsonl")
+
+    def runs_directory(self) -> str:
+        return os.path.join(self.directory, "runs")
+
+
+def scan_segment(
+    table_name: str,
+    segment: int,
+    total_segments: int,
+    checkpoint: Checkpoint,
+    parameters: dict,
+) -> int:
+    segment_key = f"{table_name}:{segment}"
+    segment_state = checkpoint.get_segment(segment_key)
+    if segment_state.get("done"):
+        return 0
+    scan_parameters = {
+        "Segment": segment,
+        "TotalSegments": total_segments,
+        **SCAN_PARAMETERS[table_name],
+    }
+    scored_guesses = 0
+    with open(checkpoint.scores_path(table_name, segment), "a") as scores_file:
+        while True:
+            if segment_state.get("last_key"):
+                scan_parameters["ExclusiveStartKey"] = Cursor.decode(
+                    segment_state["last_key"]
+                )
+            response = get_table(table_name).scan(**scan_parameters)
+            if table_name == INTERACTION_TABLE_NAME:
+                guesses = get_interaction_guesses(response["Items"])
+            else:
+                guesses = get_embedded_guesses(response["Items"])
+
+            # scores are appended before the checkpoint moves on, a page read twice
+            # after a crash only produces duplicate lines with identical scores
+            for line in score_page(guesses, parameters):
+                scores_file.write(json.dumps(line) + "\n")
+                scored_guesses += 1
+            scores_file.flush()
+            os.fsync(scores_file.fileno())
+
+            segment_state["last_key"] = Cursor.encode(response.get("LastEvaluatedKey"))
+            segment_state["done"] = segment_state["last_key"] is None
+            checkpoint.save_segment(segment_key, segment_state)
+            if segment_state["done"]:
+                return scored_guesses
+
+
+def get_embedded_guesses(items: list[dict]) -> list[tuple]:
+    # (location_riddle_id, username, actual coordinate, guessed coordinate)
+    return [
+        (
+            item["location_riddle_id"],
+            guess["username"],
+            item["location"]["coordinate"],
+            guess["guess"]["coordinate"],
+        )
+        for item in items
+        for guess in item.get("guesses", [])
+    ]
+
+
+def get_interaction_guesses(items: list[dict]) -> list[tuple]:
+    location_riddles = get_location_riddle_repository().get_location_riddles_by_ids(
+        list(dict.fromkeys(item["location_riddle_id"] for item in items))
+    )
+    locations = {
+        location_riddle.location_riddle_id: location_riddle.location.coordinate
+        for location_riddle in location_riddles
+    }
+    # guesses of deleted location riddles are skipped
+    return [
+        (
+            item["location_riddle_id"],
+            item["username"],
+            locations[item["location_riddle_id"]],
+            item["guess"]["coordinate"],
+        )
+        for item in items
+        if item["location_riddle_id"] in locations
+    ]
+
+
+def score_page(guesses: list[tuple], parameters: dict) -> list[list]:
+    if not guesses:
+        return []
+    location_riddle_ids, usernames, actual_coords, guessed_coords = zip(*guesses)
+    actual_coords = [
+        [float(coord) for coord in coordinate] for coordinate in actual_coords
+    ]
+    guessed_coords = [
+        [float(coord) for coord in coordinate] for coordinate in guessed_coords
+    ]
+
+    scores, _ = ScoringEngine.calculate_scores_and_distances(
+        actual_coords,
+        guessed_coords,
+        parameters["max_score"],
+        parameters["distance_penalty"],
+        ScoringMode(parameters["scoring_mode"]),
+    )
+    return [
+        [username, location_riddle_id, int(score)]
+        for username, location_riddle_id, score in zip(
+            usernames, location_riddle_ids, scores
+        )
+    ]
+
+
+def sort_scores(checkpoint: Checkpoint, total_segments: int) -> list[str]:
+    """
+    Splits the scores files into runs sorted by username, a run holds at most RUN_SIZE
+    lines. Runs of an interrupted write phase are discarded and sorted again.
+    Returns: the paths of the runs.
+    """
+    runs_directory = checkpoint.runs_directory()
+    shutil.rmtree(runs_directory, ignore_errors=True)
+    os.makedirs(runs_directory)
+    run_paths = []
+    for table_name in SCAN_PARAMETERS:
+        for segment in range(total_segments):
+            if not os.path.exists(checkpoint.scores_path(table_name, segment)):
+                continue
+            with open(checkpoint.scores_path(table_name, segment)) as scores_file:
+                while True:
+                    lines = sorted(
+                        json.loads(line)
+                        for line in itertools.islice(scores_file, RUN_SIZE)
+                    )
+                    if not lines:
+                        break
+                    run_path = os.path.join(runs_directory, f"{len(run_paths)}.jsonl")
+                    with open(run_path, "w") as run_file:
+                        run_file.writelines(json.dumps(line) + "\n" for line in lines)
+                    run_paths.append(run_path)
+    return run_paths
+
+
+def iter_scores_by_username(run_paths: list[str]) -> Iterator[tuple[str, dict]]:
+    """
+    Merges the sorted runs and yields the new scores of one user at a time, in username
+    order. A guess scanned twice, e.g. from a page read again after a crash or a
+    location riddle migrated during the scan, has the same score and is kept once.
+    """
+    with ExitStack() as stack:
+        runs = [map(json.loads, stack.enter_context(open(path))) for path in run_paths]
+        for username, lines in itertools.groupby(
+            heapq.merge(*runs), key=lambda line: line[0]
+        ):
+            yield (
+                username,
+                {location_riddle_id: score for _, location_riddle_id, score in lines},
+            )
+
+
+def get_user(username: str):
+    # consistent, a score written right before is part of the conditional update
+    return (
+        get_table(USERS_TABLE_NAME)
+        .get_item(
+            Key={"partition_key": USER_PARTITION_KEY, "username": username},
+            ProjectionExpression="username, scores",
+            ConsistentRead=True,
+        )
+        .get("Item")
+    )
+
+
+def rescore_user(username: str, new_scores: dict[str, int], dry_run: bool) -> list:
+    for attempt in range(MAX_CONDITIONAL_UPDATE_RETRIES + 1):
+        user = get_user(username)
+        # scores of deleted users are skipped
+        if user is None:
+            return []
+        changes = []
+        updated_scores = []
+        for score in user.get("scores", []):
+            new_score = new_scores.get(score["location_riddle_id"], int(score["score"]))
+            if new_score != int(score["score"]):
+                changes.append(
+                    [
+                        username,
+                        score["location_riddle_id"],
+                        int(score["score"]),
+                        new_score,
+                    ]
+                )
+            updated_scores.append(
+                {"location_riddle_id": score["location_riddle_id"], "score": new_score}
+            )
+        if dry_run or not changes:
+            return changes
+
+        try:
+            get_table(USERS_TABLE_NAME).update_item(
+                Key={"partition_key": USER_PARTITION_KEY, "username": username},
+                UpdateExpression="SET scores = :scores",
+                ConditionExpression="size(scores) = :count",
+                ExpressionAttributeValues={
+                    ":scores": updated_scores,
+                    ":count": len(user.get("scores", [])),
+                },
+            )
+            return changes
+        except ClientError as e:
+            # the user received a new score while we were working on it, it is re-read
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise
+    raise RuntimeError(f"scores of {username} kept changing, rerun the job to retry")
+
+
+def write_scores(
+    checkpoint: Checkpoint, run_paths: list[str], executor, dry_run, report_writer
+):
+    # a dry run keeps its position in memory only, a real run afterwards still has to
+    # write every user
+    users_state = {} if dry_run else checkpoint.state["users"]
+    if users_state.get("done"):
+        return 0
+    # users are written in username order, the ones up to last_username are done
+    last_username = users_state.get("last_username", "")
+    scores_by_username = (
+        (username, new_scores)
+        for username, new_scores in iter_scores_by_username(run_paths)
+        if username > last_username
+    )
+    changed_scores = 0
+    while True:
+        batch = list(itertools.islice(scores_by_username, USER_BATCH_SIZE))
+        if not batch:
+            break
+        for changes in executor.map(
+            lambda user_scores: rescore_user(*user_scores, dry_run), batch
+        ):
+            changed_scores += len(changes)
+            if report_writer:
+                report_writer.writerows(changes)
+
+        users_state["last_username"] = batch[-1][0]
+        if not dry_run:
+            checkpoint.save()
+    users_state["done"] = True
+    if not dry_run:
+        checkpoint.save()
+    return changed_scores
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--dry-run", action="store_true", help="only report the changed scores"
+    )
+    parser.add_argument("--report", help="csv file listing every changed score")
+    parser.add_argument(
+        "--segments", type=int, default=8, help="parallel scan segments"
+    )
+    parser.add_argument("--max-score", type=float, default=DEFAULT_MAX_SCORE)
+    parser.add_argument(
+        "--distance-penalty", type=float, default=DEFAULT_DISTANCE_PENALTY
+    )
+    parser.add_argument(
+        "--scoring-mode",
+        choices=[scoring_mode.value for scoring_mode in ScoringMode],
+        default=ScoringMode.LEGACY.value,
+    )
+    parser.add_argument("--checkpoint-dir", default=".rescore-checkpoint")
+    parser.add_argument(
+        "--restart", action="store_true", help="discard an existing checkpoint"
+    )
+    args = parser.parse_args()
+
+    parameters = {
+        "max_score": args.max_score,
+        "distance_penalty": args.distance_penalty,
+        "scoring_mode": args.scoring_mode,
+        "segments": args.segments,
+    }
+    checkpoint = Checkpoint(args.checkpoint_dir, parameters, args.restart)
+
+    with ThreadPoolExecutor(max_workers=args.segments) as executor:
+        scored_guesses = sum(
+            executor.map(
+                lambda table_segment: scan_segment(
+                    *table_segment, args.segments, checkpoint, parameters
+                ),
+                [
+                    (table_name, segment)
+                    for table_name in SCAN_PARAMETERS
+                    for segment in range(args.segments)
+                ],
+            )
+        )
+        print(f"scored {scored_guesses} guesses")
+
+        run_paths = sort_scores(checkpoint, args.segments)
+        report_file = open(args.report, "w", newline="") if args.report else None
+        try:
+            report_writer = csv.writer(report_file) if report_file else None
+            if report_writer:
+                report_writer.writerow(
+                    ["username", "location_riddle_id", "old_score", "new_score"]
+                )
+            changed_scores = write_scores(
+                checkpoint, run_paths, executor, args.dry_run, report_writer
+            )
+        finally:
+            if report_file:
+                report_file.close()
+
+    print(f"{'would change' if args.dry_run else 'changed'} {changed_scores} scores")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+import hashlib
+from typing import Optional
+
+
+class ETag:
+    """
+    Weak entity tags for conditional GET requests, derived from the content a response
+    is built from. ResponseCompressor sends the same content gzip, br or identity
+    encoded, the encodings are semantically equivalent but not byte-identical and
+    therefore share one weak tag.
+    """
+
+    @staticmethod
+    def compute(*parts) -> str:
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(str(part).encode("utf-8"))
+            digest.update(b"\0")
+        return f'W/"{digest.hexdigest()[:32]}"'
+
+    @staticmethod
+    def matches(if_none_match: Optional[str], etag: str) -> bool:
+        # If-None-Match uses the weak comparison, * matches any current representation
+        if not if_none_match:
+            return False
+        candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+        return "*" in candidates or etag.removeprefix("W/") in [
+            candidate.removeprefix("W/") for candidate in candidates
+        ]
@@ -0,0 +1,66 @@
+from typing import Optional
+
+ENVELOPE_KEY = "internal_request"
+ENVELOPE_VERSION = 1
+
+
+class InternalRequest:
+    """
+    Compact request envelope for service to service invokes. Instead of the complete API
+    Gateway event of the incoming request only method, path, the Authorization header
+    and the body are sent, the receiving handler expands the envelope into a minimal API
+    Gateway event and resolves it as usual.
+    """
+
+    @staticmethod
+    def create(
+        method: str, path: str, authorization: Optional[str], body: Optional[str] = None
+    ) -> dict:
+        return {
+            ENVELOPE_KEY: {
+                "version": ENVELOPE_VERSION,
+                "method": method,
+                "path": path,
+                "authorization": authorization,
+                "body": body,
+            }
+        }
+
+    @staticmethod
+    def is_internal_request(event: dict) -> bool:
+        return isinstance(event, dict) and ENVELOPE_KEY in event
+
+    @staticmethod
+    def to_api_gateway_event(envelope: dict) -> dict:
+        request = envelope[ENVELOPE_KEY]
+        headers = {"Content-Type": "application/json"}
+        if request.get("authorization"):
+            headers["Authorization"] = request["authorization"]
+        return {
+            "resource": request["path"],
+            "path": request["path"],
+            "httpMethod": request["method"],
+            "headers": headers,
+            "multiValueHeaders": {name: [value] for name, value in headers.items()},
+            "queryStringParameters": None,
+            "multiValueQueryStringParameters": None,
+            "pathParameters": None,
+            "requestContext": {
+                "httpMethod": request["method"],
+                "path": request["path"],
+            },
+            "body": request.get("body"),
+            "isBase64Encoded": False,
+        }
+
+    @staticmethod
+    def get_authorization(event) -> Optional[str]:
+        # event is the API Gateway event of the incoming request, header names are
+        # case-insensitive
+        for name, value in (event.get("headers") or {}).items():
+            if name.lower() == "authorization":
+                return value
+        for name, values in (event.get("multiValueHeaders") or {}).items():
+            if name.lower() == "authorization" and values:
+                return values[0]
+        return None
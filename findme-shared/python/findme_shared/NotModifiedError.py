@@ -0,0 +1,9 @@
+class NotModifiedError(Exception):
+    """
+    Raised when the If-None-Match header of a request matches the current ETag, the
+    handler answers 304.
+    """
+
+    def __init__(self, etag: str):
+        super().__init__(f"Not modified: {etag}")
+        self.etag = etag
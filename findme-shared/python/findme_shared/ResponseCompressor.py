@@ -0,0 +1,118 @@
+import base64
+import gzip
+import time
+
+from aws_lambda_powertools.logging import Logger
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+logger = Logger()
+
+# 0 disables compression, API Gateway has to pass binary bodies through
+# (binaryMediaTypes */*)
+DEFAULT_MIN_BYTES = 0
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+class ResponseCompressor:
+    """
+    Compresses the body of API Gateway proxy responses built by APIGatewayRestResolver.
+    Bodies of at least min_bytes are compressed with the best encoding of the
+    Accept-Encoding header of the request (br if the brotli package is installed,
+    otherwise gzip). Size, ratio and CPU time are logged per route.
+    """
+
+    def __init__(self, min_bytes: int = DEFAULT_MIN_BYTES):
+        self.min_bytes = min_bytes
+
+    def compress(self, event: dict, response: dict) -> dict:
+        if self.min_bytes <= 0 or response.get("isBase64Encoded"):
+            return response
+        body = (response.get("body") or "").encode("utf-8")
+        if response.get("statusCode") != 304 and len(body) < self.min_bytes:
+            return response
+        # the representation depends on Accept-Encoding even if it is sent uncompressed,
+        # a cache must not serve it to a client accepting another encoding
+        headers = response.setdefault("multiValueHeaders", {})
+        headers["Vary"] = headers.get("Vary", []) + ["Accept-Encoding"]
+        if not body:
+            return response
+        encoding = ResponseCompressor.select_encoding(
+            ResponseCompressor.__get_header(event, "accept-encoding")
+        )
+        if encoding is None:
+            return response
+
+        start = time.process_time()
+        if encoding == "br":
+            compressed_body = brotli.compress(body, quality=BROTLI_QUALITY)
+        else:
+            compressed_body = gzip.compress(body, GZIP_LEVEL)
+        cpu_time = time.process_time() - start
+
+        logger.info(
+            {
+                "response_compression": {
+                    "route": f"{event.get('httpMethod')} {event.get('resource')}",
+                    "encoding": encoding,
+                    "bytes": len(body),
+                    "compressed_bytes": len(compressed_body),
+                    "ratio": round(len(body) / max(len(compressed_body), 1), 2),
+                    "cpu_ms": round(cpu_time * 1000, 3),
+                }
+            }
+        )
+
+        headers["Content-Encoding"] = [encoding]
+        response["body"] = base64.b64encode(compressed_body).decode("utf-8")
+        response["isBase64Encoded"] = True
+        return response
+
+    @staticmethod
+    def select_encoding(accept_encoding: str):
+        # returns br, gzip or None, encodings with q=0 are refused by the client
+        accepted = {}
+        for entry in (accept_encoding or "").split(","):
+            name, _, parameters = entry.strip().partition(";")
+            quality = 1.0
+            if parameters.strip().startswith("q="):
+                try:
+                    quality = float(parameters.strip()[2:])
+                except ValueError:
+                    quality = 0.0
+            accepted[name.strip().lower()] = quality
+
+        candidates = (["br"] if brotli is not None else []) + ["gzip"]
+        candidates = [
+            encoding
+            for encoding in candidates
+            if accepted.get(encoding, accepted.get("*", 0.0)) > 0
+        ]
+        if not candidates:
+            return None
+        return max(
+            candidates,
+            key=lambda encoding: accepted.get(encoding, accepted.get("*", 0.0)),
+        )
+
+    @staticmethod
+    def decompress(body: str, content_encoding: str) -> str:
+        # reverses compress for callers that invoke the lambda directly
+        compressed_body = base64.b64decode(body)
+        if content_encoding == "br":
+            return brotli.decompress(compressed_body).decode("utf-8")
+        return gzip.decompress(compressed_body).decode("utf-8")
+
+    @staticmethod
+    def __get_header(event: dict, name: str) -> str:
+        for header, value in (event.get("headers") or {}).items():
+            if header.lower() == name:
+                return value
+        for header, values in (event.get("multiValueHeaders") or {}).items():
+            if header.lower() == name and values:
+                return ",".join(values)
+        return ""
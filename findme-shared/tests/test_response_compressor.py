@@ -0,0 +1,77 @@
+import json
+import unittest
+
+from findme_shared.ResponseCompressor import ResponseCompressor
+
+
+class TestResponseCompressor(unittest.TestCase):
+    def setUp(self):
+        self.response_compressor = ResponseCompressor(min_bytes=1024)
+        self.body = json.dumps([{"image_base64": "mock_image_base64" * 100}] * 10)
+
+    def __compress(self, accept_encoding, body=None):
+        event = {
+            "httpMethod": "GET",
+            "resource": "/location-riddles",
+            "headers": {"Accept-Encoding": accept_encoding},
+        }
+        response = {
+            "statusCode": 200,
+            "body": body or self.body,
+            "isBase64Encoded": False,
+            "multiValueHeaders": {"Content-Type": ["application/json"]},
+        }
+        return self.response_compressor.compress(event, response)
+
+    def test_compress(self):
+        response = self.__compress("gzip, deflate")
+
+        self.assertTrue(response["isBase64Encoded"])
+        self.assertEqual(response["multiValueHeaders"]["Content-Encoding"], ["gzip"])
+        self.assertEqual(response["multiValueHeaders"]["Vary"], ["Accept-Encoding"])
+        self.assertLess(len(response["body"]), len(self.body))
+        self.assertEqual(
+            ResponseCompressor.decompress(response["body"], "gzip"), self.body
+        )
+
+    def test_header_names_are_case_insensitive(self):
+        for event in [
+            {"headers": {"accept-encoding": "gzip"}},
+            {"multiValueHeaders": {"ACCEPT-ENCODING": ["identity", "gzip"]}},
+        ]:
+            response = self.response_compressor.compress(
+                event, {"statusCode": 200, "body": self.body}
+            )
+            self.assertEqual(
+                response["multiValueHeaders"]["Content-Encoding"], ["gzip"]
+            )
+            self.assertEqual(
+                ResponseCompressor.decompress(response["body"], "gzip"), self.body
+            )
+
+    def test_compress_skips_small_and_unaccepted_responses(self):
+        self.assertFalse(self.__compress("gzip", body="[]")["isBase64Encoded"])
+        response = self.__compress("identity")
+        self.assertFalse(response["isBase64Encoded"])
+        # the uncompressed representation varies with Accept-Encoding as well
+        self.assertEqual(response["multiValueHeaders"]["Vary"], ["Accept-Encoding"])
+        self.assertFalse(self.__compress("gzip;q=0")["isBase64Encoded"])
+        # compression is disabled without min_bytes
+        self.assertEqual(
+            ResponseCompressor().compress({}, {"body": self.body})["body"], self.body
+        )
+
+    def test_select_encoding(self):
+        self.assertEqual(
+            ResponseCompressor.select_encoding("deflate, gzip;q=0.5"), "gzip"
+        )
+        self.assertEqual(
+            ResponseCompressor.select_encoding("*"),
+            ResponseCompressor.select_encoding("br, gzip"),
+        )
+        self.assertIsNone(ResponseCompressor.select_encoding("*;q=0"))
+        self.assertIsNone(ResponseCompressor.select_encoding(None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,7 +4,12 @@ sys.path.insert(0, "/var/task/.venv/lib/python3.12/site-packages")
 import os
 
 from aws_lambda_powertools import Logger, Tracer
-from aws_lambda_powertools.event_handler import APIGatewayRestResolver, CORSConfig
+from aws_lambda_powertools.event_handler import (
+    APIGatewayRestResolver,
+    CORSConfig,
+    Response,
+    content_types,
+)
 from aws_lambda_powertools.event_handler.openapi.params import Path
 from aws_lambda_powertools.logging import correlation_paths
 from aws_lambda_powertools.shared.types import Annotated
@@ -15,8 +20,12 @@ from aws_lambda_powertools.event_handler.exceptions import (
 from typing import List
 from enum import Enum
 from findme.authorization import Authorizer
+from findme_shared.InternalRequest import InternalRequest
+from findme_shared.NotModifiedError import NotModifiedError
+from findme_shared.ResponseCompressor import ResponseCompressor, DEFAULT_MIN_BYTES
 
 from src.UserRepository import UserRepository
+from src.FollowEventQueue import FollowEventQueue
 from src.FollowerRepository import FollowerRepository
 from src.UserService import UserService
 from src.FollowerService import FollowerService
@@ -28,7 +37,11 @@ from src.entities.Score import Score
 tracer = Tracer()
 logger = Logger()
 
-cors_config = CORSConfig(allow_origin=os.environ.get("FRONTEND_ORIGIN"))
+cors_config = CORSConfig(
+    allow_origin=os.environ.get("FRONTEND_ORIGIN"),
+    allow_headers=["If-None-Match"],
+    expose_headers=["ETag"],
+)
 app = APIGatewayRestResolver(cors=cors_config, enable_validation=True)
 app.enable_swagger(path="/users/swagger")
 
@@ -40,7 +53,15 @@ authorizer = Authorizer(
 user_repository = UserRepository()
 user_service = UserService(user_repository)
 follower_repository = FollowerRepository()
-follower_service = FollowerService(follower_repository)
+follower_service = FollowerService(
+    follower_repository,
+    follow_event_queue=(
+        FollowEventQueue() if os.environ.get("FOLLOW_EVENT_QUEUE_URL") else None
+    ),
+)
+response_compressor = ResponseCompressor(
+    min_bytes=int(os.environ.get("RESPONSE_COMPRESSION_MIN_BYTES", DEFAULT_MIN_BYTES))
+)
 
 
 class RequestBodyAttribute(Enum):
@@ -51,6 +72,11 @@ class RequestBodyAttribute(Enum):
     ACTION = "action"
 
 
+@app.exception_handler(NotModifiedError)
+def handle_not_modified(e: NotModifiedError):
+    return Response(status_code=304, headers={"ETag": e.etag}, body="")
+
+
 # TODO Beautify: constructor required for swagger but unused
 @app.post("/users")
 @tracer.capture_method
@@ -87,27 +113,33 @@ def update_user(user: UserPutDTO) -> UserDTO:
 @app.get("/users/<username>")
 @tracer.capture_method
 @authorizer.requires_auth(app=app)
-def get_user(username: Annotated[str, Path()]) -> UserDTO:
+def get_user(username: Annotated[str, Path()]) -> Response[UserDTO]:
     """
     Endpoint: GET /users/<username>
     Body: None
     Description: Retrieves a user from the database by username.
-    Returns: The user data.
+    Returns: The user data. The ETag header can be sent back in If-None-Match, an
+        unchanged user is answered with 304.
     """
-    return user_service.get_user(username)
+    return __get_response_with_etag(
+        *user_service.get_user_with_etag(username, __get_if_none_match())
+    )
 
 
 @app.get("/users")
 @tracer.capture_method
 @authorizer.requires_auth(app=app)
-def get_individual_user() -> UserDTO:
+def get_individual_user() -> Response[UserDTO]:
     """
     Endpoint: GET /users
     Body: None
     Description: Retrieves the authenticated user's data from the database.
-    Returns: The authenticated user's data.
+    Returns: The authenticated user's data. The ETag header can be sent back in
+        If-None-Match, an unchanged user is answered with 304.
     """
-    return user_service.get_user(__get_username())
+    return __get_response_with_etag(
+        *user_service.get_user_with_etag(__get_username(), __get_if_none_match())
+    )
 
 
 @app.post("/users/score")
@@ -247,6 +279,19 @@ def __get_username():
     return app.context.get("claims").get(RequestBodyAttribute.FINDME_USERNAME.value)
 
 
+def __get_if_none_match():
+    return app.current_event.get_header_value("If-None-Match", case_sensitive=False)
+
+
+def __get_response_with_etag(body, etag):
+    return Response(
+        status_code=200,
+        content_type=content_types.APPLICATION_JSON,
+        body=body,
+        headers={"ETag": etag},
+    )
+
+
 def __get_attribute_from_request_body(attribute: str):
     try:
         return app.current_event.json_body[attribute]
@@ -258,4 +303,7 @@ def __get_attribute_from_request_body(attribute: str):
 @logger.inject_lambda_context(correlation_id_path=correlation_paths.API_GATEWAY_REST)
 @tracer.capture_lambda_handler
 def lambda_handler(event: dict, context: LambdaContext) -> dict:
-    return app.resolve(event, context)
+    if InternalRequest.is_internal_request(event):
+        # invokes of findme-location-riddles only carry method, path, token and body
+        event = InternalRequest.to_api_gateway_event(event)
+    return response_compressor.compress(event, app.resolve(event, context))
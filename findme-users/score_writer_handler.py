@@ -0,0 +1,49 @@
+import sys
+
+sys.path.insert(0, "/var/task/.venv/lib/python3.12/site-packages")
+import json
+
+from aws_lambda_powertools import Logger, Tracer
+from aws_lambda_powertools.utilities.batch import (
+    BatchProcessor,
+    EventType,
+    process_partial_response,
+)
+from aws_lambda_powertools.utilities.data_classes.sqs_event import SQSRecord
+from aws_lambda_powertools.utilities.typing import LambdaContext
+
+from src.UserRepository import UserRepository
+from src.UserService import UserService
+
+tracer = Tracer()
+logger = Logger()
+
+processor = BatchProcessor(event_type=EventType.SQS)
+user_service = UserService(UserRepository())
+
+
+@tracer.capture_method
+def record_handler(record: SQSRecord):
+    """
+    Body: {
+        "username": <username>,
+        "location_riddle_id": <location_riddle_id>,
+        "score": <score_integer>
+    }
+    Description: Writes a score enqueued by guess_location_riddle to the user. Writes
+        are idempotent, a failed record is redelivered by the queue and moved to the
+        dead-letter queue after maxReceiveCount.
+    """
+    score_write = json.loads(record.body)
+    user_service.write_guessing_score_to_user(
+        score_write["username"], score_write["location_riddle_id"], score_write["score"]
+    )
+
+
+@logger.inject_lambda_context
+@tracer.capture_lambda_handler
+def lambda_handler(event: dict, context: LambdaContext) -> dict:
+    # only the failed records of a batch are returned to the queue
+    return process_partial_response(
+        event=event, record_handler=record_handler, processor=processor, context=context
+    )
@@ -0,0 +1,27 @@
+import json
+import os
+
+import boto3
+
+from .base.AbstractFollowEventQueue import AbstractFollowEventQueue
+
+
+class FollowEventQueue(AbstractFollowEventQueue):
+    """
+    Publishes changes of the follow graph to the FIFO queue read by
+    findme-location-riddles, which updates the materialized feeds. The events of a
+    follower are delivered in order.
+    """
+
+    def __init__(self):
+        self.client = boto3.client("sqs", region_name="eu-central-2")
+        self.queue_url = os.environ["FOLLOW_EVENT_QUEUE_URL"]
+
+    def publish_follow_event(self, action: str, follower: str, followee: str):
+        self.client.send_message(
+            QueueUrl=self.queue_url,
+            MessageBody=json.dumps(
+                {"action": action, "follower": follower, "followee": followee}
+            ),
+            MessageGroupId=follower,
+        )
@@ -13,8 +13,10 @@ logger = Logger()
 
 
 class FollowerService:
-    def __init__(self, follower_repository):
+    def __init__(self, follower_repository, follow_event_queue=None):
         self.follower_repository = follower_repository
+        # without a follow event queue the materialized feeds are not updated on follow
+        self.follow_event_queue = follow_event_queue
 
     def create_follower_request(self, requester: str, requestee: str) -> FollowRequest:
         if requester == requestee:
@@ -40,7 +42,19 @@ class FollowerService:
         return self.follower_repository.create_follow_request(follow_request)
 
     def accept_follow_request(self, requester: str, requestee: str) -> FollowRequest:
-        return self.follower_repository.accept_follow_request(requester, requestee)
+        follow_request = self.follower_repository.accept_follow_request(
+            requester, requestee
+        )
+        if self.follow_event_queue is not None:
+            # the follow is stored at this point, a lost event can be repaired with
+            # tools/backfill_feed.py
+            try:
+                self.follow_event_queue.publish_follow_event(
+                    "follow", requester, requestee
+                )
+            except Exception as e:
+                logger.error(f"There was an error publishing the follow event: {e}")
+        return follow_request
 
     def decline_follow_request(self, requester: str, requestee: str) -> FollowRequest:
         return self.follower_repository.decline_follow_request(requester, requestee)
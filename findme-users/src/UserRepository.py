@@ -97,16 +97,32 @@ class UserRepository(AbstractUserRepository):
         return users
 
     def update_user_score_in_db(self, username: str, score: Score) -> User:
+        # a user has one score per location riddle, retried writes of the same score are
+        # ignored
         try:
             self.table.update_item(
                 Key={
                     "partition_key": PartitionKey.USER.value,
                     "username": username,
                 },
-                UpdateExpression="SET scores = list_append(scores, :i)",
-                ExpressionAttributeValues={":i": [score.dict()]},
+                UpdateExpression=(
+                    "SET scores = list_append(scores, :i) "
+                    "ADD scored_location_riddle_ids :ids"
+                ),
+                ConditionExpression="NOT contains(scored_location_riddle_ids, :id)",
+                ExpressionAttributeValues={
+                    ":i": [score.dict()],
+                    ":ids": {score.location_riddle_id},
+                    ":id": score.location_riddle_id,
+                },
             )
         except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                logger.info(
+                    f"Score for location riddle {score.location_riddle_id} "
+                    f"already written to {username}"
+                )
+                return self.get_user_by_username_from_db(username)
             logger.error(f"Error updating user scores in DynamoDB: {e}")
             raise BadRequestError(f"Error updating user scores in DynamoDB: {e}")
 
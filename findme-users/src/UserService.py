@@ -2,6 +2,8 @@ from aws_lambda_powertools.event_handler.exceptions import (
     BadRequestError,
 )
 from aws_lambda_powertools.logging import Logger
+from findme_shared.ETag import ETag
+from findme_shared.NotModifiedError import NotModifiedError
 from pydantic import ValidationError
 from typing import List
 
@@ -29,6 +31,18 @@ class UserService:
     def get_user(self, username: str) -> UserDTO:
         return self.user_repository.get_user_by_username_from_db(username).to_dto()
 
+    def get_user_with_etag(
+        self, username: str, if_none_match: str = None
+    ) -> tuple[UserDTO, str]:
+        """
+        Raises NotModifiedError if if_none_match contains the etag of the user.
+        """
+        user_dto = self.get_user(username)
+        etag = ETag.compute(user_dto.model_dump_json())
+        if ETag.matches(if_none_match, etag):
+            raise NotModifiedError(etag)
+        return user_dto, etag
+
     def get_user_scores(self, username: str) -> list[Score]:
         return self.user_repository.get_user_by_username_from_db(username).scores
 
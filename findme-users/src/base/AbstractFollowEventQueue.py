@@ -0,0 +1,7 @@
+from abc import ABC, abstractmethod
+
+
+class AbstractFollowEventQueue(ABC):
+    @abstractmethod
+    def publish_follow_event(self, action: str, follower: str, followee: str):
+        pass
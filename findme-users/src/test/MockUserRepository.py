@@ -33,7 +33,11 @@ class MockUserRepository(AbstractUserRepository):
     def update_user_score_in_db(self, username, score):
         for i, user in enumerate(self.users):
             if user.username == username:
-                self.users[i].scores.append(score)
+                if all(
+                    entry.location_riddle_id != score.location_riddle_id
+                    for entry in self.users[i].scores
+                ):
+                    self.users[i].scores.append(score)
                 return self.users[i]
         raise ValueError(f"No User with username: {username} found")
 
@@ -0,0 +1,65 @@
+import json
+import unittest
+
+from aws_lambda_powertools.event_handler import APIGatewayRestResolver
+from aws_lambda_powertools.event_handler.openapi.params import Path
+from aws_lambda_powertools.shared.types import Annotated
+from findme_shared.InternalRequest import InternalRequest
+
+from ..src.entities.Score import Score
+
+
+class TestInternalRequest(unittest.TestCase):
+    def setUp(self):
+        self.app = APIGatewayRestResolver(enable_validation=True)
+
+        @self.app.post("/users/<username>/score")
+        def post_score(username: Annotated[str, Path()], score: Score) -> dict:
+            return {
+                "username": username,
+                "authorization": self.app.current_event.get_header_value(
+                    "Authorization"
+                ),
+                "score": score.score,
+            }
+
+    def test_envelope_is_resolved_like_an_api_gateway_event(self):
+        envelope = InternalRequest.create(
+            "POST",
+            "/users/mock_username/score",
+            "Bearer mock_token",
+            json.dumps({"location_riddle_id": "mock_location_riddle_id", "score": 50}),
+        )
+        self.assertTrue(InternalRequest.is_internal_request(envelope))
+        self.assertFalse(InternalRequest.is_internal_request({"httpMethod": "POST"}))
+
+        response = self.app.resolve(InternalRequest.to_api_gateway_event(envelope), {})
+
+        self.assertEqual(response["statusCode"], 200)
+        self.assertEqual(
+            json.loads(response["body"]),
+            {
+                "username": "mock_username",
+                "authorization": "Bearer mock_token",
+                "score": 50,
+            },
+        )
+
+    def test_get_authorization(self):
+        self.assertEqual(
+            InternalRequest.get_authorization(
+                {"headers": {"authorization": "Bearer mock_token"}}
+            ),
+            "Bearer mock_token",
+        )
+        self.assertEqual(
+            InternalRequest.get_authorization(
+                {"multiValueHeaders": {"Authorization": ["Bearer mock_token"]}}
+            ),
+            "Bearer mock_token",
+        )
+        self.assertIsNone(InternalRequest.get_authorization({"headers": None}))
+
+
+if __name__ == "__main__":
+    unittest.main()
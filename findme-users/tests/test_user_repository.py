@@ -0,0 +1,55 @@
+import unittest
+
+import boto3
+from moto import mock_aws
+
+from ..src.UserRepository import UserRepository
+from ..src.entities.Score import Score
+from ..src.entities.User import User
+
+
+@mock_aws
+class TestUserRepository(unittest.TestCase):
+    def setUp(self):
+        dynamodb = boto3.client("dynamodb", region_name="eu-central-2")
+        dynamodb.create_table(
+            TableName="usersTable",
+            KeySchema=[
+                {"AttributeName": "partition_key", "KeyType": "HASH"},
+                {"AttributeName": "username", "KeyType": "RANGE"},
+            ],
+            AttributeDefinitions=[
+                {"AttributeName": "partition_key", "AttributeType": "S"},
+                {"AttributeName": "username", "AttributeType": "S"},
+            ],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        self.user_repository = UserRepository()
+        self.user_repository.post_user_to_db(
+            User(username="testuser", first_name="John", last_name="Doe")
+        )
+
+    def test_update_user_score_in_db_is_idempotent(self):
+        self.user_repository.update_user_score_in_db(
+            "testuser", Score(location_riddle_id="1", score=100)
+        )
+        # a retried write of the same location riddle is ignored
+        self.user_repository.update_user_score_in_db(
+            "testuser", Score(location_riddle_id="1", score=100)
+        )
+        user = self.user_repository.update_user_score_in_db(
+            "testuser", Score(location_riddle_id="2", score=50)
+        )
+
+        self.assertEqual(
+            user.scores,
+            [
+                Score(location_riddle_id="1", score=100),
+                Score(location_riddle_id="2", score=50),
+            ],
+        )
+        self.assertEqual(user.average_score, 75)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,9 @@
 import unittest
-from aws_lambda_powertools.event_handler.exceptions import NotFoundError, BadRequestError
+from aws_lambda_powertools.event_handler.exceptions import (
+    NotFoundError,
+    BadRequestError,
+)
+from findme_shared.NotModifiedError import NotModifiedError
 from pydantic import ValidationError
 from unittest.mock import MagicMock, patch
 
@@ -34,7 +38,9 @@ class TestUserService(unittest.TestCase):
 
     def test_get_user(self):
         username = "testuser"
-        user = User(username=username, first_name="John", last_name="Doe", bio="Test bio")
+        user = User(
+            username=username, first_name="John", last_name="Doe", bio="Test bio"
+        )
         user_dto = user.to_dto()
 
         self.mock_repo.get_user_by_username_from_db.return_value = user
@@ -44,6 +50,24 @@ class TestUserService(unittest.TestCase):
         self.mock_repo.get_user_by_username_from_db.assert_called_once_with(username)
         self.assertEqual(result, user_dto)
 
+    def test_get_user_with_etag(self):
+        user = User(
+            username="testuser", first_name="John", last_name="Doe", bio="Test bio"
+        )
+        self.mock_repo.get_user_by_username_from_db.return_value = user
+
+        user_dto, etag = self.user_service.get_user_with_etag("testuser")
+        self.assertEqual(user_dto, user.to_dto())
+        with self.assertRaises(NotModifiedError) as context:
+            self.user_service.get_user_with_etag("testuser", etag.removeprefix("W/"))
+        self.assertEqual(context.exception.etag, etag)
+
+        self.mock_repo.get_user_by_username_from_db.return_value = user.model_copy(
+            update={"bio": "Updated bio"}
+        )
+        _, updated_etag = self.user_service.get_user_with_etag("testuser", etag)
+        self.assertNotEqual(updated_etag, etag)
+
     def test_update_user_success(self):
         user_data = {"first_name": "Jane", "last_name": "Doe", "bio": "Updated bio"}
         username = "testuser"
@@ -74,23 +98,39 @@ class TestUserService(unittest.TestCase):
 
         self.mock_repo.update_user_score_in_db.return_value = user
 
-        result = self.user_service.write_guessing_score_to_user(username, location_riddle_id, score_value)
+        result = self.user_service.write_guessing_score_to_user(
+            username, location_riddle_id, score_value
+        )
 
         self.mock_repo.update_user_score_in_db.assert_called_once_with(username, score)
         self.assertEqual(result, user_dto)
 
     def test_write_guessing_score_to_user_validation_error(self):
         with self.assertRaises(BadRequestError):
-            self.user_service.write_guessing_score_to_user("testuser", "1", "not-an-int")
+            self.user_service.write_guessing_score_to_user(
+                "testuser", "1", "not-an-int"
+            )
 
     def test_get_similar_users_success(self):
-        user_data1 = {"username": "testuser1", "first_name": "John", "last_name": "Doe", "bio": "Test bio"}
-        user_data2 = {"username": "testuser2", "first_name": "John", "last_name": "Doe", "bio": "Test bio"}
+        user_data1 = {
+            "username": "testuser1",
+            "first_name": "John",
+            "last_name": "Doe",
+            "bio": "Test bio",
+        }
+        user_data2 = {
+            "username": "testuser2",
+            "first_name": "John",
+            "last_name": "Doe",
+            "bio": "Test bio",
+        }
 
         similar_users = [User(**user_data1), User(**user_data2)]
         self.mock_repo.get_users_by_username_prefix.return_value = similar_users
 
-        result = self.user_service.get_similar_users(query_username_prefix="test", username=similar_users[0].username)
+        result = self.user_service.get_similar_users(
+            query_username_prefix="test", username=similar_users[0].username
+        )
 
         self.assertEqual(len(result), 1)
         self.assertNotEqual(result[0].username, similar_users[0].username)
@@ -104,15 +144,26 @@ class TestUserService(unittest.TestCase):
     def test_write_guessing_score_to_user_exception(self):
         username = "testuser"
         location_riddle_id = "1"
-        invalid_score = "not-an-int"  # This is not an integer and should trigger a ValidationError
+        invalid_score = (
+            "not-an-int"  # This is not an integer and should trigger a ValidationError
+        )
         with self.assertRaises(BadRequestError) as context:
-            self.user_service.write_guessing_score_to_user(username, location_riddle_id, invalid_score)
-        self.assertIn("unable to update the user with provided parameters", str(context.exception))
+            self.user_service.write_guessing_score_to_user(
+                username, location_riddle_id, invalid_score
+            )
+        self.assertIn(
+            "unable to update the user with provided parameters", str(context.exception)
+        )
 
     def test_get_user_scores(self):
         username = "testuser"
-        scores = [Score(location_riddle_id="1", score=10), Score(location_riddle_id="2", score=20)]
-        user = User(username=username, first_name="John", last_name="Doe", scores=scores)
+        scores = [
+            Score(location_riddle_id="1", score=10),
+            Score(location_riddle_id="2", score=20),
+        ]
+        user = User(
+            username=username, first_name="John", last_name="Doe", scores=scores
+        )
 
         self.mock_repo.get_user_by_username_from_db.return_value = user
 